@@ -1,7 +1,7 @@
 from copy import deepcopy
 import os
 import sys
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set, Tuple
 try:
     from typing import Final
 except ImportError:
@@ -36,6 +36,15 @@ class Config:
     Keyword Args:
         raw_config: if, supplied, use this as our config data instead of loading
             if from ``filename``
+
+    .. note::
+
+        If you build your :py:class:`Config` with ``Config.new(lazy=True)``, we
+        won't do any interpolations up front.  Instead, each item in our
+        processable sections is interpolated the first time it is asked for via
+        :py:meth:`get_section_item`, :py:meth:`get_section`,
+        :py:attr:`services` or :py:attr:`tasks`, so we only do the terraform and
+        environment lookups for the items a command actually uses.
     """
 
     class NoSuchSectionError(NoSuchConfigSection):
@@ -63,10 +72,17 @@ class Config:
         if filename is None:
             filename = cls.DEFAULT_DEPLOYFISH_CONFIG_FILE
         config = cls(filename=filename, raw_config=kwargs.pop('raw_config', None))
+        lazy = kwargs.pop('lazy', False)
         if kwargs.pop('interpolate', True):
             try:
                 processor = ConfigProcessor(config, kwargs)
-                processor.process()
+                if lazy:
+                    # Instantiate our processors now so that any configuration
+                    # problems they find are reported up front
+                    processor.processors  # pylint:disable=pointless-statement
+                    config.processor = processor
+                else:
+                    processor.process()
             except ConfigProcessingFailed as e:
                 click.secho(str(e))
                 sys.exit(1)
@@ -95,6 +111,10 @@ class Config:
         self.filename: str = filename
         self.__raw: Dict[str, Any] = raw_config if raw_config else self.load_config(filename)
         self.__cooked: Dict[str, Any] = deepcopy(self.__raw)
+        #: If set, we interpolate items on demand with this instead of all at once
+        self.processor: Optional[ConfigProcessor] = None
+        #: The (section name, item name) pairs we've already interpolated
+        self.interpolated: Set[Tuple[str, str]] = set()
 
     @property
     def raw(self) -> Dict[str, Any]:
@@ -114,12 +134,57 @@ class Config:
 
     @property
     def tasks(self) -> List[Dict[str, Any]]:
+        self.interpolate_section('tasks')
         return self.cooked.get('tasks', [])
 
     @property
     def services(self) -> List[Dict[str, Any]]:
+        self.interpolate_section('services')
         return self.cooked.get('services', [])
 
+    def interpolate_item(self, section_name: str, item: Dict[str, Any]) -> None:
+        """
+        If we were built with ``lazy=True``, run our config processors on
+        ``item`` from the section named ``section_name`` unless we've done so
+        already.
+
+        Args:
+            section_name: the name of the top level section ``item`` is in
+            item: the item to interpolate, in place
+        """
+        if self.processor is None or section_name not in self.processable_sections:
+            return
+        key = (section_name, item['name'])
+        if key in self.interpolated:
+            return
+        # Mark the item before processing it: processors may look the item up
+        # again via get_section_item() while they work on it.
+        self.interpolated.add(key)
+        try:
+            self.processor.process_item(section_name, item)
+        except ConfigProcessingFailed as e:
+            click.secho(str(e))
+            sys.exit(1)
+
+    def interpolate_section(self, section_name: str) -> None:
+        """
+        If we were built with ``lazy=True``, interpolate every item in the
+        section named ``section_name`` that we haven't interpolated yet.
+
+        Args:
+            section_name: the name of the top level section to interpolate
+        """
+        for item in self.cooked.get(section_name, []):
+            self.interpolate_item(section_name, item)
+
+    def has_section(self, section_name: str) -> bool:
+        """
+        Return ``True`` if our config has a top level section named
+        ``section_name``.  Unlike :py:meth:`get_section`, this does not
+        interpolate anything.
+        """
+        return section_name in self.cooked
+
     def load_config(self, filename: str) -> Dict[str, Any]:
         """
         Read our deployfish.yml file from disk and return it as parsed YAML.
@@ -171,7 +236,9 @@ class Config:
         Returns:
             The post-interpolation contents of the section named ``section_name``.
         """
-        return self.cooked[section_name]
+        section = self.cooked[section_name]
+        self.interpolate_section(section_name)
+        return section
 
     def get_section_item(self, section_name: str, item_name: str) -> Dict[str, Any]:
         """
@@ -203,9 +270,8 @@ class Config:
 
         if section_name in self.cooked:
             for item in self.cooked[section_name]:
-                if item['name'] == item_name:
-                    return item
-                if 'environment' in item and item['environment'] == item_name:
+                if item['name'] == item_name or ('environment' in item and item['environment'] == item_name):
+                    self.interpolate_item(section_name, item)
                     return item
         else:
             raise self.NoSuchSectionError(section_name)
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Type, TYPE_CHECKING
+from typing import Dict, Any, List, Optional, Type, TYPE_CHECKING
 
 from deployfish.exceptions import ConfigProcessingFailed, SkipConfigProcessing
 
@@ -24,18 +24,48 @@ class ConfigProcessor:
     def __init__(self, config: "Config", context: Dict[str, Any]):
         self.config = config
         self.context = context
+        self._processors: Optional[List[AbstractConfigProcessor]] = None
+
+    @property
+    def processors(self) -> List[AbstractConfigProcessor]:
+        """
+        Instantiate each of our registered processor classes, skipping the ones
+        that don't apply to our config.  We do this only once, so that any
+        state the processors build up (e.g. loaded terraform statefiles) is
+        reused across items.
+        """
+        if self._processors is None:
+            processors = []
+            for processor_class in self.processor_classes:
+                try:
+                    processors.append(processor_class(self.config, self.context))
+                except SkipConfigProcessing:
+                    continue
+            self._processors = processors
+        return self._processors
 
     def process(self) -> None:
-        for processor_class in self.processor_classes:
-            try:
-                current_processor = processor_class(self.config, self.context)
-            except SkipConfigProcessing:
-                continue
+        for current_processor in self.processors:
             try:
                 current_processor.process()
             except ConfigProcessingFailed as e:
                 raise self.ProcessingFailed(str(e))
 
+    def process_item(self, section_name: str, item: Dict[str, Any]) -> None:
+        """
+        Run all our processors on just ``item`` from the section named
+        ``section_name``.
+
+        Args:
+            section_name: the name of the top level section ``item`` is in
+            item: the item to process, in place
+        """
+        for current_processor in self.processors:
+            try:
+                current_processor.process_item(section_name, item)
+            except ConfigProcessingFailed as e:
+                raise self.ProcessingFailed(str(e))
+
 
 ConfigProcessor.register(TerraformStateConfigProcessor)
 ConfigProcessor.register(EnvironmentConfigProcessor)
@@ -56,15 +56,31 @@ class AbstractConfigProcessor:
             self.deployfish_lookups[section_name] = {}
             section = self.config.cooked.get(section_name, {})
             for item in section:
-                self.deployfish_lookups[section_name][item['name']] = {}
-                self.deployfish_lookups[section_name][item['name']]['{name}'] = item['name']
-                if section_name == 'services':
-                    self.deployfish_lookups[section_name][item['name']]['{service-name}'] = item['name']
-                if section_name == 'tasks':
-                    self.deployfish_lookups[section_name][item['name']]['{task-name}'] = item['name']
-                self.deployfish_lookups[section_name][item['name']]['{environment}'] = item.get('environment', 'prod')
-                if 'cluster' in item:
-                    self.deployfish_lookups[section_name][item['name']]['{cluster-name}'] = item['cluster']
+                self.extract_item_replacements(section_name, item)
+
+    def extract_item_replacements(self, section_name: str, item: Dict[str, Any]) -> None:
+        """
+        Populate :py:attr:`deployfish_lookups` for ``item`` from the section
+        named ``section_name``, using ``item``'s current values.
+
+        We do this again just before we process each item, because earlier
+        processors may have interpolated the values we use, e.g. a ``cluster``
+        of ``${terraform.cluster_name}``.
+
+        Args:
+            section_name: the name of the top level section ``item`` is in
+            item: the item from which to extract our replacements
+        """
+        lookups: Dict[str, str] = {}
+        lookups['{name}'] = item['name']
+        if section_name == 'services':
+            lookups['{service-name}'] = item['name']
+        if section_name == 'tasks':
+            lookups['{task-name}'] = item['name']
+        lookups['{environment}'] = item.get('environment', 'prod')
+        if 'cluster' in item:
+            lookups['{cluster-name}'] = item['cluster']
+        self.deployfish_lookups.setdefault(section_name, {})[item['name']] = lookups
 
     def get_deployfish_replacements(self, section_name: str, item_name: str) -> Dict[str, str]:
         """
@@ -211,5 +227,21 @@ class AbstractConfigProcessor:
         for section_name in self.config.processable_sections:
             section = cooked.get(section_name, {})
             for item in section:
-                # Assume each item in a section is s dict
-                self.__process_dict(item, section_name, item['name'])
+                self.process_item(section_name, item)
+
+    def process_item(self, section_name: str, item: Dict[str, Any]) -> None:
+        """
+        Run our processor on a single item from the section named
+        ``section_name``, modifying it in place.
+
+        Args:
+            section_name: the name of the top level section ``item`` is in
+            item: the item to process
+
+        Raises:
+            AbstractConfigProcessor.ProcessingFailed: something went wrong when
+                we tried to run
+        """
+        self.extract_item_replacements(section_name, item)
+        # Assume each item in a section is s dict
+        self.__process_dict(item, section_name, item['name'])
@@ -2,7 +2,7 @@ import json
 import os
 import os.path
 import re
-from typing import Dict, List, Any, Union, TYPE_CHECKING, cast
+from typing import Dict, List, Any, Optional, Union, TYPE_CHECKING, cast
 
 import boto3
 import botocore
@@ -10,6 +10,7 @@ import requests
 
 from deployfish.exceptions import NoSuchTerraformStateFile, SchemaException, ConfigProcessingFailed
 from deployfish.core.aws import get_boto3_session
+from deployfish.core.cache import DiskCache
 
 from .abstract import AbstractConfigProcessor
 
@@ -51,10 +52,60 @@ class AbstractTerraformState:
 
 
 class TerraformS3State(AbstractTerraformState):
+    """
+    Load outputs from a Terraform statefile stored in S3.
+
+    Statefile URLs may be templated (e.g. ``s3://bucket/{environment}.tfstate``),
+    so the same statefile is typically needed by many items in
+    ``deployfish.yml``.  To avoid downloading and parsing it once per item, we
+    keep the parsed outputs of every statefile we've loaded in
+    :py:attr:`outputs_cache`, keyed by its fully resolved URL, so each distinct
+    statefile costs one ``GET``.
+
+    If the ``terraform:`` section sets ``cache_ttl`` to a number of seconds, we
+    additionally save parsed outputs on local disk under the statefile's URL and
+    S3 ETag, so later runs need only a ``HEAD`` request to validate them.  Since
+    Terraform outputs may contain secrets, this is off by default.
+    """
 
     def __init__(self, terraform_config: Dict[str, Any], context: Dict[str, Any]) -> None:
         super().__init__(terraform_config, context)
         self.replacements: Dict[str, str] = {}
+        #: Parsed statefile outputs, keyed by resolved ``s3://`` URL
+        self.outputs_cache: Dict[str, Dict[str, Any]] = {}
+        self.disk_cache: Optional[DiskCache] = None
+        if self.terraform_config.get('cache_ttl'):
+            self.disk_cache = DiskCache('terraform-state', ttl=int(self.terraform_config['cache_ttl']))
+
+    def _get_s3_object(self, state_file_url: str, profile: str = None, region: str = None):
+        if profile:
+            session = boto3.session.Session(profile_name=profile, region_name=region)
+        else:
+            session = get_boto3_session()
+        s3 = session.resource('s3')
+        parts = state_file_url[5:].split('/')
+        bucket = parts[0]
+        filename = "/".join(parts[1:])
+        return s3.Object(bucket, filename)
+
+    def _get_state_file_etag(
+        self,
+        state_file_url: str,
+        profile: str = None,
+        region: str = None
+    ) -> str:
+        """
+        Get the ETag of our statefile from S3 with a ``HEAD`` request, without
+        downloading it.
+        """
+        key = self._get_s3_object(state_file_url, profile=profile, region=region)
+        try:
+            key.load()
+        except botocore.exceptions.ClientError as ex:
+            if ex.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                raise NoSuchTerraformStateFile("Could not find Terraform state file {}".format(state_file_url))
+            raise ex
+        return key.e_tag
 
     def _get_state_file_from_s3(
         self,
@@ -65,15 +116,7 @@ class TerraformS3State(AbstractTerraformState):
         """
         Retrive our statefile from S3
         """
-        if profile:
-            session = boto3.session.Session(profile_name=profile, region_name=region)
-        else:
-            session = get_boto3_session()
-        s3 = session.resource('s3')
-        parts = state_file_url[5:].split('/')
-        bucket = parts[0]
-        filename = "/".join(parts[1:])
-        key = s3.Object(bucket, filename)
+        key = self._get_s3_object(state_file_url, profile=profile, region=region)
         try:
             state_file = key.get()["Body"].read().decode('utf-8')
         except botocore.exceptions.ClientError as ex:
@@ -82,15 +125,49 @@ class TerraformS3State(AbstractTerraformState):
             raise ex
         return json.loads(state_file)
 
-    def _load_pre_version_12(self, tfstate: Dict[str, Any]) -> None:
+    def _get_outputs_pre_version_12(self, tfstate: Dict[str, Any]) -> Dict[str, Any]:
+        outputs: Dict[str, Any] = {}
         for i in tfstate['modules']:
             if i['path'] == ['root']:
-                for key, value in list(i['outputs'].items()):
-                    self.terraform_lookups[key] = value
+                outputs.update(i['outputs'])
+        return outputs
 
-    def _load_post_version_12(self, tfstate: Dict[str, Any]) -> None:
-        for key, value in list(tfstate['outputs'].items()):
-            self.terraform_lookups[key] = value
+    def _get_outputs_post_version_12(self, tfstate: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(tfstate['outputs'])
+
+    def get_outputs(self, statefile_url: str) -> Dict[str, Any]:
+        """
+        Return the parsed outputs from the statefile at ``statefile_url``,
+        downloading it only if neither our in-memory nor on-disk caches have a
+        current copy.
+
+        Args:
+            statefile_url: the fully resolved ``s3://`` URL of the statefile
+
+        Returns:
+            A dict of output names to output definitions.
+        """
+        if statefile_url in self.outputs_cache:
+            return self.outputs_cache[statefile_url]
+        profile = self.terraform_config.get('profile', None)
+        region = self.terraform_config.get('region', None)
+        disk_key = None
+        outputs = None
+        if self.disk_cache is not None and self.disk_cache.enabled:
+            etag = self._get_state_file_etag(statefile_url, profile=profile, region=region)
+            disk_key = f'{statefile_url}:{etag}'
+            outputs = self.disk_cache.get(disk_key)
+        if outputs is None:
+            tfstate = self._get_state_file_from_s3(statefile_url, profile=profile, region=region)
+            major, minor, _ = tfstate['terraform_version'].split('.')
+            if int(major) >= 1 or (int(major) == 0 and int(minor) >= 12):
+                outputs = self._get_outputs_post_version_12(tfstate)
+            else:
+                outputs = self._get_outputs_pre_version_12(tfstate)
+            if disk_key is not None:
+                cast(DiskCache, self.disk_cache).set(disk_key, outputs)
+        self.outputs_cache[statefile_url] = outputs
+        return outputs
 
     def load(self, replacements: Dict[str, str]) -> None:
         if replacements == self.replacements:
@@ -100,16 +177,7 @@ class TerraformS3State(AbstractTerraformState):
         for key, value in replacements.items():
             statefile_url = statefile_url.replace(key, value)
         if not self.loaded:
-            tfstate = self._get_state_file_from_s3(
-                statefile_url,
-                profile=self.terraform_config.get('profile', None),
-                region=self.terraform_config.get('region', None)
-            )
-            major, minor, _ = tfstate['terraform_version'].split('.')
-            if int(major) >= 1 or (int(major) == 0 and int(minor) >= 12):
-                self._load_post_version_12(tfstate)
-            else:
-                self._load_pre_version_12(tfstate)
+            self.terraform_lookups = self.get_outputs(statefile_url)
             # If our statefile URL has no replacments in it, we don't need to load this again
             self.loaded = not any(
                 r in self.terraform_config['statefile'] for r in AbstractConfigProcessor.REPLACEMENTS
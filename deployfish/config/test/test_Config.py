@@ -6,6 +6,7 @@ from mock import Mock, call
 from testfixtures import Replacer
 
 from deployfish.config.config import Config
+from deployfish.config.processors import ConfigProcessor
 
 
 def statefile_loader(state_file_url, profile: str = None, region: str = None) -> Dict[str, Any]:
@@ -73,6 +74,60 @@ class TestTunnelDefinition_terraform_interpolation(unittest.TestCase):
         self.assertEqual(prod['port'], '3306')
 
 
+class TestConfig_lazy_interpolation(unittest.TestCase):
+
+    def setUp(self):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        self.config_yml = os.path.join(current_dir, 'terraform_interpolate.yml')
+        self.replacer = Replacer()
+        self.get_mock = self.replacer(
+            'deployfish.config.processors.terraform.TerraformS3State._get_state_file_from_s3',
+            Mock(side_effect=statefile_loader)
+        )
+        self.config = Config.new(filename=self.config_yml, lazy=True)
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def test_nothing_is_interpolated_up_front(self):
+        self.get_mock.assert_not_called()
+        self.assertEqual(self.config.cooked['services'][0]['cluster'], '${terraform.cluster_name}')
+
+    def test_only_the_requested_item_is_interpolated(self):
+        qa = self.config.get_section_item('services', 'foobar-qa')
+        self.assertEqual(qa['cluster'], 'foobar-cluster-qa')
+        self.get_mock.assert_called_once_with('s3://my-qa-statefile', profile=None, region=None)
+        self.assertEqual(self.config.cooked['services'][1]['cluster'], '${terraform.cluster_name}')
+
+    def test_items_are_interpolated_once(self):
+        first = self.config.get_section_item('services', 'foobar-qa')
+        second = self.config.get_section_item('services', 'qa')
+        self.assertIs(first, second)
+        self.assertEqual(self.get_mock.call_count, 1)
+
+    def test_get_section_interpolates_whole_section(self):
+        services = self.config.get_section('services')
+        self.assertEqual([s['cluster'] for s in services], ['foobar-cluster-qa', 'foobar-cluster-prod'])
+
+    def test_later_processors_see_interpolated_replacements(self):
+        self.config.get_section_item('services', 'foobar-qa')
+        environment = self.config.processor.processors[-1]
+        self.assertEqual(
+            environment.get_deployfish_replacements('services', 'foobar-qa')['{cluster-name}'],
+            'foobar-cluster-qa'
+        )
+
+    def test_eager_processing_sees_interpolated_replacements(self):
+        config = Config.new(filename=self.config_yml, interpolate=False)
+        processor = ConfigProcessor(config, {})
+        processor.process()
+        environment = processor.processors[-1]
+        self.assertEqual(
+            environment.get_deployfish_replacements('services', 'foobar-prod')['{cluster-name}'],
+            'foobar-cluster-prod'
+        )
+
+
 class TestContainerDefinition_load_yaml(unittest.TestCase):
 
     def setUp(self):
@@ -1,5 +1,7 @@
 import json
 import os
+import shutil
+import tempfile
 import unittest
 from mock import Mock
 from testfixtures import compare, Replacer
@@ -83,3 +85,50 @@ class TestTerraform_lookup(unittest.TestCase):
         self.assertEqual(self.terraform.lookup('lookup1', {'{environment}': 'qa'}), 'foobar-cluster-qa')
         self.assertEqual(self.terraform.lookup('lookup1', {'{environment}': 'prod'}), 'foobar-cluster-prod')
         self.assertListEqual(self.terraform.lookup('lookup4', {}), ['sg-1234567', 'sg-2345678', 'sg-3456789'])
+
+
+class TestTerraformS3State_caching(unittest.TestCase):
+
+    def setUp(self):
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        filename = os.path.join(current_dir, 'terraform.tfstate.0.12')
+        with open(filename) as f:
+            self.tfstate = json.loads(f.read())
+        self.yaml = dict(YAML, statefile='s3://foobar/{environment}')
+        self.tmpdir = tempfile.mkdtemp()
+        self.replacer = Replacer()
+        self.replacer.in_environ('DEPLOYFISH_CACHE_DIR', self.tmpdir)
+        self.replacer.in_environ('DEPLOYFISH_DISABLE_CACHE', 'false')
+        self.get_mock = self.replacer(
+            'deployfish.config.processors.terraform.TerraformS3State._get_state_file_from_s3',
+            Mock(return_value=self.tfstate)
+        )
+        self.etag_mock = self.replacer(
+            'deployfish.config.processors.terraform.TerraformS3State._get_state_file_etag',
+            Mock(return_value='"abc"')
+        )
+
+    def tearDown(self):
+        self.replacer.restore()
+        shutil.rmtree(self.tmpdir)
+
+    def test_each_statefile_is_downloaded_once(self):
+        terraform = TerraformS3State(self.yaml, {})
+        for environment in ['qa', 'prod', 'qa', 'prod']:
+            terraform.load({'{environment}': environment})
+        self.assertEqual(self.get_mock.call_count, 2)
+        self.assertEqual(self.etag_mock.call_count, 0)
+        self.assertTrue('prod-rds-address' in terraform.terraform_lookups)
+
+    def test_disk_cache_is_validated_by_etag(self):
+        self.yaml['cache_ttl'] = 3600
+        TerraformS3State(self.yaml, {}).load({'{environment}': 'qa'})
+        terraform = TerraformS3State(self.yaml, {})
+        terraform.load({'{environment}': 'qa'})
+        self.assertEqual(self.get_mock.call_count, 1)
+        self.assertEqual(self.etag_mock.call_count, 2)
+        self.assertTrue('prod-rds-address' in terraform.terraform_lookups)
+        # The statefile changed in S3, so we need to download it again
+        self.etag_mock.return_value = '"def"'
+        TerraformS3State(self.yaml, {}).load({'{environment}': 'qa'})
+        self.assertEqual(self.get_mock.call_count, 2)
@@ -107,6 +107,15 @@ class Base(Controller):
                     'help': "Don't stop processing deployfish.yml if we can't dereference an ${env.VAR}"
                 }
             ),
+            (
+                ['--identity-map'],
+                {
+                    'dest': 'identity_map',
+                    'action': 'store_true',
+                    'default': False,
+                    'help': 'Load each AWS object at most once while running this command'
+                }
+            ),
         ]
 
 
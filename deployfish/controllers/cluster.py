@@ -18,7 +18,7 @@ from deployfish.core.models import (
     Model,
 )
 
-from .crud import CrudBase
+from .crud import CrudBase, LIST_FORMAT_ARGUMENT
 
 def valid_date(s):
     """
@@ -124,12 +124,13 @@ class ECSCluster(CrudBase):
                     'default': None,
                     'dest': 'cluster_name'
                 }
-            )
+            ),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(cluster_name=self.app.pargs.cluster_name)
+        results = self.model.objects.iter(cluster_name=self.app.pargs.cluster_name)
         self.render_list(results)
 
     @ex(
@@ -11,7 +11,7 @@ from deployfish.core.models import (
     Service,
     ServiceHelperTask
 )
-from deployfish.core.waiters.hooks.ecs import ECSTaskStatusHook
+from deployfish.core.waiters.hooks.ecs import ECSTaskLogsHook
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
 from deployfish.renderers.table import TableRenderer
 
@@ -290,7 +290,7 @@ enabled in AWS, disable it.
     # Run
 
     def run_task_waiter(self, tasks: Sequence[InvokedTask], **kwargs) -> None:
-        kwargs['WaiterHooks'] = [ECSTaskStatusHook(tasks)]
+        kwargs['WaiterHooks'] = [ECSTaskLogsHook(tasks)]
         kwargs['tasks'] = [t.arn for t in tasks]
         kwargs['cluster'] = tasks[0].cluster_name
         self.wait('tasks_stopped', **kwargs)
@@ -355,7 +355,7 @@ class ECSServiceCommandLogs(Controller):
             (
                 ['--mark'],
                 {
-                    'help': 'Print out a line every --sleep seconds.',
+                    'help': 'Print out a line after every poll.',
                     'action': 'store_true',
                     'default': False,
                     'dest': 'mark',
@@ -364,7 +364,7 @@ class ECSServiceCommandLogs(Controller):
             (
                 ['--sleep'],
                 {
-                    'help': 'Sleep for this many seconds between polling Cloudwatch Logs for new messages.',
+                    'help': 'Initial seconds between polls of Cloudwatch Logs; we poll faster while busy.',
                     'type': int,
                     'default': 10,
                     'dest': 'sleep',
@@ -1,4 +1,7 @@
-from typing import Sequence, Type, Optional, Dict, Any
+import csv
+import io
+import json
+from typing import Iterable, Type, Optional, Dict, Any
 
 import botocore
 from cement import ex, shell
@@ -6,12 +9,27 @@ import click
 
 from deployfish.core.models import Model
 from deployfish.core.loaders import ObjectLoader
+from deployfish.core.utils import run_async
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
 from deployfish.renderers.table import TableRenderer
 
 from .utils import handle_model_exceptions
 
 
+#: Add this to the ``arguments`` of any ``list`` command that renders its results with
+#: :py:meth:`ReadOnlyCrudBase.render_list`.
+LIST_FORMAT_ARGUMENT = (
+    ['--format'],
+    {
+        'help': 'Output format. "jsonl" and "csv" print each row as soon as it is loaded, unsorted.',
+        'action': 'store',
+        'default': 'table',
+        'choices': ['table', 'jsonl', 'csv'],
+        'dest': 'output_format'
+    }
+)
+
+
 # ========================
 # Controllers
 # ========================
@@ -85,30 +103,52 @@ class ReadOnlyCrudBase(Controller):
         """
         loader = self.loader(self)
         obj = loader.get_object_from_aws(self.app.pargs.pk)
+        run_async(obj.aload_related())
         self.app.render({'obj': obj}, template=self.info_template)
 
     # List
 
-    def render_list(self, results: Sequence[Model]) -> None:
+    def render_list(self, results: Iterable[Model]) -> None:
         """
         Helper method that renders output from self.list() so that we can override .list() without
         having to re-implement this.
 
-
+        The ``--format`` option (see :py:data:`LIST_FORMAT_ARGUMENT`) picks the output format.  For ``table``, we need
+        all of ``results`` before we can print anything.  For ``jsonl`` and ``csv`` we print each row as soon as
+        ``results`` yields its object, so pass a generator like ``self.model.objects.iter()`` to stream the output.
         """
         renderer = TableRenderer(
             columns=self.list_result_columns,
             ordering=self.list_ordering
         )
-        self.app.print(renderer.render(results))
+        output_format = getattr(self.app.pargs, 'output_format', 'table')
+        if output_format == 'jsonl':
+            for row in renderer.iter_rows(results, raw=True):
+                row = [click.unstyle(value) if isinstance(value, str) else value for value in row]
+                self.app.print(json.dumps(dict(zip(renderer.headers, row)), default=str))
+        elif output_format == 'csv':
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator='')
+            writer.writerow(renderer.headers)
+            self.app.print(buf.getvalue())
+            for row in renderer.iter_rows(results):
+                buf.seek(0)
+                buf.truncate()
+                writer.writerow([click.unstyle(value) if isinstance(value, str) else value for value in row])
+                self.app.print(buf.getvalue())
+        else:
+            self.app.print(renderer.render(list(results)))
 
-    @ex(help='List objects in AWS')
+    @ex(
+        help='List objects in AWS',
+        arguments=[LIST_FORMAT_ARGUMENT]
+    )
     @handle_model_exceptions
     def list(self):
         """
         List objects in AWS.
         """
-        results = self.model.objects.list()
+        results = self.model.objects.iter()
         self.render_list(results)
 
 
@@ -7,7 +7,7 @@ from deployfish.core.models import (
     ClassicLoadBalancer
 )
 
-from .crud import ReadOnlyCrudBase
+from .crud import ReadOnlyCrudBase, LIST_FORMAT_ARGUMENT
 from .utils import handle_model_exceptions
 
 
@@ -66,11 +66,12 @@ class EC2ClassicLoadBalancer(ReadOnlyCrudBase):
                     'dest': 'scheme'
                 }
             ),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.model.objects.iter(
             vpc_id=self.app.pargs.vpc_id,
             scheme=self.app.pargs.scheme,
             name=self.app.pargs.name
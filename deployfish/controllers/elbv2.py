@@ -8,7 +8,7 @@ from deployfish.core.models import (
 )
 from deployfish.core.models.elbv2 import LoadBalancerListener, TargetGroup
 
-from .crud import ReadOnlyCrudBase
+from .crud import ReadOnlyCrudBase, LIST_FORMAT_ARGUMENT
 from .utils import handle_model_exceptions
 
 
@@ -79,11 +79,12 @@ class EC2LoadBalancer(ReadOnlyCrudBase):
                     'dest': 'scheme'
                 }
             ),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.model.objects.iter(
             vpc_id=self.app.pargs.vpc_id,
             lb_type=self.app.pargs.lb_type,
             scheme=self.app.pargs.scheme,
@@ -122,12 +123,13 @@ class EC2LoadBalancerListener(ReadOnlyCrudBase):
     @ex(
         help="List Load Balancer Listeners in AWS",
         arguments=[
-            (['load_balancer'], {'help': 'Load balancer name or ARN'})
+            (['load_balancer'], {'help': 'Load balancer name or ARN'}),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(self.app.pargs.load_balancer)
+        results = self.model.objects.iter(self.app.pargs.load_balancer)
         self.render_list(results)
 
 
@@ -171,11 +173,12 @@ class EC2LoadBalancerTargetGroup(ReadOnlyCrudBase):
                     'dest': 'load_balancer'
                 }
             ),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.model.objects.iter(
             load_balancer=self.app.pargs.load_balancer
         )
         self.render_list(results)
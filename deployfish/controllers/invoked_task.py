@@ -6,8 +6,9 @@ from deployfish.core.models import (
     Model,
     InvokedTask
 )
+from deployfish.core.utils import run_async
 
-from .crud import ReadOnlyCrudBase
+from .crud import ReadOnlyCrudBase, LIST_FORMAT_ARGUMENT
 from .utils import handle_model_exceptions
 
 
@@ -78,15 +79,20 @@ class ECSInvokedTask(ReadOnlyCrudBase):
                     'dest': 'launch_type'
                 }
             ),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
-            self.app.pargs.cluster,
-            service=self.app.pargs.service,
-            family=self.app.pargs.family,
-            launch_type=self.app.pargs.launch_type,
-            status=self.app.pargs.status
-        )
+        kwargs = {
+            'service': self.app.pargs.service,
+            'family': self.app.pargs.family,
+            'launch_type': self.app.pargs.launch_type,
+            'status': self.app.pargs.status
+        }
+        if self.app.pargs.output_format == 'table':
+            # We need everything before we can print the table anyway, so describe the tasks concurrently
+            results = run_async(self.model.objects.alist(self.app.pargs.cluster, **kwargs))
+        else:
+            results = self.model.objects.iter(self.app.pargs.cluster, **kwargs)
         self.render_list(results)
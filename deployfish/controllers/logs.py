@@ -1,23 +1,50 @@
 import argparse
-from typing import Type, Dict, Union, cast
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Type, Union, cast
 
 from cement import App, ex
 import click
 
 from deployfish.core.models import (
+    InvokedTask,
     Model,
     Task,
     TaskDefinition,
     CloudWatchLogGroup,
-    CloudWatchLogStream
+    CloudWatchLogStream,
+    CloudWatchLogsQuery
 )
+from deployfish.core.models.cloudwatchlogs import CloudWatchLogGroupTailer
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
 from deployfish.renderers.table import TableRenderer
 
-from .crud import ReadOnlyCrudBase
+from .crud import ReadOnlyCrudBase, LIST_FORMAT_ARGUMENT
 from .utils import handle_model_exceptions
 
 
+def valid_datetime(s: str) -> datetime:
+    """
+    Parse a UTC date or date and time from the command line.
+    """
+    for fmt in ('%Y-%m-%d', '%Y-%m-%dT%H:%M', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d %H:%M:%S'):
+        try:
+            return datetime.strptime(s, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            pass
+    msg = "not a valid date or date and time: {0!r}".format(s)
+    raise argparse.ArgumentTypeError(msg)
+
+
+def mark_line(tailer: CloudWatchLogGroupTailer) -> str:
+    """
+    Build the line we print between polls when tailing with ``--mark``, showing
+    how long we'll sleep before the next poll and how hard we're hitting the
+    CloudWatch Logs API.
+    """
+    mark = "  mark: next poll in {:.1f}s, {} API calls/min  ".format(tailer.sleep, tailer.calls_per_minute)
+    return mark.center(72, '=')
+
+
 def tail_task_logs(
     app: App,
     obj: Task,
@@ -29,32 +56,47 @@ def tail_task_logs(
     Tail the logs for a Task of Task subclass to stdout.   How this actually
     works is that we poll the log group for the task, filter for the log stream
     name for the task and print to stdout any messages which have arrived since
-    the last poll.  We sleep for ``sleep`` seconds between polls.
+    the last poll.  We start by sleeping for ``sleep`` seconds between polls,
+    and then poll more often while the logs are busy and less often while
+    they're quiet.
 
     Args:
         app: the top level Cement App.  We use this to access app.print()
         obj: the task object
 
     Keyword Arguments:
-        sleep: sleep for this many seconds between polls.
-        mark: if ``True``, print a line every ``sleep`` seconds.  This helps us see that
+        sleep: sleep for this many seconds between our first few polls.
+        mark: if ``True``, print a line after every poll.  This helps us see that
               we actually are looking at the logs, even if there are no new logs
         filter_pattern:  filter the log lines according to this pattern.
 
     Note:
         See (CloudWatch Log Filter Patterns|https://docs.aws.amazon.com/AmazonCloudWatch/latest/logs/FilterAndPatternSyntax.html)_ for info on how to format the ``filter_pattern``.
     """
-    lc = cast(TaskDefinition, obj.task_definition).logging
+    task_definition = cast(TaskDefinition, obj.task_definition)
+    lc = task_definition.logging
     if lc['logDriver'] != 'awslogs':
         raise obj.OperationFailed(
             'Task log driver is "{}"; we can only tail "awslogs"'.format(lc['logDriver'])
         )
     group = CloudWatchLogGroup.objects.get(lc['options']['awslogs-group'])
     stream_prefix = lc['options']['awslogs-stream-prefix']
+    # ECS names each task's stream "{prefix}/{container name}/{task id}", so if
+    # the task is running now, its stream is the newest one and we can find it
+    # without searching the whole log group.  We only need the task IDs, which
+    # we can get from the task ARNs without describing the tasks.
+    container_name = task_definition.containers[0].name
+    running = InvokedTask.objects.iter(obj.data['cluster'], family=obj.family, prefetch=False).only('arn')
+    candidates = [
+        f"{stream_prefix}/{container_name}/{row['arn'].rsplit('/', 1)[1]}"
+        for row in running
+    ]
     tailer = group.get_event_tailer(
         stream_prefix=stream_prefix,
         sleep=sleep,
-        filter_pattern=filter_pattern)
+        filter_pattern=filter_pattern,
+        newest_stream_candidates=candidates
+    )
     for page in tailer:
         for event in page:
             app.print("{}  {}".format(
@@ -62,10 +104,7 @@ def tail_task_logs(
                 event['message'].strip()
             ))
         if mark:
-            app.print(click.style(
-                "==============================  mark  ===================================",
-                fg="yellow"
-            ))
+            app.print(click.style(mark_line(tailer), fg="yellow"))
 
 
 def list_log_streams(app: App, obj: Task, limit=None) -> None:
@@ -145,11 +184,12 @@ class LogsCloudWatchLogGroup(ReadOnlyCrudBase):
                     'dest': 'prefix'
                 }
             ),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.model.objects.iter(
             prefix=self.app.pargs.prefix,
         )
         self.render_list(results)
@@ -161,7 +201,7 @@ class LogsCloudWatchLogGroup(ReadOnlyCrudBase):
             (
                 ['--mark'],
                 {
-                    'help': 'Print out a line every --sleep seconds.',
+                    'help': 'Print out a line after every poll.',
                     'action': 'store_true',
                     'default': False,
                     'dest': 'mark',
@@ -170,7 +210,7 @@ class LogsCloudWatchLogGroup(ReadOnlyCrudBase):
             (
                 ['--sleep'],
                 {
-                    'help': 'Sleep for this many seconds between polling Cloudwatch Logs for new messages.',
+                    'help': 'Initial seconds between polls of Cloudwatch Logs; we poll faster while busy.',
                     'type': int,
                     'default': 10,
                     'dest': 'sleep',
@@ -217,12 +257,215 @@ Tail the logs for a CloudWatch Logs Log Group.
                     ))
                 )
             if self.app.pargs.mark:
-                self.app.print(
-                    click.style(
-                        "==============================  mark  ===================================",
-                        fg="yellow"
-                    )
-                )
+                self.app.print(click.style(mark_line(tailer), fg="yellow"))
+
+    @ex(
+        help='Export events from a CloudWatch Logs Log Group to a gzipped JSON-lines file.',
+        arguments=[
+            (['name'], {'help': 'The name of the CloudWatch Logs Log Group in AWS'}),
+            (['output'], {'help': 'The file to write.  By convention this should end in .jsonl.gz'}),
+            (
+                ['--start'],
+                {
+                    'help': 'Export events at or after this UTC time, as YYYY-MM-DD or YYYY-MM-DDTHH:MM[:SS]',
+                    'type': valid_datetime,
+                    'required': True,
+                    'dest': 'start',
+                }
+            ),
+            (
+                ['--end'],
+                {
+                    'help': 'Export events before this UTC time.  Defaults to now.',
+                    'type': valid_datetime,
+                    'default': None,
+                    'dest': 'end',
+                }
+            ),
+            (
+                ['--filter-pattern'],
+                {
+                    'help': 'Export only messages matching this filter.',
+                    'default': None,
+                    'dest': 'filter_pattern',
+                }
+            ),
+            (
+                ['--stream-prefix'],
+                {
+                    'help': 'Export only messages from stream names with this prefix.',
+                    'default': None,
+                    'dest': 'stream_prefix',
+                }
+            ),
+            (
+                ['--slice-minutes'],
+                {
+                    'help': 'Fetch the time range in slices of this many minutes.',
+                    'type': int,
+                    'default': 15,
+                    'dest': 'slice_minutes',
+                }
+            ),
+            (
+                ['--workers'],
+                {
+                    'help': 'Fetch at most this many slices at once.',
+                    'type': int,
+                    'default': 8,
+                    'dest': 'workers',
+                }
+            ),
+            (
+                ['--restart'],
+                {
+                    'help': 'Ignore any checkpoint from an interrupted export and start over.',
+                    'action': 'store_true',
+                    'default': False,
+                    'dest': 'restart',
+                }
+            ),
+        ],
+        description="""
+Export the events from a CloudWatch Logs Log Group between two times to a
+gzip-compressed file with one JSON encoded event per line, in timestamp order.
+
+The time range is split into slices which are fetched concurrently.  If an
+export is interrupted, running the same command again resumes it from where it
+left off.
+""",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    @handle_model_exceptions
+    def export(self) -> None:
+        loader = self.loader(self)
+        obj = loader.get_object_from_aws(self.app.pargs.name)
+        group = cast("CloudWatchLogGroup", obj)
+        # Leave a missing --end to the exporter, so that resuming an interrupted export reuses its end time
+        end = int(self.app.pargs.end.timestamp() * 1000) if self.app.pargs.end else None
+        exporter = group.get_exporter(
+            int(self.app.pargs.start.timestamp() * 1000),
+            end,
+            stream_prefix=self.app.pargs.stream_prefix,
+            filter_pattern=self.app.pargs.filter_pattern,
+            slice_seconds=self.app.pargs.slice_minutes * 60,
+            max_workers=self.app.pargs.workers
+        )
+
+        def progress(done: int, total: int, events: int) -> None:
+            self.app.print(click.style(f'Exported {done}/{total} slices, {events} events', fg='cyan'))
+
+        count = exporter.export(self.app.pargs.output, resume=not self.app.pargs.restart, progress=progress)
+        self.app.print(click.style(f'Wrote {count} events to {self.app.pargs.output}', fg='green'))
+
+    @ex(
+        help='Run a CloudWatch Logs Insights query against one or more Log Groups.',
+        arguments=[
+            (['names'], {'help': 'The names of the CloudWatch Logs Log Groups to query', 'nargs': '+'}),
+            (
+                ['--query'],
+                {
+                    'help': 'The query, in CloudWatch Logs Insights query syntax.',
+                    'required': True,
+                    'dest': 'query',
+                }
+            ),
+            (
+                ['--start'],
+                {
+                    'help': 'Query events at or after this UTC time, as YYYY-MM-DD or YYYY-MM-DDTHH:MM[:SS].  '
+                            'Defaults to --hours before --end.',
+                    'type': valid_datetime,
+                    'default': None,
+                    'dest': 'start',
+                }
+            ),
+            (
+                ['--end'],
+                {
+                    'help': 'Query events before this UTC time.  Defaults to now.',
+                    'type': valid_datetime,
+                    'default': None,
+                    'dest': 'end',
+                }
+            ),
+            (
+                ['--hours'],
+                {
+                    'help': 'If --start is not given, query this many hours before --end.',
+                    'type': float,
+                    'default': 1,
+                    'dest': 'hours',
+                }
+            ),
+            (
+                ['--limit'],
+                {
+                    'help': 'Return at most this many results per Log Group.',
+                    'type': int,
+                    'default': None,
+                    'dest': 'limit',
+                }
+            ),
+            (
+                ['--timeout'],
+                {
+                    'help': 'Give up on any query that takes longer than this many seconds.',
+                    'type': int,
+                    'default': 300,
+                    'dest': 'timeout',
+                }
+            ),
+        ],
+        description="""
+Run a CloudWatch Logs Insights query against one or more Log Groups, and print
+the results as a table.  The searching and aggregating happens in AWS, so this
+is much faster than tailing or exporting the logs for anything but tiny time
+ranges.  Example: count errors per log stream over the last day:
+
+    deploy logs awslog-groups query my-group --hours 24 \\
+        --query 'filter @message like /ERROR/ | stats count(*) as errors by @logStream'
+
+See https://docs.aws.amazon.com/AmazonCloudWatch/latest/logs/CWL_QuerySyntax.html
+for the query syntax.
+""",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    @handle_model_exceptions
+    def query(self) -> None:
+        end = self.app.pargs.end if self.app.pargs.end else datetime.now(timezone.utc)
+        start = self.app.pargs.start if self.app.pargs.start else end - timedelta(hours=self.app.pargs.hours)
+        queries = CloudWatchLogsQuery.objects.run(
+            self.app.pargs.query,
+            self.app.pargs.names,
+            int(start.timestamp() * 1000),
+            int(end.timestamp() * 1000),
+            limit=self.app.pargs.limit,
+            timeout=self.app.pargs.timeout
+        )
+        rows: List[Dict[str, str]] = []
+        columns: Dict[str, Any] = {}
+        if len(queries) > 1:
+            columns['Log Group'] = {'key': 'Log Group', 'default': ''}
+        for query in queries:
+            for row in query.results:
+                for field in row:
+                    if field not in columns:
+                        columns[field] = {'key': field, 'default': ''}
+                row['Log Group'] = query.log_group_name
+                rows.append(row)
+        if not rows:
+            self.app.print(click.style('No results.', fg='yellow'))
+        else:
+            self.app.print(TableRenderer(columns).render(rows))
+        matched = sum(q.statistics.get('recordsMatched', 0) for q in queries)
+        scanned = sum(q.statistics.get('recordsScanned', 0) for q in queries)
+        scanned_bytes = sum(q.statistics.get('bytesScanned', 0) for q in queries)
+        self.app.print(click.style(
+            f'\n{len(rows)} results; {int(matched)} of {int(scanned)} records matched, '
+            f'{int(scanned_bytes)} bytes scanned.',
+            fg='cyan'
+        ))
 
 
 class LogsCloudWatchLogStream(ReadOnlyCrudBase):
@@ -273,11 +516,12 @@ class LogsCloudWatchLogStream(ReadOnlyCrudBase):
                     'dest': 'limit'
                 }
             ),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.model.objects.iter(
             self.app.pargs.log_group_name,
             prefix=self.app.pargs.prefix,
             limit=self.app.pargs.limit
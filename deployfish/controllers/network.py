@@ -7,6 +7,7 @@ from tabulate import tabulate
 
 from deployfish.core.loaders import ObjectLoader
 from deployfish.core.models import Model, Instance
+from deployfish.core.ssh import SSHCommandResult, SSHFanout
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
 from deployfish.types import SupportsSSHModel, SupportsService
 
@@ -161,6 +162,34 @@ class ObjectSSHController(Controller):
                     'action': 'store_true',
                     'dest': 'all'
                 }
+            ),
+            (
+                ["--workers"],
+                {
+                    'help': 'With --all, run the command on at most this many instances at once.',
+                    'default': 10,
+                    'type': int,
+                    'dest': 'workers'
+                }
+            ),
+            (
+                ["--timeout"],
+                {
+                    'help': 'With --all, give up on any instance where the command runs longer than this many seconds.',
+                    'default': None,
+                    'type': float,
+                    'dest': 'timeout'
+                }
+            ),
+            (
+                ["--buffer"],
+                {
+                    'help': 'With --all, print each instance\'s output in one block when it finishes, instead of '
+                            'as it arrives.',
+                    'default': False,
+                    'action': 'store_true',
+                    'dest': 'buffer'
+                }
             )
         ]
     )
@@ -177,10 +206,10 @@ class ObjectSSHController(Controller):
         obj = loader.get_object_from_aws(self.app.pargs.pk)
         assert hasattr(obj, 'ssh_target'), f'Objects of type {obj.__class__.__name__} do not support SSH actions'
         command = ' '.join(self.app.pargs.command)
-        if not self.app.pargs.all:
-            targets: Sequence[Instance] = [get_ssh_target(self.app, obj, choose=self.app.pargs.choose)]
-        else:
-            targets = obj.ssh_targets
+        if self.app.pargs.all:
+            self.run_all(obj.ssh_targets, command)
+            return
+        targets: Sequence[Instance] = [get_ssh_target(self.app, obj, choose=self.app.pargs.choose)]
         for target in targets:
             color = next(colors_cycle)
             success, output = target.ssh_noninteractive(command, verbose=self.app.pargs.verbose, ssh_target=target)
@@ -192,6 +221,52 @@ class ObjectSSHController(Controller):
                     line = click.style('ERROR: {}'.format(line), fg='red')
                     self.app.print('{}: {}'.format(click.style(target.name, fg=color), line))
 
+    def run_all(self, targets: Sequence[Instance], command: str) -> None:
+        """
+        Run ``command`` on all of ``targets`` at once, printing each line of
+        output prefixed by the name of the instance it came from, and then a
+        summary of how the command fared on each instance.
+        """
+        colors = dict(zip([target.pk for target in targets], cycle(self.COLORS)))
+
+        def prefix(target: Instance) -> str:
+            return click.style(target.name if target.name else target.pk, fg=colors[target.pk])
+
+        def on_line(target: Instance, line: str) -> None:
+            self.app.print('{}: {}'.format(prefix(target), line))
+
+        def on_done(result: SSHCommandResult) -> None:
+            if self.app.pargs.buffer:
+                for line in result.lines:
+                    self.app.print('{}: {}'.format(prefix(result.target), line))
+            if not result.success:
+                self.app.print('{}: {}'.format(
+                    prefix(result.target),
+                    click.style(f'ERROR: {result.status}', fg='red')
+                ))
+
+        fanout = SSHFanout(
+            command,
+            max_workers=self.app.pargs.workers,
+            timeout=self.app.pargs.timeout,
+            verbose=self.app.pargs.verbose,
+            on_line=None if self.app.pargs.buffer else on_line,
+            on_done=on_done
+        )
+        results = fanout.run(targets)
+        rows = []
+        for result in results:
+            rows.append([
+                prefix(result.target),
+                result.target.pk,
+                click.style(result.status, fg='green' if result.success else 'red'),
+                '{:.1f}s'.format(result.duration)
+            ])
+        self.app.print('\n' + tabulate(rows, headers=['Name', 'Instance Id', 'Status', 'Duration']))
+        failed = len([result for result in results if not result.success])
+        if failed:
+            self.app.print(click.style(f'\nThe command failed on {failed} of {len(results)} instances.', fg='red'))
+
 
 class ObjectDockerExecController(Controller):
 
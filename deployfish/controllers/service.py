@@ -13,6 +13,7 @@ from deployfish.controllers.secrets import ObjectSecretsController
 from deployfish.controllers.tunnel import ObjectTunnelController
 from deployfish.controllers.utils import handle_model_exceptions
 from deployfish.core.loaders import ObjectLoader, ServiceLoader
+from deployfish.core.utils import run_async
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
 
 from deployfish.core.models import (
@@ -20,10 +21,11 @@ from deployfish.core.models import (
     Service,
     StandaloneTask
 )
-from deployfish.core.waiters.hooks.ecs import ECSDeploymentStatusWaiterHook
+from deployfish.core.waiters import AdaptivePolling
+from deployfish.core.waiters.hooks.ecs import ECSDeploymentStatusWaiterHook, ECSServiceFleetStatusWaiterHook
 from deployfish.renderers.table import TableRenderer
 
-from .crud import CrudBase
+from .crud import CrudBase, LIST_FORMAT_ARGUMENT
 
 
 def valid_date(s):
@@ -85,11 +87,10 @@ class ECSService(CrudBase):
 
     def service_waiter(self, obj: Model, **kwargs) -> None:
         kwargs['WaiterHooks'] = [ECSDeploymentStatusWaiterHook(obj)]
-        timeout_minutes = os.environ.get('DEPLOYFISH_SERVICE_UPDATE_TIMEOUT', 15)
-        kwargs['WaiterConfig'] = {
-            'Delay': 10,
-            'MaxAttempts': timeout_minutes * 6
-        }
+        timeout_minutes = int(os.environ.get('DEPLOYFISH_SERVICE_UPDATE_TIMEOUT', 15))
+        # Poll quickly while the deployment is progressing and back off while
+        # it isn't, so we report completion promptly without hammering ECS
+        kwargs['WaiterPolling'] = AdaptivePolling(timeout=timeout_minutes * 60, max_delay=15)
         kwargs['services'] = [obj.name]
         kwargs['cluster'] = obj.data['cluster']
         self.wait('services_stable', **kwargs)
@@ -187,17 +188,24 @@ class ECSService(CrudBase):
                     'type': valid_date
                 }
             ),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
-            cluster_name=self.app.pargs.cluster_name,
-            service_name=self.app.pargs.service_name,
-            launch_type=self.app.pargs.launch_type,
-            scheduling_strategy=self.app.pargs.scheduling_strategy,
-            updated_since=self.app.pargs.updated_since
-        )
+        kwargs = {
+            'cluster_name': self.app.pargs.cluster_name,
+            'service_name': self.app.pargs.service_name,
+            'launch_type': self.app.pargs.launch_type,
+            'scheduling_strategy': self.app.pargs.scheduling_strategy,
+            'updated_since': self.app.pargs.updated_since
+        }
+        if self.app.pargs.output_format == 'table':
+            # We need everything before we can print the table anyway, so load the services, their clusters and their
+            # task definitions concurrently
+            results = run_async(self.model.objects.alist(**kwargs))
+        else:
+            results = self.model.objects.iter(**kwargs)
         self.render_list(results)
 
     def delete_waiter(self, obj: Model, **kwargs) -> None:
@@ -217,6 +225,8 @@ class ECSService(CrudBase):
         Show periodic updates while we change desired count for a service.
         """
         kwargs['WaiterHooks'] = [ECSDeploymentStatusWaiterHook(obj)]
+        # The same 10 minute limit as the default services_stable waiter
+        kwargs['WaiterPolling'] = AdaptivePolling(timeout=600, max_delay=15)
         kwargs['services'] = [obj.name]
         kwargs['cluster'] = obj.data['cluster']
         self.wait('services_stable', **kwargs)
@@ -255,9 +265,9 @@ class ECSService(CrudBase):
             pass
 
     @ex(
-        help='Restart the running tasks for a Service in AWS',
+        help='Restart the running tasks for one or more Services in AWS',
         arguments=[
-            (['pk'], {'help': 'The primary key for the ECS Service'}),
+            (['pks'], {'help': 'The primary keys for the ECS Services', 'nargs': '+'}),
             (
                 ['--hard'],
                 {
@@ -272,10 +282,26 @@ class ECSService(CrudBase):
     @handle_model_exceptions
     def restart(self):
         loader = self.loader(self)
-        obj = loader.get_object_from_aws(self.app.pargs.pk)
-        obj = cast(Service, obj)
-        obj.restart(hard=self.app.pargs.hard, waiter_hooks=[ECSDeploymentStatusWaiterHook(obj)])
-        return click.style('\n\nRestarted tasks for {}("{}").'.format(self.model.__name__, obj.pk), fg='green')
+        objs = [cast(Service, loader.get_object_from_aws(pk)) for pk in self.app.pargs.pks]
+        if len(objs) == 1:
+            obj = objs[0]
+            obj.restart(hard=self.app.pargs.hard, waiter_hooks=[ECSDeploymentStatusWaiterHook(obj)])
+            return click.style('\n\nRestarted tasks for {}("{}").'.format(self.model.__name__, obj.pk), fg='green')
+        # Restart all the services together, and wait on them as one fleet
+        self.model.objects.restart_many(
+            objs,
+            hard=self.app.pargs.hard,
+            waiter_hooks=[ECSServiceFleetStatusWaiterHook(objs)],
+            polling=AdaptivePolling(timeout=600, max_delay=15)
+        )
+        return click.style(
+            '\n\nRestarted tasks for {} {}s: {}.'.format(
+                len(objs),
+                self.model.__name__,
+                ', '.join(f'"{obj.pk}"' for obj in objs)
+            ),
+            fg='green'
+        )
 
     @ex(
         help='List the running tasks for an ECS Service in AWS.',
@@ -368,9 +394,9 @@ class ECSServiceStandaloneTasks(Controller):
             factory_kwargs={'load_secrets': False}
         )
         tasks = []
-        config = self.app.deployfish_config.cooked
-        if 'tasks' in config:
-            for task_data in config['tasks']:
+        config = self.app.deployfish_config
+        if config.has_section('tasks'):
+            for task_data in config.tasks:
                 if 'service' in task_data:
                     if (task_data['service'] == obj.pk or task_data['service'] == obj.name):
                         tasks.append(task_data['name'])
@@ -411,9 +437,9 @@ class ECSServiceStandaloneTasks(Controller):
             factory_kwargs={'load_secrets': False}
         )
         tasks = []
-        config = self.app.deployfish_config.cooked
-        if 'tasks' in config:
-            for task_data in config['tasks']:
+        config = self.app.deployfish_config
+        if config.has_section('tasks'):
+            for task_data in config.tasks:
                 if 'service' in task_data:
                     if (task_data['service'] == obj.pk or task_data['service'] == obj.name):
                         tasks.append(task_data['name'])
@@ -12,10 +12,10 @@ from deployfish.core.models import (
     Model,
     StandaloneTask
 )
-from deployfish.core.waiters.hooks.ecs import ECSTaskStatusHook
+from deployfish.core.waiters.hooks.ecs import ECSTaskLogsHook
 from deployfish.ext.ext_df_argparse import DeployfishArgparseController as Controller
 
-from .crud import CrudBase
+from .crud import CrudBase, LIST_FORMAT_ARGUMENT
 from .logs import tail_task_logs, list_log_streams
 from .secrets import ObjectSecretsController
 from .utils import handle_model_exceptions
@@ -152,11 +152,12 @@ class ECSStandaloneTask(CrudBase):
                     'dest': 'all_revisions',
                 }
             ),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.model.objects.iter(
             scheduled_only=self.app.pargs.scheduled_only,
             all_revisions=self.app.pargs.all_revisions,
             task_type=self.app.pargs.task_type,
@@ -267,7 +268,7 @@ If a StandaloneTask has a schedule rule and that rule is currently enabled in AW
     # Run
 
     def run_task_waiter(self, tasks: Sequence[InvokedTask], **kwargs) -> None:
-        kwargs['WaiterHooks'] = [ECSTaskStatusHook(tasks)]
+        kwargs['WaiterHooks'] = [ECSTaskLogsHook(tasks)]
         kwargs['tasks'] = [t.arn for t in tasks]
         kwargs['cluster'] = tasks[0].cluster_name
         self.wait('tasks_stopped', **kwargs)
@@ -344,7 +345,7 @@ class ECSStandaloneTaskLogs(Controller):
             (
                 ['--mark'],
                 {
-                    'help': 'Print out a line every --sleep seconds.',
+                    'help': 'Print out a line after every poll.',
                     'action': 'store_true',
                     'default': False,
                     'dest': 'mark',
@@ -353,7 +354,7 @@ class ECSStandaloneTaskLogs(Controller):
             (
                 ['--sleep'],
                 {
-                    'help': 'Sleep for this many seconds between polling Cloudwatch Logs for new messages.',
+                    'help': 'Initial seconds between polls of Cloudwatch Logs; we poll faster while busy.',
                     'type': int,
                     'default': 10,
                     'dest': 'sleep',
@@ -3,7 +3,7 @@ from typing import Dict, Any, Optional, Type
 from cement import ex, shell
 import click
 from tabulate import tabulate
-from deployfish.controllers.crud import ReadOnlyCrudBase
+from deployfish.controllers.crud import ReadOnlyCrudBase, LIST_FORMAT_ARGUMENT
 from deployfish.controllers.utils import handle_model_exceptions
 
 from deployfish.core.loaders import ObjectLoader
@@ -291,11 +291,12 @@ class Tunnels(ReadOnlyCrudBase):
                     'dest': 'port'
                 }
             ),
+            LIST_FORMAT_ARGUMENT,
         ]
     )
     @handle_model_exceptions
     def list(self):
-        results = self.model.objects.list(
+        results = self.model.objects.iter(
             service_name=self.app.pargs.service_name,
             port=self.app.pargs.port,
         )
@@ -2,7 +2,7 @@ from functools import wraps
 from typing import Callable
 
 import click
-from deployfish.core.ssh import SSHMixin
+from deployfish.core.ssh import SSHMixin, SSHMultiplexer
 
 from deployfish.exceptions import (
     ConfigProcessingFailed,
@@ -40,7 +40,8 @@ def handle_model_exceptions(func: Callable) -> Callable:  # noqa:C901
             SchemaException,
             ConfigProcessingFailed,
             NoSuchConfigSection,
-            SSHMixin.NoSSHTargetAvailable
+            SSHMixin.NoSSHTargetAvailable,
+            SSHMultiplexer.UnsafeControlDir
         ) as e:
             self.app.print(click.style(str(e), fg='red'))
         except NoSuchConfigSectionItem as e:
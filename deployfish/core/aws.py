@@ -1,13 +1,373 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import os
-from typing import Dict, Any, Optional, cast
+import random
+import threading
+import time
+import weakref
+from typing import Callable, Dict, Any, Optional, Tuple, cast
 
 import boto3
+from botocore.config import Config as BotocoreConfig
+from botocore.exceptions import ClientError
 import yaml
 
 from deployfish.exceptions import ConfigProcessingFailed
 
 
 boto3_session: Optional[boto3.session.Session] = None
+#: AWS account ids we've looked up, keyed by session
+account_ids: Dict[Any, str] = {}
+
+
+class Boto3ClientPool:
+    """
+    A process wide, thread-safe cache of boto3 clients.
+
+    Building a boto3 client is expensive: botocore has to load and parse the
+    service model, build an endpoint resolver and set up a fresh HTTP
+    connection pool.  Since boto3 clients themselves are thread-safe, we build
+    each distinct client once and hand out the same instance for the life of
+    the process.
+
+    Clients are keyed by ``(session, service_name, region_name, config)``.
+    When :py:func:`build_boto3_session` swaps out our session, it calls
+    :py:meth:`invalidate` so that we don't keep handing out clients bound to
+    the old credentials.
+    """
+
+    def __init__(self) -> None:
+        # boto3 sessions are not thread-safe, so we build clients while holding
+        # this lock
+        self._lock = threading.RLock()
+        self._clients: Dict[Tuple[Any, ...], Any] = {}
+        #: How many clients we've actually built
+        self.built: int = 0
+        #: How many times we handed out an already built client
+        self.reused: int = 0
+        #: How many times we've been emptied by :py:meth:`invalidate`
+        self.invalidations: int = 0
+
+    def _config_key(self, config: Optional[BotocoreConfig]) -> Optional[str]:
+        """
+        ``botocore.config.Config`` objects don't compare by value, so reduce
+        ``config`` to something we can use in a dict key.
+        """
+        if config is None:
+            return None
+        options = getattr(config, '_user_provided_options', {})
+        return repr(sorted(options.items()))
+
+    def get(
+        self,
+        session: boto3.session.Session,
+        service_name: str,
+        region_name: str = None,
+        config: BotocoreConfig = None
+    ) -> Any:
+        """
+        Return a boto3 client for ``service_name`` built from ``session``,
+        building it only if we haven't already built an identical one.
+
+        Args:
+            session: the boto3 session to build the client from
+            service_name: the AWS service name, e.g. ``ecs``
+
+        Keyword Args:
+            region_name: build the client for this region instead of the
+                session's default region
+            config: a ``botocore.config.Config`` to build the client with
+
+        Returns:
+            A boto3 client.
+        """
+        if session is boto3:
+            # get_boto3_session() returns the boto3 module itself if we have no
+            # configured session; use the default session in that case
+            session = boto3._get_default_session()  # pylint:disable=protected-access
+        if region_name is None:
+            region_name = session.region_name
+        key = (session, service_name, region_name, self._config_key(config))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                kwargs: Dict[str, Any] = {}
+                if region_name:
+                    kwargs['region_name'] = region_name
+                if config is not None:
+                    kwargs['config'] = config
+                client = session.client(service_name, **kwargs)
+                self._clients[key] = client
+                self.built += 1
+            else:
+                self.reused += 1
+        return client
+
+    def invalidate(self, session: boto3.session.Session = None) -> None:
+        """
+        Drop our cached clients.
+
+        Keyword Args:
+            session: if provided, drop only those clients built from this
+                session.  Otherwise drop them all.
+        """
+        with self._lock:
+            if session is None:
+                self._clients = {}
+            else:
+                self._clients = {k: v for k, v in self._clients.items() if k[0] is not session}
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return our counters as a dict.
+        """
+        with self._lock:
+            return {
+                'size': len(self._clients),
+                'built': self.built,
+                'reused': self.reused,
+                'invalidations': self.invalidations,
+            }
+
+
+client_pool = Boto3ClientPool()
+
+
+#: The error codes AWS APIs use to tell us to slow down
+THROTTLING_ERROR_CODES = frozenset([
+    'Throttling',
+    'ThrottlingException',
+    'ThrottledException',
+    'RequestThrottled',
+    'RequestThrottledException',
+    'RequestLimitExceeded',
+    'TooManyRequestsException',
+    'ProvisionedThroughputExceededException',
+    'SlowDown',
+])
+
+
+def is_throttling_error(exc: Exception) -> bool:
+    """
+    Return ``True`` if ``exc`` is AWS telling us we're calling it too often.
+    """
+    if isinstance(exc, ClientError):
+        return exc.response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+    return False
+
+
+class AdaptiveRateLimiter:
+    """
+    A thread-safe token bucket for calls to a single AWS API, whose rate adapts
+    to throttling.
+
+    Calls made through :py:meth:`call` first wait for a token.  Tokens are
+    replenished at :py:attr:`rate` per second, up to a burst of ``burst``.
+    Whenever AWS throttles us, we halve :py:attr:`rate` (down to
+    ``min_rate``) and retry after a jittered exponential backoff; every
+    successful call nudges :py:attr:`rate` back up towards its starting value.
+
+    Use one limiter per API per process and share it among all the threads
+    calling that API: AWS enforces its limits per account, not per client.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = None,
+        min_rate: float = 0.5,
+        max_retries: int = 8,
+        backoff_base: float = 0.1,
+        backoff_cap: float = 5.0
+    ) -> None:
+        """
+        Args:
+            rate: the initial, and maximum, calls per second
+
+        Keyword Args:
+            burst: how many calls we can make back to back before being limited
+                to ``rate``.  Defaults to ``rate``.
+            min_rate: never slow down below this many calls per second
+            max_retries: give up and re-raise a throttling error after this many
+                retries of a single call
+            backoff_base: the maximum sleep, in seconds, before our first retry.
+                This doubles with each further retry.
+            backoff_cap: never sleep longer than this many seconds between retries
+        """
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min_rate
+        self.capacity = float(burst if burst else max(1, int(rate)))
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+        #: How many calls we've made, including retries
+        self.calls: int = 0
+        #: How many of those calls AWS throttled
+        self.throttles: int = 0
+
+    def acquire(self) -> None:
+        """
+        Block until we're allowed to make another call.
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    self.calls += 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def throttled(self) -> None:
+        """
+        AWS throttled one of our calls: slow down.
+        """
+        with self._lock:
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def succeeded(self) -> None:
+        """
+        One of our calls succeeded: speed up a little, if we had slowed down.
+        """
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call ``func(*args, **kwargs)`` when our rate allows, retrying with
+        backoff if AWS throttles it.
+
+        Args:
+            func: typically a boto3 client method
+
+        Raises:
+            botocore.exceptions.ClientError: ``func`` failed for some other
+                reason than throttling, or was still throttled after
+                ``max_retries`` retries
+
+        Returns:
+            Whatever ``func`` returns.
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                result = func(*args, **kwargs)
+            except ClientError as e:
+                if not is_throttling_error(e) or attempt >= self.max_retries:
+                    raise
+                self.throttled()
+                time.sleep(random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt)))
+                attempt += 1
+                continue
+            self.succeeded()
+            return result
+
+
+class AsyncAWSExecutor:
+    """
+    Run blocking boto3 calls from asyncio code.
+
+    boto3 has no asyncio support, so :py:meth:`run` hands each call off to a
+    shared thread pool and awaits the result.  Since our boto3 clients come
+    from :py:data:`client_pool`, those threads all share the same clients and
+    their HTTP connection pools.
+
+    To stay within AWS's per-account API limits, we allow at most
+    ``limits[service]`` calls to be in flight at once for each AWS service
+    (``default_limit`` for services not in ``limits``), however many coroutines
+    are waiting on them.
+
+    Keyword Args:
+        max_workers: the size of our thread pool
+        limits: a dict of boto3 service name to how many calls to that service
+            may run at once.  These are merged over :py:attr:`DEFAULT_LIMITS`.
+        default_limit: the concurrency limit for services not in ``limits``
+    """
+
+    #: Per-service concurrency limits
+    DEFAULT_LIMITS: Dict[str, int] = {
+        'ecs': 10,
+        'ec2': 10,
+        'elbv2': 5,
+        'logs': 5,
+        'ssm': 5,
+    }
+
+    def __init__(self, max_workers: int = 32, limits: Dict[str, int] = None, default_limit: int = 8) -> None:
+        self.max_workers = max_workers
+        self.limits: Dict[str, int] = dict(self.DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.default_limit = default_limit
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # asyncio.Semaphore objects belong to an event loop, so we keep a set
+        # of them per loop
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='deployfish-aws')
+            return self._pool
+
+    def semaphore(self, service: Optional[str]) -> asyncio.Semaphore:
+        """
+        Return the semaphore that limits concurrent calls to ``service`` in the
+        running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.setdefault(loop, {})
+            if service not in semaphores:
+                semaphores[service] = asyncio.Semaphore(self.limits.get(cast(str, service), self.default_limit))
+            return semaphores[service]
+
+    async def run(self, service: Optional[str], func: Callable, *args, **kwargs) -> Any:
+        """
+        Call ``func(*args, **kwargs)`` in our thread pool once ``service`` has a
+        free slot, and return its result.
+
+        Args:
+            service: the boto3 service name ``func`` talks to, e.g. ``'ecs'``
+            func: the blocking callable, typically a ``Manager`` method
+        """
+        async with self.semaphore(service):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.pool, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+
+
+#: The process wide executor used by the ``Manager.a*`` methods.  See :py:func:`get_async_executor`.
+async_executor: Optional[AsyncAWSExecutor] = None
+
+
+def get_async_executor() -> AsyncAWSExecutor:
+    """
+    Return the process wide :py:class:`AsyncAWSExecutor`, building it if need be.
+    """
+    global async_executor  # pylint: disable=global-statement
+    if async_executor is None:
+        async_executor = AsyncAWSExecutor()
+    return async_executor
 
 
 class AWSSessionBuilder:
@@ -121,6 +481,9 @@ def build_boto3_session(
         boto3_session = boto3_session_override
     else:
         boto3_session = AWSSessionBuilder().new(filename, use_aws_section=use_aws_section)
+    # Any clients we built before now belong to the old session
+    client_pool.invalidate()
+    account_ids.clear()
 
 
 def get_boto3_session(boto3_session_override: boto3.session.Session = None) -> boto3.session.Session:
@@ -129,3 +492,33 @@ def get_boto3_session(boto3_session_override: boto3.session.Session = None) -> b
     if boto3_session:
         return boto3_session
     return cast(boto3.session.Session, boto3)
+
+
+def get_boto3_client(
+    service_name: str,
+    region_name: str = None,
+    config: BotocoreConfig = None,
+    boto3_session_override: boto3.session.Session = None
+) -> Any:
+    """
+    Return a pooled boto3 client for ``service_name`` built from our current
+    boto3 session.  See :py:class:`Boto3ClientPool`.
+    """
+    return client_pool.get(
+        get_boto3_session(boto3_session_override),
+        service_name,
+        region_name=region_name,
+        config=config
+    )
+
+
+def get_aws_account_id(boto3_session_override: boto3.session.Session = None) -> str:
+    """
+    Return the AWS account id for our current boto3 session.  We only ask STS
+    once per session.
+    """
+    session = get_boto3_session(boto3_session_override)
+    if session not in account_ids:
+        sts = get_boto3_client('sts', boto3_session_override=boto3_session_override)
+        account_ids[session] = sts.get_caller_identity()['Account']
+    return account_ids[session]
@@ -0,0 +1,175 @@
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+
+def get_cache_dir() -> str:
+    """
+    Return the directory under which deployfish keeps its on-disk caches.  In
+    order of precedence, this is ``$DEPLOYFISH_CACHE_DIR``,
+    ``$XDG_CACHE_HOME/deployfish`` or ``~/.cache/deployfish``.
+    """
+    if os.environ.get('DEPLOYFISH_CACHE_DIR'):
+        return os.environ['DEPLOYFISH_CACHE_DIR']
+    base = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(base, 'deployfish')
+
+
+def cache_disabled() -> bool:
+    """
+    Return ``True`` if the user has turned off our on-disk caches by setting
+    ``DEPLOYFISH_DISABLE_CACHE=true`` in the environment.
+    """
+    return os.environ.get('DEPLOYFISH_DISABLE_CACHE', 'false').lower() == 'true'
+
+
+class _JSONEncoder(json.JSONEncoder):
+    """
+    boto3 responses contain ``datetime`` objects, which plain JSON can't
+    represent, so tag them so :py:func:`_json_object_hook` can restore them.
+    """
+
+    def default(self, o: Any) -> Any:  # pylint:disable=method-hidden
+        if isinstance(o, datetime.datetime):
+            return {'__datetime__': o.isoformat()}
+        return super().default(o)
+
+
+def _json_object_hook(obj: Dict[str, Any]) -> Any:
+    if len(obj) == 1 and '__datetime__' in obj:
+        return datetime.datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+class DiskCache:
+    """
+    A small, best-effort, content-addressed cache of JSON-serializable objects
+    on local disk.
+
+    Each entry is stored in its own file under ``<cache dir>/<namespace>``,
+    named for the SHA-256 of its key, and written atomically so concurrent
+    deployfish processes can share the cache.  Reads touch the file's mtime, so
+    when the total size of the namespace exceeds ``max_bytes`` we can evict the
+    least recently used entries first.
+
+    Any filesystem error is treated as a cache miss: the cache should never be
+    the reason a command fails.
+    """
+
+    def __init__(self, namespace: str, max_bytes: int = 50 * 1024 * 1024, ttl: int = None) -> None:
+        """
+        Args:
+            namespace: the subdirectory of our cache directory to use
+
+        Keyword Args:
+            max_bytes: evict least recently used entries once the namespace
+                grows beyond this many bytes
+            ttl: if provided, entries older than this many seconds are
+                considered stale and are not returned by :py:meth:`get`
+        """
+        self.namespace = namespace
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits: int = 0
+        self.misses: int = 0
+
+    @property
+    def path(self) -> str:
+        # Look this up each time so that tests and users can change the
+        # environment after we've been instantiated
+        return os.path.join(get_cache_dir(), self.namespace)
+
+    @property
+    def enabled(self) -> bool:
+        return not cache_disabled()
+
+    def _filename(self, key: str) -> str:
+        return os.path.join(self.path, hashlib.sha256(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the object stored under ``key``, or ``None`` if we don't have it
+        or our copy is older than :py:attr:`ttl`.
+        """
+        if not self.enabled:
+            return None
+        filename = self._filename(key)
+        try:
+            with open(filename, encoding='utf-8') as f:
+                entry = json.load(f, object_hook=_json_object_hook)
+            if self.ttl is not None and time.time() - entry['created'] > self.ttl:
+                self.misses += 1
+                return None
+            # Mark this entry as recently used
+            os.utime(filename)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry['value']
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store ``value`` under ``key``, then evict old entries if we've grown
+        too big.
+        """
+        if not self.enabled:
+            return
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            fd, tmpname = tempfile.mkstemp(dir=self.path, suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'created': time.time(), 'value': value}, f, cls=_JSONEncoder)
+            os.replace(tmpname, self._filename(key))
+        except (OSError, TypeError, ValueError):
+            try:
+                os.remove(tmpname)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._filename(key))
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """
+        Remove least recently used entries until we're under :py:attr:`max_bytes`.
+        """
+        try:
+            entries = []
+            total = 0
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    if entry.is_file() and entry.name.endswith('.json'):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+                        total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            for _, size, filename in sorted(entries):
+                os.remove(filename)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        try:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    if entry.is_file():
+                        os.remove(entry.path)
+        except OSError:
+            pass
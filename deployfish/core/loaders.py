@@ -144,9 +144,7 @@ class ObjectLoader:
         if not factory_kwargs:
             factory_kwargs = {}
         if model.config_section != 'NO_SECTION':
-            try:
-                config.get_section(model.config_section)
-            except KeyError:
+            if not config.has_section(model.config_section):
                 raise self.DeployfishSectionDoesNotExist(model.config_section)
             try:
                 data = config.get_section_item(model.config_section, identifier)
@@ -1,12 +1,18 @@
+import asyncio
+from collections import defaultdict
 from copy import deepcopy
+import functools
+import itertools
 import json
-from typing import Callable, List, Any, Dict, Sequence, Union, NoReturn
+import threading
+from typing import Callable, Iterable, Iterator, List, Any, Dict, Optional, Sequence, Tuple, Union, NoReturn, cast
 
 from botocore import waiter, xform_name
 from jsondiff import diff
 
 from deployfish.types import SupportsCache, SupportsModel
-from deployfish.core.aws import get_boto3_session
+from deployfish.core.aws import get_async_executor, get_boto3_client
+from deployfish.core.utils import concurrent_imap
 from deployfish.core.waiters import create_hooked_waiter_with_client
 from deployfish.exceptions import (
     MultipleObjectsReturned as BaseMultipleObjectsReturned,
@@ -34,17 +40,515 @@ class LazyAttributeMixin(SupportsCache):
         self.cache = {}
 
 
+class IdentityMap:
+    """
+    A unit-of-work scoped cache of the model instances we've loaded from AWS.
+
+    While an :py:class:`IdentityMap` is active, every call to ``Manager.get``
+    and ``Manager.get_many`` consults it before going to AWS, so asking for the
+    same object twice -- for instance the ``Cluster`` behind each of a dozen
+    ``InvokedTask`` objects -- costs one API call and yields the very same
+    instance.  Entries are keyed by ``(manager, pk)``; since each model class
+    has its own manager, that amounts to ``(model class, pk)``.
+
+    This is opt-in: nothing is cached unless you activate a map::
+
+        with IdentityMap() as identity_map:
+            ...
+        print(identity_map.stats())
+
+    Only plain lookups are cached.  Calls that pass extra arguments to ``get``
+    or ``get_many`` bypass the map, and ``Manager.save`` and ``Manager.delete``
+    forget everything we know about that manager's objects.
+    """
+
+    _active: Optional["IdentityMap"] = None
+    _active_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._objects: Dict[Tuple["Manager", str], "Model"] = {}
+        self._lock = threading.Lock()
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        self._previous: Optional["IdentityMap"] = None
+
+    @classmethod
+    def active(cls) -> Optional["IdentityMap"]:
+        """
+        Return the currently active :py:class:`IdentityMap`, if any.
+        """
+        return cls._active
+
+    def activate(self) -> None:
+        with self._active_lock:
+            self._previous = IdentityMap._active
+            IdentityMap._active = self
+
+    def deactivate(self) -> None:
+        with self._active_lock:
+            if IdentityMap._active is self:
+                IdentityMap._active = self._previous
+            self._previous = None
+
+    def __enter__(self) -> "IdentityMap":
+        self.activate()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.deactivate()
+
+    def lookup(self, manager: "Manager", pk: str) -> Optional["Model"]:
+        """
+        Return the object ``manager`` loaded earlier for ``pk``, or ``None``,
+        and record the hit or miss.
+        """
+        with self._lock:
+            obj = self._objects.get((manager, pk))
+            if obj is None:
+                self.misses[manager.__class__.__name__] += 1
+            else:
+                self.hits[obj.__class__.__name__] += 1
+        return obj
+
+    def peek(self, manager: "Manager", pk: str) -> Optional["Model"]:
+        """
+        Like :py:meth:`lookup`, but don't record a hit or miss.
+        """
+        with self._lock:
+            return self._objects.get((manager, pk))
+
+    def add(self, manager: "Manager", obj: "Model", *pks: str) -> None:
+        """
+        Remember ``obj`` under each of ``pks``, as well as its own ``pk`` and
+        ``arn``, if it has them.
+        """
+        keys = list(pks)
+        for attr in ('pk', 'arn'):
+            try:
+                keys.append(getattr(obj, attr))
+            except Exception:  # pylint:disable=broad-except
+                # Not every model implements both of these, and some of them
+                # raise if the model isn't fully populated
+                pass
+        with self._lock:
+            for key in keys:
+                if isinstance(key, str):
+                    self._objects[(manager, key)] = obj
+
+    def evict(self, manager: "Manager", pk: str = None) -> None:
+        """
+        Forget ``pk`` for ``manager``, or all of ``manager``'s objects if
+        ``pk`` is not given.
+        """
+        with self._lock:
+            if pk is not None:
+                obj = self._objects.get((manager, pk))
+                doomed = [key for key, value in self._objects.items() if key == (manager, pk) or value is obj]
+            else:
+                doomed = [key for key in self._objects if key[0] is manager]
+            for key in doomed:
+                del self._objects[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._objects = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the total hits and misses, and a per model break down of them.
+        """
+        with self._lock:
+            names = sorted(set(self.hits) | set(self.misses))
+            return {
+                'size': len(self._objects),
+                'hits': sum(self.hits.values()),
+                'misses': sum(self.misses.values()),
+                'by_model': {name: {'hits': self.hits[name], 'misses': self.misses[name]} for name in names},
+            }
+
+
+def _identity_mapped_get(get: Callable) -> Callable:
+    @functools.wraps(get)
+    def wrapper(self, pk, *args, **kwargs):
+        identity_map = IdentityMap.active()
+        if identity_map is None or args or kwargs or not isinstance(pk, str):
+            return get(self, pk, *args, **kwargs)
+        obj = identity_map.lookup(self, pk)
+        if obj is None:
+            obj = get(self, pk)
+            identity_map.add(self, obj, pk)
+        return obj
+    return wrapper
+
+
+def _identity_mapped_get_many(get_many: Callable) -> Callable:
+    @functools.wraps(get_many)
+    def wrapper(self, pks, *args, **kwargs):
+        identity_map = IdentityMap.active()
+        if identity_map is None or args or kwargs or not all(isinstance(pk, str) for pk in pks):
+            return get_many(self, pks, *args, **kwargs)
+        pks = list(dict.fromkeys(pks))
+        found: Dict[str, "Model"] = {}
+        missing = []
+        for pk in pks:
+            obj = identity_map.lookup(self, pk)
+            if obj is None:
+                missing.append(pk)
+            else:
+                found[pk] = obj
+        objs = list(get_many(self, missing)) if missing else []
+        for obj in objs:
+            identity_map.add(self, obj)
+        # Return our results in the order of pks, like get_many() does
+        results = []
+        seen = set()
+        for pk in pks:
+            obj = found[pk] if pk in found else identity_map.peek(self, pk)
+            if obj is not None and id(obj) not in seen:
+                seen.add(id(obj))
+                results.append(obj)
+        # Anything get_many() returned that isn't known by the pk we asked for it by
+        results.extend(obj for obj in objs if id(obj) not in seen)
+        return results
+    return wrapper
+
+
+def _identity_map_evicting(method: Callable) -> Callable:
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            identity_map = IdentityMap.active()
+            if identity_map is not None:
+                identity_map.evict(self)
+    return wrapper
+
+
+class QuerySet:
+    """
+    A lazy, list-like view of the objects a :py:class:`Manager` lists.
+
+    Nothing is loaded from AWS until we're iterated over, and then only as much
+    as we need: ``first()``, ``qs[:5]`` and the like stop paging through AWS
+    as soon as they have enough objects.  Results come from one of two sources:
+
+        * ``pks``: a callable returning an iterator of primary keys, usually
+          one ``list_*`` page at a time.  We hydrate these into objects with
+          ``manager.get_many()`` in chunks of :py:attr:`chunk_size`, so
+          ``count()`` and ``only()`` on fields derivable from the primary key
+          need no ``describe_*`` calls at all.
+        * ``objects``: a callable returning an iterator of objects, for APIs
+          whose listing calls return fully described objects.
+
+    Use it like a list (``len()``, indexing and iteration all work) or refine
+    it like so::
+
+        Service.objects.iter(cluster_name='foo*').filter(launch_type='FARGATE').first()
+
+    Each refinement returns a new :py:class:`QuerySet`.
+
+    Args:
+        manager: the manager whose objects we list
+
+    Keyword Args:
+        pks: a callable returning an iterator of primary keys to hydrate
+        objects: a callable returning an iterator of objects
+        chunk_size: hydrate this many primary keys per ``get_many()`` call.
+            Defaults to ``manager.chunk_size``.
+        get_many_kwargs: extra kwargs for ``manager.get_many()``
+        prefetch: a callable to which we pass each list of objects we hydrate,
+            so that it can load their related objects in bulk
+        max_workers: when we hydrate all our primary keys, run up to this many
+            ``get_many()`` calls at once, starting each as soon as its chunk of
+            primary keys is full.  Defaults to ``manager.max_workers``.
+        cache: if ``True``, the first time we're iterated over we load all our
+            objects and keep them, like a ``list``.  If ``False``, every
+            iteration goes back to AWS, but we never hold more than a chunk of
+            objects in memory.
+    """
+
+    def __init__(
+        self,
+        manager: "Manager",
+        pks: Callable[[], Iterable[str]] = None,
+        objects: Callable[[], Iterable["Model"]] = None,
+        chunk_size: int = None,
+        get_many_kwargs: Dict[str, Any] = None,
+        prefetch: Callable[[List["Model"]], None] = None,
+        max_workers: int = None,
+        cache: bool = True
+    ) -> None:
+        assert (pks is None) != (objects is None), 'QuerySet: pass exactly one of `pks` and `objects`'
+        self.manager = manager
+        self.pks = pks
+        self.objects = objects
+        self.chunk_size: int = chunk_size if chunk_size else manager.chunk_size
+        self.get_many_kwargs: Dict[str, Any] = get_many_kwargs if get_many_kwargs else {}
+        self.prefetch = prefetch
+        self.max_workers: int = max_workers if max_workers else manager.max_workers
+        self.cache = cache
+        self.filters: List[Callable[["Model"], bool]] = []
+        self.fields: Optional[Tuple[str, ...]] = None
+        self.start: int = 0
+        self.stop: Optional[int] = None
+        self._result_cache: Optional[List[Any]] = None
+
+    def _clone(self, **kwargs) -> "QuerySet":
+        clone = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone.filters = list(self.filters)
+        clone._result_cache = None
+        clone.__dict__.update(kwargs)
+        return clone
+
+    # Refinements
+
+    def filter(self, *predicates: Callable[["Model"], bool], **lookups: Any) -> "QuerySet":
+        """
+        Return only the objects for which each of ``predicates`` returns
+        ``True`` and whose attributes match ``lookups``, e.g.
+        ``filter(lambda s: s.data['runningCount'] > 0, launch_type='FARGATE')``.
+        """
+        clone = self._clone()
+        clone.filters.extend(predicates)
+        for attr, value in lookups.items():
+            clone.filters.append(lambda obj, attr=attr, value=value: getattr(obj, attr) == value)
+        return clone
+
+    def only(self, *fields: str) -> "QuerySet":
+        """
+        Yield dicts of just ``fields`` instead of objects.  If our manager can
+        derive all of ``fields`` from the primary key (see
+        :py:attr:`Manager.pk_fields`) and we have no filters, we don't hydrate
+        anything.
+        """
+        return self._clone(fields=tuple(fields))
+
+    def chunks(self, chunk_size: int) -> "QuerySet":
+        """
+        Hydrate ``chunk_size`` primary keys per ``get_many()`` call.
+        """
+        return self._clone(chunk_size=chunk_size)
+
+    def __getitem__(self, key: Union[int, slice]) -> Any:
+        if self._result_cache is not None:
+            return self._result_cache[key]
+        if isinstance(key, slice):
+            if key.step is not None or any(k is not None and k < 0 for k in (key.start, key.stop)):
+                return list(self)[key]
+            start = self.start + (key.start or 0)
+            stop = self.start + key.stop if key.stop is not None else None
+            if self.stop is not None:
+                stop = self.stop if stop is None else min(stop, self.stop)
+                start = min(start, self.stop)
+            return self._clone(start=start, stop=stop)
+        if key < 0:
+            return list(self)[key]
+        for obj in self[key:key + 1]:
+            return obj
+        raise IndexError('QuerySet index out of range')
+
+    # Evaluation
+
+    def first(self) -> Any:
+        """
+        Return our first result, or ``None`` if we have none.
+        """
+        for obj in self[:1]:
+            return obj
+        return None
+
+    def count(self) -> int:
+        """
+        Return how many results we have.  If we list primary keys and have no
+        filters, this just counts the primary keys.
+        """
+        if self._result_cache is not None:
+            return len(self._result_cache)
+        if self._is_empty_slice():
+            return 0
+        if self.pks is not None and not self.filters:
+            count = sum(1 for _ in self.pks()) - self.start
+            if self.stop is not None:
+                count = min(count, self.stop - self.start)
+            return max(count, 0)
+        return sum(1 for _ in self._iterate())
+
+    def _needs_hydration(self) -> bool:
+        return (
+            self.pks is None
+            or bool(self.filters)
+            or self.fields is None
+            or not set(self.fields) <= set(self.manager.pk_fields)
+        )
+
+    def _hydrate(self, per_chunk_prefetch: bool = True) -> Iterator["Model"]:
+        if self.objects is not None:
+            yield from self.objects()
+            return
+        if self._is_empty_slice():
+            return
+        pks = iter(self.pks())
+
+        def hydrate_chunk(chunk: List[str]) -> List["Model"]:
+            objects = list(self.manager.get_many(chunk, **self.get_many_kwargs))
+            if self.prefetch and per_chunk_prefetch and objects:
+                self.prefetch(objects)
+            return objects
+
+        if self.stop is None and self.max_workers > 1:
+            # We'll need everything, so hydrate chunks concurrently while we're still listing primary keys
+            chunks = iter(lambda: list(itertools.islice(pks, self.chunk_size)), [])
+            for objects in concurrent_imap(hydrate_chunk, chunks, max_workers=self.max_workers):
+                yield from objects
+            return
+        produced = 0
+        while True:
+            size = self.chunk_size
+            if self.stop is not None and not self.filters:
+                # Don't describe more than we'll need
+                size = max(1, min(size, self.stop - produced))
+            chunk = list(itertools.islice(pks, size))
+            if not chunk:
+                return
+            objects = hydrate_chunk(chunk)
+            produced += len(objects)
+            yield from objects
+
+    def _is_empty_slice(self) -> bool:
+        return self.stop is not None and self.start >= self.stop
+
+    def _iterate(self, per_chunk_prefetch: bool = True, source: Iterable[Any] = None) -> Iterator[Any]:
+        if self._is_empty_slice():
+            return
+        if source is not None:
+            pass
+        elif self._needs_hydration():
+            source = self._hydrate(per_chunk_prefetch=per_chunk_prefetch)
+        else:
+            source = self.pks()
+        skipped = 0
+        count = 0
+        for obj in source:
+            if not all(f(obj) for f in self.filters):
+                continue
+            if skipped < self.start:
+                skipped += 1
+                continue
+            if self.fields is None:
+                yield obj
+            elif self._needs_hydration():
+                yield {field: getattr(obj, field) for field in self.fields}
+            else:
+                yield {field: self.manager.pk_fields[field](obj) for field in self.fields}
+            count += 1
+            if self.stop is not None and count >= self.stop - self.start:
+                return
+
+    async def alist(self) -> List[Any]:
+        """
+        Evaluate us from asyncio code and return our results as a list.
+
+        If we hydrate primary keys, we list them all first and then hydrate all
+        our chunks concurrently, subject to the per-service limits of
+        :py:class:`deployfish.core.aws.AsyncAWSExecutor`.  Otherwise, we're
+        evaluated in one of the executor's threads.
+        """
+        if self._result_cache is not None:
+            return list(self._result_cache)
+        executor = get_async_executor()
+        service = self.manager.service
+        if self.pks is None or self.stop is not None or not self._needs_hydration():
+            return await executor.run(service, list, self)
+        pks = await executor.run(service, lambda: list(cast(Callable, self.pks)()))
+        chunks = [pks[i:i + self.chunk_size] for i in range(0, len(pks), self.chunk_size)]
+        pages = await asyncio.gather(*[
+            executor.run(service, self.manager.get_many, chunk, **self.get_many_kwargs) for chunk in chunks
+        ])
+        results = list(self._iterate(source=(obj for page in pages for obj in page)))
+        if self.prefetch and results and self.fields is None:
+            await executor.run(service, self.prefetch, results)
+        if self.cache:
+            self._result_cache = results
+        return results
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._result_cache is not None:
+            return iter(self._result_cache)
+        if self.cache:
+            results = list(self._iterate(per_chunk_prefetch=False))
+            if self.prefetch and results and self.fields is None:
+                self.prefetch(results)
+            self._result_cache = results
+            return iter(results)
+        return self._iterate()
+
+    def __len__(self) -> int:
+        if not self.cache:
+            # Like any other iterator, we have no length: finding it would mean going back to AWS.  list() relies on
+            # this TypeError to know not to ask.
+            raise TypeError('This QuerySet does not keep its results; use .count() instead of len()')
+        return len(list(iter(self)))
+
+    def __bool__(self) -> bool:
+        if self.cache:
+            return bool(list(iter(self)))
+        return self.first() is not None
+
+    def __contains__(self, obj: Any) -> bool:
+        return any(o == obj for o in self)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (QuerySet, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __add__(self, other: Iterable[Any]) -> List[Any]:
+        return list(self) + list(other)
+
+    def __radd__(self, other: Iterable[Any]) -> List[Any]:
+        return list(other) + list(self)
+
+    def __repr__(self) -> str:
+        if self._result_cache is not None:
+            return f'<QuerySet {self._result_cache!r}>'
+        return f'<QuerySet of {self.manager.__class__.__name__} (unevaluated)>'
+
+
 class Manager:
 
     service: str
 
+    #: How many primary keys :py:class:`QuerySet` hydrates per ``get_many()`` call
+    chunk_size: int = 100
+    #: How many ``get_many()`` calls :py:class:`QuerySet` may make at once
+    max_workers: int = 1
+    #: Functions that derive a field's value from one of the primary keys that
+    #: :py:class:`QuerySet` iterates over, so that ``QuerySet.only()`` can skip
+    #: hydrating objects
+    pk_fields: Dict[str, Callable[[str], Any]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        # Route every manager's reads through the active IdentityMap, and make
+        # its writes invalidate it.
+        super().__init_subclass__(**kwargs)
+        for name, decorator in (
+            ('get', _identity_mapped_get),
+            ('get_many', _identity_mapped_get_many),
+            ('save', _identity_map_evicting),
+            ('delete', _identity_map_evicting),
+        ):
+            if name in cls.__dict__:
+                setattr(cls, name, decorator(cls.__dict__[name]))
+
     def __init__(self):
         self._client = None
 
     @property
     def client(self):
         if self.service:
-            self._client = get_boto3_session().client(self.service)
+            self._client = get_boto3_client(self.service)
         else:
             self._client = None
         return self._client
@@ -67,6 +571,42 @@ class Manager:
 
     list: Callable[..., Sequence["Model"]]
 
+    def iter(self, *args, **kwargs) -> QuerySet:
+        """
+        Return a :py:class:`QuerySet` of the same objects as
+        ``self.list(*args, **kwargs)`` that doesn't keep its results, so that
+        iterating over it never holds the whole list in memory.
+
+        Managers that page through results in AWS override this to list each
+        page as it is needed, and implement ``list`` in terms of it.  By
+        default we just iterate over ``self.list()``.
+        """
+        return QuerySet(self, objects=lambda: self.list(*args, **kwargs), cache=False)
+
+    # asyncio variants.  These run the synchronous methods in the threads of
+    # deployfish.core.aws.AsyncAWSExecutor, so that many of them can run at
+    # once from a single event loop.
+
+    async def aget(self, pk: str, **kwargs) -> "Model":
+        """
+        The awaitable version of :py:meth:`get`.
+        """
+        return await get_async_executor().run(self.service, self.get, pk, **kwargs)
+
+    async def aget_many(self, pks: List[str], **kwargs) -> Sequence["Model"]:
+        """
+        The awaitable version of :py:meth:`get_many`.
+        """
+        return await get_async_executor().run(self.service, self.get_many, pks, **kwargs)
+
+    async def alist(self, *args, **kwargs) -> List["Model"]:
+        """
+        The awaitable version of :py:meth:`list`.  This takes the same
+        arguments as :py:meth:`iter`, and evaluates the resulting
+        :py:class:`QuerySet` with :py:meth:`QuerySet.alist`.
+        """
+        return await self.iter(*args, **kwargs).alist()
+
     def delete(self, obj: "Model", **_) -> Union[None, NoReturn]:
         raise obj.ReadOnly(f'Cannot modify {obj.__class__.__name__} objects with deployfish.')
 
@@ -177,6 +717,14 @@ class Model(LazyAttributeMixin, SupportsModel):
     def exists(self) -> bool:
         return self.objects.exists(self.pk)
 
+    async def aload_related(self) -> None:
+        """
+        Load, concurrently, the related objects we'll need to show this object
+        in detail, and cache them on ourselves.  Subclasses with expensive
+        related objects override this; by default we load nothing.
+        """
+        return None
+
     def render_for_display(self) -> Dict[str, Any]:
         return self.render()
 
@@ -216,6 +764,9 @@ class Model(LazyAttributeMixin, SupportsModel):
 
     def reload_from_db(self) -> None:
         self.purge_cache()
+        identity_map = IdentityMap.active()
+        if identity_map is not None:
+            identity_map.evict(self.objects, self.pk)
         new = self.objects.get(self.pk)
         self.data = new.data
 
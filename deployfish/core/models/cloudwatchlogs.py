@@ -1,9 +1,34 @@
-from typing import List, Dict, Sequence, Any, Optional
+from collections import OrderedDict, deque
+from typing import Callable, List, Dict, Iterator, Sequence, Any, Optional, Deque, Tuple, cast
 from datetime import datetime
+import gzip
+import json
+import os
 import time
 
-from deployfish.core.aws import get_boto3_session
-from .abstract import Manager, Model
+from deployfish.core.aws import AdaptiveRateLimiter, get_aws_account_id, get_boto3_client
+from deployfish.core.cache import DiskCache
+from deployfish.core.utils import concurrent_imap, concurrent_map
+from .abstract import Manager, Model, QuerySet
+
+
+#: ``filter_log_events`` accepts at most this many names in ``logStreamNames``
+FILTER_LOG_EVENTS_MAX_STREAM_NAMES: int = 100
+
+
+def stream_name_batches(stream_names: Optional[List[str]]) -> List[Optional[List[str]]]:
+    """
+    Split ``stream_names`` into lists short enough for the ``logStreamNames``
+    argument to ``filter_log_events``.
+
+    Returns:
+        A list of lists of stream names, or ``[None]`` if ``stream_names`` is
+        empty, meaning "don't filter by stream name".
+    """
+    if not stream_names:
+        return [None]
+    size = FILTER_LOG_EVENTS_MAX_STREAM_NAMES
+    return [stream_names[i:i + size] for i in range(0, len(stream_names), size)]
 
 
 class CloudWatchLogStreamIterator:
@@ -15,7 +40,7 @@ class CloudWatchLogStreamIterator:
         """
         :param start_time datetime: a timezone aware, UTC datetime
         """
-        self.client = get_boto3_session().client('logs')
+        self.client = get_boto3_client('logs')
         self.kwargs = {
             'logGroupName': stream.data['logGroupName'],
             'logStreamName': stream.name,
@@ -45,30 +70,80 @@ class CloudWatchLogStreamIterator:
 
 class CloudWatchLogGroupTailer:
     """
-    An iterator class that allows you to tail live logs from a CloudWatchLogStream.
+    An iterator class that allows you to tail live logs from a CloudWatchLogGroup.
+
+    We poll either all streams in the group, the streams whose names start with
+    ``stream_prefix``, or exactly the streams named in ``stream_names``.  Each
+    page of events is sorted by timestamp, so events from different streams
+    come out interleaved in the order in which they happened.
+
+    CloudWatch Logs can ingest an event some time after its timestamp, so each
+    poll asks for events starting ``overlap`` seconds before the newest event
+    we've seen, and we drop any events we've already returned by remembering
+    the IDs of the last ``max_seen`` events.
+
+    The time we sleep between polls adapts to how busy the group is: we halve
+    it (down to ``min_sleep``) after each poll that returns events, and
+    multiply it by 1.5 (up to ``max_sleep``) after each poll that doesn't.
+    :py:attr:`calls_per_minute` reports how many ``filter_log_events`` calls
+    we've made in the last minute, to compare against the CloudWatch Logs TPS
+    quota.
+
+    Args:
+        group: the log group to tail
+
+    Keyword Args:
+        stream_prefix: only return events from streams whose names start with this
+        sleep: how long to sleep between our first few polls, in seconds
+        filter_pattern: only return events matching this filter pattern
+        start_time: return events newer than this, in milliseconds since the epoch
+        stream_names: only return events from these streams
+        min_sleep: never sleep less than this between polls
+        max_sleep: never sleep more than this between polls.  Defaults to ``4 * sleep``.
+        overlap: how many seconds each poll overlaps the previous one
+        max_seen: how many recent event IDs to remember for deduplication
     """
 
     def __init__(
         self,
         group: "CloudWatchLogGroup",
         stream_prefix: str = None,
-        sleep: int = 5,
+        sleep: float = 5,
         filter_pattern: str = None,
-        start_time: int = None
+        start_time: int = None,
+        stream_names: List[str] = None,
+        min_sleep: float = 1,
+        max_sleep: float = None,
+        overlap: float = 5,
+        max_seen: int = 10000
     ):
-        self.client = get_boto3_session().client('logs')
+        self.client = get_boto3_client('logs')
         self.kwargs: Dict[str, Any] = {'logGroupName': group.name}
-        if stream_prefix:
+        # filter_log_events won't take both logStreamNames and logStreamNamePrefix, and takes only so many
+        # logStreamNames at once, so we make one call chain per batch of names
+        self.stream_names: Optional[List[str]] = stream_names if stream_names else None
+        if not stream_names and stream_prefix:
             self.kwargs['logStreamNamePrefix'] = stream_prefix
         if filter_pattern:
             self.kwargs['filterPattern'] = filter_pattern
         # startTime is milliseconds since Jan 1, 1970 00:00:00 UTC
         if start_time:
-            self.kwargs['startTime'] = start_time - (1000 * sleep)
+            self.start_time: int = int(start_time - (1000 * sleep))
         else:
-            self.kwargs['startTime'] = int(((datetime.utcnow() - datetime(1970, 1, 1)).total_seconds() - sleep) * 1000)
-        self.sleep: int = sleep
-        self.last_event_ids: List[str] = []
+            self.start_time = int(((datetime.utcnow() - datetime(1970, 1, 1)).total_seconds() - sleep) * 1000)
+        self.kwargs['startTime'] = self.start_time
+        self.min_sleep: float = min(min_sleep, sleep)
+        self.max_sleep: float = max_sleep if max_sleep is not None else 4 * sleep
+        self.sleep: float = sleep
+        self.overlap: int = int(overlap * 1000)
+        self.max_seen: int = max_seen
+        #: the IDs of the events we've returned most recently, oldest first
+        self.seen: "OrderedDict[str, None]" = OrderedDict()
+        #: the timestamp of the newest event we've returned
+        self.last_timestamp: Optional[int] = None
+        #: the total number of ``filter_log_events`` calls we've made
+        self.api_calls: int = 0
+        self._call_times: Deque[float] = deque()
         self.started: bool = False
 
     def __iter__(self) -> "CloudWatchLogGroupTailer":
@@ -80,21 +155,64 @@ class CloudWatchLogGroupTailer:
             self.started = True
         else:
             time.sleep(self.sleep)
-        if not self.last_event_ids:
-            self.kwargs['startTime'] += self.sleep * 1000
+        return self.fetch()
+
+    @property
+    def calls_per_minute(self) -> int:
+        """
+        The number of ``filter_log_events`` calls we've made in the last 60 seconds.
+        """
+        cutoff = time.monotonic() - 60
+        while self._call_times and self._call_times[0] < cutoff:
+            self._call_times.popleft()
+        return len(self._call_times)
+
+    def remember(self, event_id: str) -> None:
+        self.seen[event_id] = None
+        if len(self.seen) > self.max_seen:
+            self.seen.popitem(last=False)
+
+    def _pages(self, paginator) -> Iterator[Dict[str, Any]]:
+        for batch in stream_name_batches(self.stream_names):
+            kwargs = dict(self.kwargs)
+            if batch:
+                kwargs['logStreamNames'] = batch
+            yield from paginator.paginate(**kwargs)
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        """
+        Return any events that have arrived since our last fetch, without
+        sleeping first.  Use this instead of iterating when you want to control
+        the polling schedule yourself.
+
+        Returns:
+            A list of event dicts, sorted by timestamp.
+        """
+        if self.last_timestamp is not None:
+            self.kwargs['startTime'] = max(self.start_time, self.last_timestamp - self.overlap)
         paginator = self.client.get_paginator('filter_log_events')
-        response_iterator = paginator.paginate(**self.kwargs)
         events = []
-        for response in response_iterator:
+        for response in self._pages(paginator):
+            # Each page is one filter_log_events call
+            self.api_calls += 1
+            self._call_times.append(time.monotonic())
             for event in response['events']:
+                if event['eventId'] in self.seen:
+                    # Refresh it, so it stays with us while it's still inside our overlap window
+                    self.seen.move_to_end(event['eventId'])
+                    continue
                 # Just convert our timetamp to something more useful
                 event['raw_timestamp'] = event['timestamp']
                 event['timestamp'] = datetime.fromtimestamp(event['timestamp'] / 1000.0)
-                if event['eventId'] not in self.last_event_ids:
-                    events.append(event)
+                self.remember(event['eventId'])
+                events.append(event)
+        events.sort(key=lambda e: e['raw_timestamp'])
         if events:
-            self.kwargs['startTime'] = events[-1]['raw_timestamp']
-            self.last_event_ids = [e['eventId'] for e in events]
+            if self.last_timestamp is None or events[-1]['raw_timestamp'] > self.last_timestamp:
+                self.last_timestamp = events[-1]['raw_timestamp']
+            self.sleep = max(self.min_sleep, self.sleep / 2)
+        else:
+            self.sleep = min(self.max_sleep, self.sleep * 1.5)
         return events
 
 
@@ -107,7 +225,7 @@ class CloudWatchLogStreamTailer:
         """
         :param start_time datetime: a timezone aware, UTC datetime
         """
-        self.client = get_boto3_session().client('logs')
+        self.client = get_boto3_client('logs')
         self.kwargs: Dict[str, Any] = {
             'logGroupName': stream.data['logGroupName'],
             'logStreamName': stream.name,
@@ -142,6 +260,202 @@ class CloudWatchLogStreamTailer:
             self.last_event = events[-1]
         return events
 
+
+class CloudWatchLogGroupExporter:
+    """
+    Export all the events in a CloudWatchLogGroup between two times to a
+    gzip-compressed JSON-lines file, one event per line, in timestamp order.
+
+    Paging through a busy group with a single ``filter_log_events`` call chain
+    is slow, so we split ``[start_time, end_time)`` into ``slice_seconds``
+    long slices, fetch up to ``max_workers`` slices concurrently, and write the
+    slices to our file in order as they become available.  All exporters share
+    a single :py:class:`deployfish.core.aws.AdaptiveRateLimiter` for
+    ``filter_log_events``, so that we back off instead of failing when
+    CloudWatch Logs throttles us.
+
+    Each slice is written as its own gzip member.  After each slice we record
+    how many slices we've written, and how long the file was, in a checkpoint
+    file next to the export.  If we're interrupted, exporting again to the same
+    path with the same parameters truncates the file back to the last
+    checkpoint and picks up from the next slice.  The checkpoint file is
+    removed once the export completes.
+
+    If ``end_time`` is ``None``, we export up to the time the export started,
+    and record that time in the checkpoint, so that a resumed export ends at
+    the same time as the one it resumes.
+
+    Args:
+        group: the log group to export
+        start_time: export events at or after this time, in milliseconds since the epoch
+        end_time: export events before this time, in milliseconds since the
+            epoch.  If ``None``, export events up until now.
+
+    Keyword Args:
+        stream_prefix: only export events from streams whose names start with this
+        stream_names: only export events from these streams
+        filter_pattern: only export events matching this filter pattern
+        slice_seconds: the length of each slice
+        max_workers: fetch at most this many slices at once
+    """
+
+    #: ``filter_log_events`` is rate limited per account and region, so all exporters share this
+    limiter: AdaptiveRateLimiter = AdaptiveRateLimiter(rate=10)
+
+    def __init__(
+        self,
+        group: "CloudWatchLogGroup",
+        start_time: int,
+        end_time: Optional[int],
+        stream_prefix: str = None,
+        stream_names: List[str] = None,
+        filter_pattern: str = None,
+        slice_seconds: int = 900,
+        max_workers: int = 8
+    ):
+        if end_time is not None and end_time <= start_time:
+            raise CloudWatchLogGroup.OperationFailed('The end of an export must be after its start.')
+        self.client = get_boto3_client('logs')
+        self.kwargs: Dict[str, Any] = {'logGroupName': group.name}
+        # filter_log_events won't take both logStreamNames and logStreamNamePrefix, and takes only so many
+        # logStreamNames at once, so we make one call chain per batch of names
+        self.stream_names: Optional[List[str]] = stream_names if stream_names else None
+        if not stream_names and stream_prefix:
+            self.kwargs['logStreamNamePrefix'] = stream_prefix
+        if filter_pattern:
+            self.kwargs['filterPattern'] = filter_pattern
+        self.start_time: int = start_time
+        self.end_time: Optional[int] = end_time
+        self.slice_seconds: int = slice_seconds
+        self.max_workers: int = max_workers
+
+    @property
+    def signature(self) -> Dict[str, Any]:
+        """
+        Everything that determines what we export, so that we only resume from
+        a checkpoint written by an identical export.  The end time is left out
+        because it may not have been given; :py:meth:`load_checkpoint` checks
+        it separately.
+        """
+        signature = dict(self.kwargs)
+        if self.stream_names:
+            signature['logStreamNames'] = self.stream_names
+        signature.update({'startTime': self.start_time, 'sliceSeconds': self.slice_seconds})
+        return signature
+
+    def slices(self) -> List[Tuple[int, int]]:
+        """
+        Returns:
+            A list of ``(start, end)`` tuples in milliseconds since the epoch,
+            covering ``[start_time, end_time)`` with no overlap.
+        """
+        end_time = cast(int, self.end_time)
+        width = self.slice_seconds * 1000
+        return [
+            (start, min(start + width, end_time))
+            for start in range(self.start_time, end_time, width)
+        ]
+
+    def fetch_slice(self, time_slice: Tuple[int, int]) -> List[Dict[str, Any]]:
+        """
+        Get all the events in the half-open time range ``time_slice``.
+
+        Returns:
+            The events, as returned by ``filter_log_events``, sorted by timestamp.
+        """
+        events: List[Dict[str, Any]] = []
+        for batch in stream_name_batches(self.stream_names):
+            kwargs = dict(self.kwargs)
+            if batch:
+                kwargs['logStreamNames'] = batch
+            # endTime is inclusive for filter_log_events
+            kwargs['startTime'], kwargs['endTime'] = time_slice[0], time_slice[1] - 1
+            while True:
+                response = self.limiter.call(self.client.filter_log_events, **kwargs)
+                events.extend(response['events'])
+                token = response.get('nextToken', None)
+                # filter_log_events can hand back the token we just used when it runs out of events
+                if not token or token == kwargs.get('nextToken', None):
+                    break
+                kwargs['nextToken'] = token
+        events.sort(key=lambda e: (e['timestamp'], e['eventId']))
+        return events
+
+    def load_checkpoint(self, checkpoint_path: str) -> Dict[str, Any]:
+        with open(checkpoint_path, encoding='utf-8') as fd:
+            checkpoint = json.load(fd)
+        if checkpoint['signature'] != self.signature or (
+            self.end_time is not None and checkpoint.get('endTime') != self.end_time
+        ):
+            raise CloudWatchLogGroup.OperationFailed(
+                f'{checkpoint_path} is for a different export; remove it or export to a different file.'
+            )
+        return checkpoint
+
+    def save_checkpoint(self, checkpoint_path: str, checkpoint: Dict[str, Any]) -> None:
+        tmp_path = f'{checkpoint_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as fd:
+            json.dump(checkpoint, fd)
+        os.replace(tmp_path, checkpoint_path)
+
+    def export(
+        self,
+        path: str,
+        resume: bool = True,
+        progress: Callable[[int, int, int], None] = None
+    ) -> int:
+        """
+        Write our events to ``path``.
+
+        Args:
+            path: the file to write
+
+        Keyword Args:
+            resume: if ``True`` and there is a checkpoint for this export, pick
+                up where it left off.  Otherwise, start from scratch.
+            progress: if given, call this after each slice as
+                ``progress(slices_done, total_slices, events_written)``
+
+        Returns:
+            The total number of events in the export.
+        """
+        checkpoint_path = f'{path}.checkpoint'
+        checkpoint: Optional[Dict[str, Any]] = None
+        if resume and os.path.exists(checkpoint_path):
+            checkpoint = self.load_checkpoint(checkpoint_path)
+        if self.end_time is None:
+            self.end_time = checkpoint['endTime'] if checkpoint else int(time.time() * 1000)
+            if self.end_time <= self.start_time:
+                raise CloudWatchLogGroup.OperationFailed('The end of an export must be after its start.')
+        if checkpoint is None:
+            checkpoint = {'signature': self.signature, 'endTime': self.end_time, 'slices': 0, 'bytes': 0, 'events': 0}
+        slices = self.slices()
+        with open(path, 'ab') as fd:
+            # Drop anything written after our last checkpoint
+            fd.truncate(checkpoint['bytes'])
+        todo = slices[checkpoint['slices']:]
+        for events in concurrent_imap(self.fetch_slice, todo, max_workers=self.max_workers):
+            if events:
+                with open(path, 'ab') as fd:
+                    with gzip.GzipFile(fileobj=fd, mode='wb') as gz:
+                        for event in events:
+                            gz.write(json.dumps(event, separators=(',', ':')).encode('utf-8') + b'\n')
+                    fd.flush()
+                    os.fsync(fd.fileno())
+                    checkpoint['bytes'] = fd.tell()
+            checkpoint['slices'] += 1
+            checkpoint['events'] += len(events)
+            self.save_checkpoint(checkpoint_path, checkpoint)
+            if progress:
+                progress(checkpoint['slices'], len(slices), checkpoint['events'])
+        if checkpoint['bytes'] == 0:
+            # Leave a valid, empty gzip file rather than a zero length one
+            with gzip.open(path, 'wb'):
+                pass
+        os.remove(checkpoint_path)
+        return checkpoint['events']
+
+
 # ----------------------------------------
 # Managers
 # ----------------------------------------
@@ -168,22 +482,33 @@ class CloudWatchLogGroupManager(Manager):
             )
         return CloudWatchLogGroup(response['logGroups'][0])
 
-    def list(self, prefix: str = None) -> Sequence["CloudWatchLogGroup"]:
+    def _iter_groups(self, prefix: str = None) -> Iterator["CloudWatchLogGroup"]:
         paginator = self.client.get_paginator('describe_log_groups')
         kwargs = {}
         if prefix:
             kwargs['logGroupNamePrefix'] = prefix
         response_iterator = paginator.paginate(**kwargs)
-        group_data = []
         for response in response_iterator:
-            group_data.extend(response['logGroups'])
-        return [CloudWatchLogGroup(data) for data in group_data]
+            for data in response['logGroups']:
+                yield CloudWatchLogGroup(data)
+
+    def iter(self, prefix: str = None, cache: bool = False) -> QuerySet:
+        return QuerySet(self, objects=lambda: self._iter_groups(prefix=prefix), cache=cache)
+
+    def list(self, prefix: str = None) -> QuerySet:
+        return self.iter(prefix=prefix, cache=True)
 
 
 class CloudWatchLogStreamManager(Manager):
 
     service = 'logs'
 
+    #: The newest stream we've seen for each log group and prefix.  See :py:meth:`newest`.
+    index: DiskCache = DiskCache('cloudwatch-log-streams', max_bytes=5 * 1024 * 1024)
+    #: :py:meth:`newest` reads at most this many pages of a group's streams,
+    #: newest first, before falling back to listing just the streams with our prefix
+    newest_max_pages: int = 3
+
     def __get_group_and_stream_from_pk(self, pk: str) -> List[str]:
         return pk.split(':', 1)
 
@@ -205,34 +530,318 @@ class CloudWatchLogStreamManager(Manager):
         data['logGroupName'] = group_name
         return CloudWatchLogStream(data)
 
-    def list(self, log_group_name: str, prefix: str = None, limit: int = None) -> Sequence["CloudWatchLogStream"]:
+    def _iter_streams(self, log_group_name: str) -> Iterator["CloudWatchLogStream"]:
+        paginator = self.client.get_paginator('describe_log_streams')
+        response_iterator = paginator.paginate(logGroupName=log_group_name, orderBy='LastEventTime', descending=True)
+        for response in response_iterator:
+            for data in response['logStreams']:
+                data['logGroupName'] = log_group_name
+                yield CloudWatchLogStream(data)
+
+    def _list_streams_with_prefix(self, log_group_name: str, prefix: str) -> List["CloudWatchLogStream"]:
+        paginator = self.client.get_paginator('describe_log_streams')
+        response_iterator = paginator.paginate(logGroupName=log_group_name, logStreamNamePrefix=prefix)
+        streams = []
+        for response in response_iterator:
+            for data in response['logStreams']:
+                data['logGroupName'] = log_group_name
+                streams.append(CloudWatchLogStream(data))
+        streams = sorted(streams, key=lambda x: x.data.get('lastEventTimestamp', -1))
+        streams.reverse()
+        return streams
+
+    def iter(
+        self,
+        log_group_name: str,
+        prefix: str = None,
+        limit: int = None,
+        cache: bool = False
+    ) -> QuerySet:
+        """
+        Return a :py:class:`QuerySet` of the streams that :py:meth:`list` would return.  Without ``prefix``, AWS
+        returns them newest first, so we only request as many pages as we need.  With ``prefix``, AWS returns them in
+        name order, so we have to read them all to sort them.
+        """
+        if prefix:
+            streams = QuerySet(
+                self,
+                objects=lambda: self._list_streams_with_prefix(log_group_name, prefix),
+                cache=cache
+            )
+        else:
+            streams = QuerySet(self, objects=lambda: self._iter_streams(log_group_name), cache=cache)
+        if limit:
+            streams = streams[:limit]
+        return streams
+
+    def list(self, log_group_name: str, prefix: str = None, limit: int = None) -> QuerySet:
         """
         .. note::
 
             Note that ``log_group_name`` is required here.  We could turn this into "list all streams", but we in ADS
             have a bajillion groups and streams and that might be untenable to actually work with.
         """
+        return self.iter(log_group_name, prefix=prefix, limit=limit, cache=True)
+
+    def _describe_stream(self, log_group_name: str, stream_name: str) -> Optional["CloudWatchLogStream"]:
+        response = self.client.describe_log_streams(logGroupName=log_group_name, logStreamNamePrefix=stream_name)
+        for data in response['logStreams']:
+            if data['logStreamName'] == stream_name:
+                data['logGroupName'] = log_group_name
+                return CloudWatchLogStream(data)
+        return None
+
+    def newest(
+        self,
+        log_group_name: str,
+        prefix: str = None,
+        stream_names: List[str] = None
+    ) -> Optional["CloudWatchLogStream"]:
+        """
+        Return the stream in ``log_group_name`` with the most recent event,
+        without listing every stream in the group.
+
+        ``describe_log_streams`` can't sort by last event time when filtering
+        by prefix, so:
+
+        * If we're given ``stream_names`` (e.g. the streams for our currently
+          running tasks), we describe just those streams, concurrently, and
+          return the newest of them.
+        * Otherwise, we page through the group newest first, and stop at the
+          first stream whose name starts with ``prefix``.  We remember that
+          stream in :py:attr:`index`, and on later calls we also stop as soon
+          as we reach streams older than the one we remembered.  Thus each
+          lookup only looks at the streams that have had events since the last
+          one.
+        * If we haven't found the stream after :py:attr:`newest_max_pages`
+          pages (say, because the prefix's newest stream is old and our index
+          is cold), we list just the streams with ``prefix`` instead.
+
+        .. note::
+
+            AWS updates ``lastEventTimestamp`` lazily, so a stream which is
+            receiving events right now may look up to an hour older than it is.
+
+        Args:
+            log_group_name: the name of the log group
+
+        Keyword Args:
+            prefix: only consider streams whose names start with this
+            stream_names: only consider these streams
+
+        Returns:
+            The newest stream, or ``None`` if there is none.
+        """
+        if stream_names:
+            streams = [
+                stream for stream in concurrent_map(
+                    lambda name: self._describe_stream(log_group_name, name), stream_names
+                ) if stream
+            ]
+            if streams:
+                return max(streams, key=lambda x: x.data.get('lastEventTimestamp', x.data.get('creationTime', -1)))
+        # The same group name may well exist in other accounts and regions
+        region = self.client.meta.region_name
+        key = f'{get_aws_account_id()}:{region}:{log_group_name}:{prefix if prefix else ""}'
+        cached = self.index.get(key)
         paginator = self.client.get_paginator('describe_log_streams')
-        kwargs: Dict[str, Any] = {'logGroupName': log_group_name}
-        if prefix:
-            kwargs['logStreamNamePrefix'] = prefix
-        else:
-            kwargs['orderBy'] = 'LastEventTime'
-            kwargs['descending'] = True
-        response_iterator = paginator.paginate(**kwargs)
-        stream_data = []
-        for response in response_iterator:
-            for stream in response['logStreams']:
-                stream['logGroupName'] = log_group_name
-            stream_data.extend(response['logStreams'])
-            if limit and len(stream_data) > limit:
-                stream_data = stream_data[:limit]
+        response_iterator = paginator.paginate(
+            logGroupName=log_group_name,
+            orderBy='LastEventTime',
+            descending=True
+        )
+        newest: Optional[Dict[str, Any]] = None
+        for page, response in enumerate(response_iterator, 1):
+            for data in response['logStreams']:
+                if not prefix or data['logStreamName'].startswith(prefix):
+                    newest = data
+                    break
+                if cached and data.get('lastEventTimestamp', -1) <= cached.get('lastEventTimestamp', -1):
+                    # Nothing we haven't seen is newer than what we found last time
+                    newest = cached
+                    break
+            if newest:
                 break
-        streams = [CloudWatchLogStream(data) for data in stream_data]
-        if prefix:
-            streams = sorted(streams, key=lambda x: x.data.get('lastEventTimestamp', -1))
-            streams.reverse()
-        return streams
+            if prefix and page >= self.newest_max_pages:
+                # Don't read the whole group looking for an old stream
+                streams = self._list_streams_with_prefix(log_group_name, prefix)
+                if streams:
+                    newest = streams[0].data
+                break
+        if not newest:
+            return None
+        if newest is not cached:
+            self.index.set(key, newest)
+        newest = dict(newest)
+        newest['logGroupName'] = log_group_name
+        return CloudWatchLogStream(newest)
+
+
+class CloudWatchLogsQueryManager(Manager):
+    """
+    Run CloudWatch Logs Insights queries.  Insights does the searching and
+    aggregating server side, so we only download the (usually small) result
+    set rather than every matching event.
+    """
+
+    service = 'logs'
+
+    #: Insights query statuses after which a query will make no more progress
+    FINISHED: Sequence[str] = ('Complete', 'Failed', 'Cancelled', 'Timeout', 'Unknown')
+
+    #: start_query and get_query_results are limited per account and region, so all threads share these
+    limiters: Dict[str, AdaptiveRateLimiter] = {
+        'start_query': AdaptiveRateLimiter(rate=5),
+        'get_query_results': AdaptiveRateLimiter(rate=5),
+    }
+
+    #: Run queries for at most this many log groups at once
+    max_workers: int = 4
+
+    #: How long to wait between our first polls for results.  We back off from here to ``max_poll_interval``.
+    poll_interval: float = 0.5
+    max_poll_interval: float = 5.0
+
+    def get(self, pk: str, **_) -> "CloudWatchLogsQuery":
+        """
+        Get the current status and results of the query whose queryId is ``pk``.
+        """
+        query = CloudWatchLogsQuery({'queryId': pk})
+        self.refresh(query)
+        return query
+
+    def list(self, log_group_name: str = None, status: str = None) -> Sequence["CloudWatchLogsQuery"]:
+        """
+        List the Insights queries run in the last 30 days, newest first.
+
+        Keyword Args:
+            log_group_name: only list queries that ran against this log group
+            status: only list queries with this status, e.g. ``Running``
+        """
+        kwargs: Dict[str, Any] = {}
+        if log_group_name:
+            kwargs['logGroupName'] = log_group_name
+        if status:
+            kwargs['status'] = status
+        queries: List[Dict[str, Any]] = []
+        while True:
+            response = self.client.describe_queries(**kwargs)
+            queries.extend(response['queries'])
+            if not response.get('nextToken', None):
+                break
+            kwargs['nextToken'] = response['nextToken']
+        return [CloudWatchLogsQuery(data) for data in queries]
+
+    def start(
+        self,
+        query_string: str,
+        log_group_name: str,
+        start_time: int,
+        end_time: int,
+        limit: int = None
+    ) -> "CloudWatchLogsQuery":
+        """
+        Start an Insights query against a single log group, but don't wait for it.
+
+        Args:
+            query_string: the query, in CloudWatch Logs Insights query syntax
+            log_group_name: the log group to query
+            start_time: query events at or after this time, in milliseconds since the epoch
+            end_time: query events before this time, in milliseconds since the epoch
+
+        Keyword Args:
+            limit: return at most this many results
+        """
+        kwargs: Dict[str, Any] = {
+            'logGroupName': log_group_name,
+            'queryString': query_string,
+            # start_query wants seconds, not milliseconds
+            'startTime': start_time // 1000,
+            'endTime': end_time // 1000,
+        }
+        if limit:
+            kwargs['limit'] = limit
+        response = self.limiters['start_query'].call(self.client.start_query, **kwargs)
+        return CloudWatchLogsQuery({
+            'queryId': response['queryId'],
+            'logGroupName': log_group_name,
+            'queryString': query_string,
+            'startTime': start_time,
+            'endTime': end_time,
+            'status': 'Scheduled',
+        })
+
+    def refresh(self, query: "CloudWatchLogsQuery") -> None:
+        """
+        Update ``query`` with its current status, results and statistics.
+        """
+        response = self.limiters['get_query_results'].call(self.client.get_query_results, queryId=query.pk)
+        query.data['status'] = response['status']
+        query.data['results'] = response.get('results', [])
+        query.data['statistics'] = response.get('statistics', {})
+
+    def wait(self, query: "CloudWatchLogsQuery", timeout: float = 300) -> "CloudWatchLogsQuery":
+        """
+        Poll until ``query`` finishes.  We poll quickly at first, since most
+        queries finish in a few seconds, and back off for slow ones.
+
+        Raises:
+            CloudWatchLogsQuery.OperationFailed: the query failed, or didn't finish within ``timeout`` seconds
+
+        Returns:
+            ``query``, with its results.
+        """
+        deadline = time.monotonic() + timeout
+        interval = self.poll_interval
+        while True:
+            self.refresh(query)
+            if query.status in self.FINISHED:
+                break
+            if time.monotonic() >= deadline:
+                self.client.stop_query(queryId=query.pk)
+                raise CloudWatchLogsQuery.OperationFailed(
+                    f'Insights query on {query.log_group_name} did not finish within {timeout} seconds.'
+                )
+            time.sleep(interval)
+            interval = min(self.max_poll_interval, interval * 2)
+        if query.status != 'Complete':
+            raise CloudWatchLogsQuery.OperationFailed(
+                f'Insights query on {query.log_group_name} ended with status {query.status}.'
+            )
+        return query
+
+    def run(
+        self,
+        query_string: str,
+        log_group_names: List[str],
+        start_time: int,
+        end_time: int,
+        limit: int = None,
+        timeout: float = 300
+    ) -> Sequence["CloudWatchLogsQuery"]:
+        """
+        Run ``query_string`` against each of ``log_group_names`` and wait for
+        all the results.  Each group gets its own query, and we run up to
+        :py:attr:`max_workers` of them at once.
+
+        Args:
+            query_string: the query, in CloudWatch Logs Insights query syntax
+            log_group_names: the log groups to query
+            start_time: query events at or after this time, in milliseconds since the epoch
+            end_time: query events before this time, in milliseconds since the epoch
+
+        Keyword Args:
+            limit: return at most this many results per log group
+            timeout: give up on any query that takes longer than this many seconds
+
+        Returns:
+            The finished queries, in the same order as ``log_group_names``.
+        """
+        def run_one(log_group_name: str) -> CloudWatchLogsQuery:
+            query = self.start(query_string, log_group_name, start_time, end_time, limit=limit)
+            return self.wait(query, timeout=timeout)
+
+        return concurrent_map(run_one, log_group_names, max_workers=self.max_workers)
 
 
 # ----------------------------------------
@@ -255,40 +864,48 @@ class CloudWatchLogGroup(Model):
     def arn(self) -> str:
         return self.data['arn']
 
-    def newest_stream(self, prefix: str = None) -> Optional["CloudWatchLogStream"]:
+    def newest_stream(self, prefix: str = None, stream_names: List[str] = None) -> Optional["CloudWatchLogStream"]:
         """
-        Look through all our streams and return the one that has the most recent message.  If there is no
-        such stream, return None.
+        Return the stream with the most recent message.  If there is no such
+        stream, return None.  See :py:meth:`CloudWatchLogStreamManager.newest`.
 
         :param prefix str: (optional) if provided, filter streams to only those name matches this prefix
+        :param stream_names list(str): (optional) if provided, only look at these streams
 
         :rtype: Union[CloudWatchLogStream, None]
         """
-        try:
-            return CloudWatchLogStream.objects.list(self.name, prefix=prefix)[0]
-        except IndexError:
-            return None
+        return cast(CloudWatchLogStreamManager, CloudWatchLogStream.objects).newest(
+            self.name,
+            prefix=prefix,
+            stream_names=stream_names
+        )
 
     def get_event_tailer(
         self,
         stream_prefix: str = None,
         sleep: int = 10,
-        filter_pattern: str = None
+        filter_pattern: str = None,
+        newest_stream_candidates: List[str] = None
     ) -> CloudWatchLogGroupTailer:
         """
         Return a properly configured iterator that will eternally poll our log group (note -- not stream) for new
         messages in any of its streams, possibly filtering by log stream prefix and filter pattern.
 
+        We start tailing from the last message in our newest stream.  If you know which streams are likely to be
+        the newest (e.g. the streams for currently running tasks), pass them as ``newest_stream_candidates`` so
+        we can find it without searching the group.
+
         For ``filter_pattern`` syntax , see
         (https://docs.aws.amazon.com/AmazonCloudWatch/latest/logs/FilterAndPatternSyntax.html)_
 
         :param stream_prefix str: (optional) if provided, only poll messages from streams matching this prefix
         :param sleep int: (optional) if provided, sleep this long between polls
         :param filter_pattern: (optional) if provided, only return messages matching this filter
+        :param newest_stream_candidates list(str): (optional) if provided, look for our newest stream among these
 
         :rtype: CloudWatchLogGroupTailer
         """
-        newest_stream = self.newest_stream(prefix=stream_prefix)
+        newest_stream = self.newest_stream(prefix=stream_prefix, stream_names=newest_stream_candidates)
         start_time = None
         if newest_stream:
             try:
@@ -303,6 +920,40 @@ class CloudWatchLogGroup(Model):
             start_time=start_time
         )
 
+    def get_exporter(
+        self,
+        start_time: int,
+        end_time: Optional[int],
+        stream_prefix: str = None,
+        filter_pattern: str = None,
+        slice_seconds: int = 900,
+        max_workers: int = 8
+    ) -> CloudWatchLogGroupExporter:
+        """
+        Return an exporter that will write all our events between ``start_time``
+        and ``end_time`` to a gzip-compressed JSON-lines file.  See
+        :py:class:`CloudWatchLogGroupExporter`.
+
+        :param start_time int: export events at or after this time, in milliseconds since the epoch
+        :param end_time Union[int, None]: export events before this time, in milliseconds since the epoch, or
+                                          ``None`` for now
+        :param stream_prefix str: (optional) if provided, only export messages from streams matching this prefix
+        :param filter_pattern: (optional) if provided, only export messages matching this filter
+        :param slice_seconds int: (optional) fetch the time range in slices this long
+        :param max_workers int: (optional) fetch at most this many slices at once
+
+        :rtype: CloudWatchLogGroupExporter
+        """
+        return CloudWatchLogGroupExporter(
+            self,
+            start_time,
+            end_time,
+            stream_prefix=stream_prefix,
+            filter_pattern=filter_pattern,
+            slice_seconds=slice_seconds,
+            max_workers=max_workers
+        )
+
     def log_streams(self, stream_prefix: str = None, maxitems: int = None) -> Sequence["CloudWatchLogStream"]:
         """
         Retrun a list of all our log streams.
@@ -365,3 +1016,46 @@ class CloudWatchLogStream(Model):
         :rtype: CloudWatchLogStreamTailer
         """
         return CloudWatchLogStreamIterator(self, sleep)
+
+
+class CloudWatchLogsQuery(Model):
+    """
+    A CloudWatch Logs Insights query against a single log group, and its results.
+    """
+
+    objects = CloudWatchLogsQueryManager()
+
+    @property
+    def pk(self) -> str:
+        return self.data['queryId']
+
+    @property
+    def name(self) -> str:
+        return self.data['queryId']
+
+    @property
+    def arn(self) -> Optional[str]:
+        return None
+
+    @property
+    def log_group_name(self) -> str:
+        return self.data.get('logGroupName', '')
+
+    @property
+    def status(self) -> str:
+        return self.data.get('status', 'Unknown')
+
+    @property
+    def results(self) -> List[Dict[str, str]]:
+        """
+        Our result rows, as dicts of field name to value.  We leave out the
+        ``@ptr`` field, which is only useful for ``get_log_record``.
+        """
+        return [
+            {field['field']: field['value'] for field in row if field['field'] != '@ptr'}
+            for row in self.data.get('results', [])
+        ]
+
+    @property
+    def statistics(self) -> Dict[str, float]:
+        return self.data.get('statistics', {})
@@ -1,3 +1,4 @@
+import asyncio
 from copy import deepcopy
 import datetime
 import fnmatch
@@ -7,7 +8,9 @@ import textwrap
 from tzlocal import get_localzone
 from typing import (
     Any,
+    Callable,
     Dict,
+    Iterator,
     List,
     Literal,
     NoReturn,
@@ -20,12 +23,15 @@ from typing import (
 )
 import warnings
 
-from deployfish.core.aws import get_boto3_session
-from deployfish.core.ssh import DockerMixin, SSHMixin
-from deployfish.core.utils import is_fnmatch_filter
+from deployfish.core.aws import AdaptiveRateLimiter, get_aws_account_id, get_boto3_client
+from deployfish.core.cache import DiskCache
+from deployfish.core.ssh import DockerMixin, SSHCommandResult, SSHFanout, SSHMixin
+from deployfish.core.utils import concurrent_imap, concurrent_map, is_fnmatch_filter, run_async
+from deployfish.core.waiters.fleet import ServiceFleetWaiter
+from deployfish.core.waiters.polling import PollingStrategy
 from deployfish.exceptions import SchemaException, ObjectImproperlyConfigured
 
-from .abstract import Manager, Model, LazyAttributeMixin
+from .abstract import Manager, Model, LazyAttributeMixin, QuerySet
 from .ec2 import Instance, AutoscalingGroup
 from .efs import EFSFileSystem
 from .elb import ClassicLoadBalancer
@@ -423,17 +429,59 @@ class TaskTagExporter:
 # ----------------------------------------
 
 class TaskDefinitionManager(Manager):
+    """
+    Task definition revisions are immutable once registered, so when asked for
+    a specific revision (``family:revision`` or a full revision ARN) we keep a
+    copy of AWS's response in an on-disk :py:class:`deployfish.core.cache.DiskCache`
+    and reuse it on later invocations.  Lookups by bare family name always go
+    to AWS, since they resolve to whatever the latest revision is.
+
+    .. note::
+
+        Tags on a task definition revision can technically be changed after
+        registration, but deployfish only writes them when registering.  If
+        you change them by hand, clear the cache with
+        ``TaskDefinition.objects.cache.clear()`` or set
+        ``DEPLOYFISH_DISABLE_CACHE=true``.
+    """
 
     service: str = 'ecs'
+    cache: DiskCache = DiskCache('task-definitions', max_bytes=100 * 1024 * 1024)
+
+    REVISION_ARN_RE = re.compile(
+        r'^arn:[^:]+:ecs:(?P<region>[^:]+):(?P<account>[0-9]+):task-definition/(?P<family_revision>.+:[0-9]+)$'
+    )
+    REVISION_RE = re.compile(r'^[^:/]+:[0-9]+$')
+
+    def cache_key(self, pk: str) -> Optional[str]:
+        """
+        If ``pk`` names a specific task definition revision, return the key
+        under which we cache it: ``{account}:{region}:{family}:{revision}``.
+        Otherwise return ``None``, meaning "don't cache this".
+        """
+        m = self.REVISION_ARN_RE.search(pk)
+        if m:
+            return f"{m.group('account')}:{m.group('region')}:{m.group('family_revision')}"
+        if self.REVISION_RE.search(pk):
+            region = self.client.meta.region_name
+            if region:
+                return f"{get_aws_account_id()}:{region}:{pk}"
+        return None
 
     def get(self, pk: str, **_) -> "TaskDefinition":
-        try:
-            response = self.client.describe_task_definition(
-                taskDefinition=pk,
-                include=['TAGS']
-            )
-        except self.client.exceptions.ClientException:
-            raise TaskDefinition.DoesNotExist(f'No task definition matching "{pk}" exists in AWS')
+        cache_key = self.cache_key(pk)
+        response = self.cache.get(cache_key) if cache_key else None
+        if response is None:
+            try:
+                response = self.client.describe_task_definition(
+                    taskDefinition=pk,
+                    include=['TAGS']
+                )
+            except self.client.exceptions.ClientException:
+                raise TaskDefinition.DoesNotExist(f'No task definition matching "{pk}" exists in AWS')
+            response.pop('ResponseMetadata', None)
+            if cache_key:
+                self.cache.set(cache_key, response)
         data = response['taskDefinition']
         # For some reason, tags are not included as part of the task definition,
         # but are alongside it
@@ -448,7 +496,9 @@ class TaskDefinitionManager(Manager):
         task_definition_arns = []
         for response in response_iterator:
             task_definition_arns.extend(response['taskDefinitionArns'])
-        return [self.get(arn) for arn in task_definition_arns]
+        # These are all revision ARNs, so after the first time we list this
+        # family, most of these will come out of our cache
+        return concurrent_map(self.get, task_definition_arns)
 
     def save(self, obj: Model, **_) -> str:
         response = self.client.register_task_definition(**obj.render())
@@ -463,32 +513,95 @@ class AbstractTaskManager(Manager):
     service = 'ecs'
     task_type: str
     model: Type["Task"]
+    #: How many task definitions we describe in parallel in :py:meth:`hydrate`
+    max_workers: int = 8
 
-    def get(self, pk: str, **_) -> "Task":
-        task_definition = None
-        if TaskDefinition.objects.exists(pk):
-            task_definition = TaskDefinition.objects.get(pk)
-        else:
+    def _get_task_definition(self, pk: str) -> "TaskDefinition":
+        try:
+            return TaskDefinition.objects.get(pk)
+        except TaskDefinition.DoesNotExist:
             raise self.model.DoesNotExist(
                 f'No TaskDefintion for {self.model.__name__}(pk="{pk}") exists in AWS'
             )
-        schedule = None
-        if EventScheduleRule.objects.exists(task_definition.family):
-            schedule = EventScheduleRule.objects.get(task_definition.family)
-            if not schedule.target:
-                # This should never happen
-                schedule = None
-            elif schedule.target.data['EcsParameters']['TaskDefinitionArn'] != task_definition.arn:
-                schedule = None
+
+    def _get_schedule(
+        self,
+        task_definition: "TaskDefinition",
+        rules: Dict[str, EventScheduleRule] = None
+    ) -> Optional[EventScheduleRule]:
+        """
+        Return the :py:class:`EventScheduleRule` that runs ``task_definition``,
+        if any.
+
+        Args:
+            task_definition: the task definition to look for
+
+        Keyword Args:
+            rules: if provided, a dict of rule name to already loaded
+                ``EventScheduleRule`` to look in instead of asking AWS.
+        """
+        if rules is None:
+            try:
+                schedule = EventScheduleRule.objects.get(task_definition.family)
+            except EventScheduleRule.DoesNotExist:
+                return None
+        else:
+            # We name our EventScheduleRules after the task family
+            schedule = rules.get(f'deployfish-{task_definition.family}')
+        if not schedule or not schedule.target:
+            # Not having a target should never happen
+            return None
+        if schedule.target.data['EcsParameters']['TaskDefinitionArn'] != task_definition.arn:
+            return None
+        return schedule
+
+    def _build(self, task_definition: "TaskDefinition", schedule: Optional[EventScheduleRule]) -> "Task":
         # Extract the info we need to run the task from tags on the task definition
         data = TaskTagImporter().convert(task_definition.data.get('tags', []))
         return self.model(data, task_definition=task_definition, schedule=schedule)
 
+    def get(self, pk: str, **_) -> "Task":
+        task_definition = self._get_task_definition(pk)
+        return self._build(task_definition, self._get_schedule(task_definition))
+
     def get_many(self, pks: List[str], **_) -> Sequence["Task"]:
-        tasks = []
-        for pk in pks:
-            tasks.append(self.get(pk))
-        return tasks
+        return self.hydrate(pks)
+
+    def hydrate(self, pks: List[str], rules: Dict[str, EventScheduleRule] = None) -> Sequence["Task"]:
+        """
+        Build Task objects for each of ``pks``, describing up to
+        :py:attr:`max_workers` task definitions at a time.  Duplicate ``pks``
+        are only described once.
+
+        Args:
+            pks: a list of task definition ``family`` or ``family:revision`` strings
+
+        Keyword Args:
+            rules: if provided, a dict of rule name to already loaded
+                ``EventScheduleRule``, as returned by :py:meth:`get_schedule_rules`.
+                Use this when hydrating many tasks so that we list our schedules
+                once instead of looking them up once per task.
+
+        Raises:
+            self.model.DoesNotExist: one of ``pks`` has no task definition in AWS
+
+        Returns:
+            The list of Tasks, in the same order as ``pks``.
+        """
+        pks = list(dict.fromkeys(pks))
+
+        def hydrate_one(pk: str) -> "Task":
+            task_definition = self._get_task_definition(pk)
+            return self._build(task_definition, self._get_schedule(task_definition, rules=rules))
+
+        return concurrent_map(hydrate_one, pks, max_workers=self.max_workers)
+
+    def get_schedule_rules(self) -> Dict[str, EventScheduleRule]:
+        """
+        Load all our deployfish schedules and their targets, keyed by rule name,
+        for use with :py:meth:`hydrate`.
+        """
+        return {rule.name: rule for rule in EventScheduleRule.objects.list()}
 
     def list(self, scheduled_only: bool = False) -> Sequence["Task"]:
         if scheduled_only:
@@ -511,17 +624,18 @@ class AbstractTaskManager(Manager):
             same as that saved as tags on the task definition.   Hopefully those
             two things can only differ if we screwed up somewhere.
         """
-        rules = EventScheduleRule.objects.list()
+        rules = [rule for rule in EventScheduleRule.objects.list() if rule.target]
+        task_definitions = concurrent_map(
+            lambda rule: TaskDefinition.objects.get(rule.target.data['EcsParameters']['TaskDefinitionArn']),
+            rules,
+            max_workers=self.max_workers
+        )
         tasks = []
-        for rule in rules:
-            if rule.target:
-                task_definition = TaskDefinition.objects.get(
-                    rule.target.data['EcsParameters']['TaskDefinitionArn']
-                )
-                data = TaskTagImporter().convert(task_definition.data.get('tags', []))
-                if data['task_type'] != self.task_type:
-                    continue
-                tasks.append(self.model(data, task_definition=task_definition, schedule=rule))
+        for rule, task_definition in zip(rules, task_definitions):
+            data = TaskTagImporter().convert(task_definition.data.get('tags', []))
+            if data['task_type'] != self.task_type:
+                continue
+            tasks.append(self.model(data, task_definition=task_definition, schedule=rule))
         return tasks
 
     def save(self, obj: Model, **_) -> str:
@@ -763,7 +877,7 @@ class StandaloneTaskManager(AbstractTaskManager):
         """
         # For this we'll actually use boto3.client('resourcegroupstaggingapi').get_resources() to filter by tag.  All of
         # our standalone tasks should be tagged, while the service tasks won't be tagged.
-        client = get_boto3_session().client('resourcegroupstaggingapi')
+        client = get_boto3_client('resourcegroupstaggingapi')
         paginator = client.get_paginator('get_resources')
         tag_filters = []
         tag_filters.append({'Key': 'deployfish:type', 'Values': [task_type]})
@@ -791,10 +905,9 @@ class StandaloneTaskManager(AbstractTaskManager):
         else:
             pks = resource_arns
         tasks = []
-        for pk in pks:
+        for task in self.hydrate(pks, rules=self.get_schedule_rules()):
             # Check if the latest task definition still has the matching task_type tag.
             # If the pk was added based on an old revision and the latest one does not have it, skip it.
-            task = self.get(pk)
             if task.data.get('task_type') == task_type:
                 tasks.append(task)
         return self.filter_list_results(
@@ -834,10 +947,10 @@ class ServiceHelperTaskManager(AbstractTaskManager):
             for tag, arn in list(service.task_definition.tags.items()):
                 if tag.startswith('deployfish:command:'):
                     task_definition_arns.append(arn)
-        return [
-            cast("ServiceHelperTask", self.get(arn))
-            for arn in task_definition_arns
-        ]
+        return cast(
+            Sequence["ServiceHelperTask"],
+            self.hydrate(task_definition_arns, rules=self.get_schedule_rules())
+        )
 
 
 class InvokedTaskManager(Manager):
@@ -849,6 +962,11 @@ class InvokedTaskManager(Manager):
 
     service = 'ecs'
 
+    pk_fields: Dict[str, Callable[[str], Any]] = {
+        'pk': lambda pk: pk,
+        'arn': lambda pk: pk.split(':', 1)[1],
+    }
+
     def __get_cluster_and_task_arn_from_pk(self, pk: str) -> List[str]:
         return pk.split(':', 1)
 
@@ -867,17 +985,112 @@ class InvokedTaskManager(Manager):
             raise InvokedTask.DoesNotExist(f'No task exists with arn "{task_arn}" in cluster "{cluster}"')
         return InvokedTask(response['tasks'][0])
 
-    def list(
+    def get_many(self, pks: List[str], prefetch: bool = True, **_) -> Sequence["InvokedTask"]:
+        """
+        Retrieve many tasks at once, using as few ``describe_tasks`` calls as
+        possible.  Tasks that no longer exist in AWS are silently omitted.
+
+        Args:
+            pks: a list of strings like '{cluster}:{task_arn}'
+
+        Keyword Args:
+            prefetch: if ``True``, also load the task definitions and container
+                instances for all the tasks in bulk.  See :py:meth:`prefetch_related`.
+        """
+        # group pks by cluster
+        clusters: Dict[str, List[str]] = {}
+        for pk in pks:
+            cluster, task_arn = self.__get_cluster_and_task_arn_from_pk(pk)
+            clusters.setdefault(cluster, []).append(task_arn)
+        tasks = []
+        for cluster, task_arns in list(clusters.items()):
+            # describe_tasks only accepts 100 or fewer arns in the tasks kwarg, so we have to
+            # split them into sub lists of 100 of fewer arns and iterate
+            chunks = [task_arns[i * 100:(i + 1) * 100] for i in range((len(task_arns) + 99) // 100)]
+            for chunk in chunks:
+                try:
+                    response = self.client.describe_tasks(cluster=cluster, tasks=chunk)
+                except self.client.exceptions.ClusterNotFoundException:
+                    raise Cluster.DoesNotExist(f'No cluster named "{cluster}" exists in AWS')
+                tasks.extend([InvokedTask(data) for data in response['tasks']])
+        if prefetch:
+            self.prefetch_related(tasks)
+        return tasks
+
+    def prefetch_related(self, tasks: Sequence["InvokedTask"]) -> None:
+        """
+        Load the :py:class:`TaskDefinition` and :py:class:`ContainerInstance`
+        objects for all of ``tasks`` in bulk and stash them in each task's
+        cache, so that ``task.task_definition`` and ``task.container_instance``
+        don't each cost their own API call.
+
+        Each distinct task definition is described only once no matter how
+        many tasks use it, and container instances are described in batches.
+
+        Args:
+            tasks: the tasks for which to load related objects
+        """
+        task_definitions: Dict[str, TaskDefinition] = {}
+        for arn in {task.data['taskDefinitionArn'] for task in tasks}:
+            task_definitions[arn] = TaskDefinition.objects.get(arn)
+        instance_pks = {
+            f"{task.cluster_name}:{task.data['containerInstanceArn']}"
+            for task in tasks
+            if 'containerInstanceArn' in task.data
+        }
+        container_instances = {
+            instance.pk: instance
+            for instance in ContainerInstance.objects.get_many(list(instance_pks))
+        }
+        for task in tasks:
+            task.cache['task_definition'] = task_definitions[task.data['taskDefinitionArn']]
+            if 'containerInstanceArn' in task.data:
+                pk = f"{task.cluster_name}:{task.data['containerInstanceArn']}"
+                if pk in container_instances:
+                    task.cache['container_machine'] = container_instances[pk]
+
+    def _iter_pks(self, cluster: str, service: str = None, **kwargs) -> Iterator[str]:
+        client = self.client
+        paginator = client.get_paginator('list_tasks')
+        response_iterator = iter(paginator.paginate(cluster=cluster, **kwargs))
+        while True:
+            # Only guard the API calls: we don't want to be inside this try when we yield
+            try:
+                response = next(response_iterator)
+            except StopIteration:
+                return
+            except client.exceptions.ClusterNotFoundException:
+                raise Cluster.DoesNotExist('No cluster named "{}" exists in AWS'.format(cluster))
+            except client.exceptions.ServiceNotFoundException:
+                raise Service.DoesNotExist(
+                    'No service named "{}" exists in cluster "{}" in AWS'.format(service, cluster)
+                )
+            for arn in response['taskArns']:
+                yield f'{cluster}:{arn}'
+
+    def iter(
         self,
         cluster: str,
         service: str = None,
         family: str = None,
         container_instance: str = None,
         launch_type: str = None,
-        status: str = 'RUNNING'
-    ) -> Sequence["InvokedTask"]:
+        status: str = 'RUNNING',
+        prefetch: bool = True,
+        cache: bool = False
+    ) -> QuerySet:
+        """
+        Return a :py:class:`QuerySet` of the tasks in ``cluster``, possibly
+        filtering by various dimensions.  Pages of ``list_tasks`` results are
+        only requested as the query set needs them.
+
+        Keyword Args:
+            prefetch: if ``True``, also load the task definitions and container
+                instances for the tasks in bulk: a chunk at a time as we
+                iterate, or all at once if ``cache`` is ``True``.
+            cache: passed to :py:class:`QuerySet`
+        """
         kwargs: Dict[str, str] = {}
-        kwargs['cluster'] = cluster
         if status != 'any':
             kwargs['desiredStatus'] = status
         if service:
@@ -888,13 +1101,43 @@ class InvokedTaskManager(Manager):
             kwargs['family'] = family
         if container_instance:
             kwargs['containerInstance'] = container_instance
-        try:
-            response = self.client.list_tasks(**kwargs)
-        except self.client.exceptions.ClusterNotFoundException:
-            raise Cluster.DoesNotExist('No cluster named "{}" exists in AWS'.format(cluster))
-        except self.client.exceptions.ServiceNotFoundException:
-            raise Service.DoesNotExist('No service named "{}" exists in cluster "{}" in AWS'.format(service, cluster))
-        return [self.get(f'{cluster}:{arn}') for arn in response['taskArns']]
+        return QuerySet(
+            self,
+            pks=lambda: self._iter_pks(cluster, service=service, **kwargs),
+            get_many_kwargs={'prefetch': False},
+            prefetch=self.prefetch_related if prefetch else None,
+            cache=cache
+        )
+
+    def list(
+        self,
+        cluster: str,
+        service: str = None,
+        family: str = None,
+        container_instance: str = None,
+        launch_type: str = None,
+        status: str = 'RUNNING',
+        prefetch: bool = True
+    ) -> QuerySet:
+        """
+        List the tasks in ``cluster``, possibly filtering by various
+        dimensions.
+
+        Keyword Args:
+            prefetch: if ``True``, also load the task definitions and container
+                instances for the tasks in bulk.  Set this to ``False`` if you
+                don't need those related objects.
+        """
+        return self.iter(
+            cluster,
+            service=service,
+            family=family,
+            container_instance=container_instance,
+            launch_type=launch_type,
+            status=status,
+            prefetch=prefetch,
+            cache=True
+        )
 
     def save(self, obj: Model, **_) -> NoReturn:
         raise InvokedTask.ReadOnly('InvokedTasks are not modifiable')
@@ -902,7 +1145,7 @@ class InvokedTaskManager(Manager):
     def delete(self, obj: Model, **_) -> None:
         obj = cast("InvokedTask", obj)
         self.client.stop_task(
-            cluster=obj.cluster.name,
+            cluster=obj.cluster_name,
             task=obj.arn
         )
 
@@ -942,6 +1185,61 @@ class ContainerInstanceManager(Manager):
             )
         return ContainerInstance(response['containerInstances'][0], cluster)
 
+    def get_many(self, pks: List[str], prefetch: bool = True, **_) -> Sequence["ContainerInstance"]:
+        """
+        Retrieve many container instances at once, using as few
+        ``describe_container_instances`` calls as possible.  Container
+        instances that no longer exist in AWS are silently omitted.
+
+        :param pks list(str): a list of strings like "{cluster}:{container_instance_id}"
+        :param prefetch bool: if ``True``, also load the EC2 instances for all
+                              the container instances with a single
+                              ``describe_instances`` call.  See :py:meth:`prefetch_related`.
+        """
+        # group pks by cluster
+        clusters: Dict[str, List[str]] = {}
+        for pk in pks:
+            cluster, container_instance_id = self.__get_cluster_and_id_from_pk(pk)
+            clusters.setdefault(cluster, []).append(container_instance_id)
+        instances = []
+        for cluster, ids in list(clusters.items()):
+            # describe_container_instances only accepts 100 or fewer ids, so we
+            # have to split them into sub lists of 100 of fewer ids and iterate
+            chunks = [ids[i * 100:(i + 1) * 100] for i in range((len(ids) + 99) // 100)]
+            for chunk in chunks:
+                try:
+                    response = self.client.describe_container_instances(
+                        cluster=cluster,
+                        containerInstances=chunk
+                    )
+                except self.client.exceptions.ClusterNotFoundException:
+                    raise Cluster.DoesNotExist(
+                        'No cluster named "{}" exists in AWS'.format(cluster)
+                    )
+                instances.extend([ContainerInstance(data, cluster) for data in response['containerInstances']])
+        if prefetch:
+            self.prefetch_related(instances)
+        return instances
+
+    def prefetch_related(self, instances: Sequence["ContainerInstance"]) -> None:
+        """
+        Load the EC2 :py:class:`deployfish.core.models.ec2.Instance` objects
+        for all of ``instances`` and stash them in each container instance's
+        cache, so that ``instance.ec2_instance`` doesn't cost its own API
+        call.
+
+        :param instances list(ContainerInstance): the container instances for
+                                                  which to load EC2 instances
+        """
+        instance_ids = sorted({i.data['ec2InstanceId'] for i in instances if 'ec2InstanceId' in i.data})
+        if not instance_ids:
+            # Instance.objects.get_many([]) would describe every instance in the account
+            return
+        ec2_instances = {i.pk: i for i in Instance.objects.get_many(instance_ids)}
+        for instance in instances:
+            if instance.data.get('ec2InstanceId') in ec2_instances:
+                instance.cache['ec2_instance'] = ec2_instances[instance.data['ec2InstanceId']]
+
     def exists(self, pk: str) -> bool:
         """
         :param pk str: a string like "{cluster}:{container_instance_id}"
@@ -952,15 +1250,21 @@ class ContainerInstanceManager(Manager):
             return False
         return True
 
-    def list(self, cluster: str) -> Sequence["ContainerInstance"]:
+    def list(self, cluster: str, prefetch: bool = True) -> Sequence["ContainerInstance"]:
         """
         :param cluster str: the name of an ECS cluster
+        :param prefetch bool: if ``True``, also load the EC2 instances for the
+                              container instances in bulk
         """
+        paginator = self.client.get_paginator('list_container_instances')
+        response_iterator = paginator.paginate(cluster=cluster)
+        arns: List[str] = []
         try:
-            response = self.client.list_container_instances(cluster=cluster)
+            for response in response_iterator:
+                arns.extend(response['containerInstanceArns'])
         except self.client.exceptions.ClusterNotFoundException:
             raise Cluster.DoesNotExist
-        return [self.get('{}:{}'.format(cluster, arn)) for arn in response['containerInstanceArns']]
+        return self.get_many(['{}:{}'.format(cluster, arn) for arn in arns], prefetch=prefetch)
 
     def save(self, obj: Model, **kwargs) -> NoReturn:
         raise Cluster.ReadOnly('Container instances cannot be updated from deployfish')
@@ -1032,6 +1336,23 @@ class ServiceManager(Manager):
 
     service: str = 'ecs'
 
+    #: ``describe_services`` accepts at most 10 services per call
+    chunk_size: int = 10
+    #: List this many clusters, and describe this many chunks of services, at once
+    max_workers: int = 8
+    #: Shared by all our threads, so that big listings slow down together when
+    #: ECS starts throttling us
+    limiters: Dict[str, AdaptiveRateLimiter] = {
+        'list_clusters': AdaptiveRateLimiter(rate=20),
+        'list_services': AdaptiveRateLimiter(rate=20),
+        'describe_services': AdaptiveRateLimiter(rate=20),
+    }
+    pk_fields: Dict[str, Callable[[str], Any]] = {
+        'pk': lambda pk: f"{pk.split(':', 1)[0]}:{pk.rsplit('/', 1)[-1]}",
+        'name': lambda pk: pk.rsplit('/', 1)[-1],
+        'arn': lambda pk: pk.split(':', 1)[1],
+    }
+
     def __get_service_and_cluster_from_pk(self, pk: str) -> Tuple[str, str]:
         if isinstance(pk, Service):
             cluster, service = pk.pk.split(':')
@@ -1071,25 +1392,33 @@ class ServiceManager(Manager):
             if cluster not in clusters:
                 clusters[cluster] = []
             clusters[cluster].append(service)
-        services = []
-        for cluster, service_names in list(clusters.items()):
-            # describe_services only accepts 10 or fewer names in the services kwarg, so we have to
-            # split them into sub lists of 10 of fewer names and iterate
-            if len(service_names) > 10:
-                chunks = [service_names[i * 10:(i + 1) * 10] for i in range((len(service_names) + 9) // 10)]
-            else:
-                chunks = [service_names]
-            for chunk in chunks:
-                try:
-                    response = self.client.describe_services(cluster=cluster, services=chunk, include=['TAGS'])
-                except self.client.exceptions.ClusterNotFoundException:
-                    raise Cluster.DoesNotExist('No cluster with name "{}" exists in AWS'.format(cluster))
-                if response['services']:
-                    services.extend([s for s in response['services'] if s['status'] != 'INACTIVE'])
+        # describe_services only accepts 10 or fewer names in the services kwarg, so we have to
+        # split them into sub lists of 10 of fewer names, which we describe concurrently
+        chunks = [
+            (cluster, service_names[i:i + self.chunk_size])
+            for cluster, service_names in clusters.items()
+            for i in range(0, len(service_names), self.chunk_size)
+        ]
+        client = self.client
+
+        def describe_chunk(chunk: Tuple[str, List[str]]) -> List[Dict[str, Any]]:
+            cluster, service_names = chunk
+            try:
+                response = self.limiters['describe_services'].call(
+                    client.describe_services,
+                    cluster=cluster,
+                    services=service_names,
+                    include=['TAGS']
+                )
+            except client.exceptions.ClusterNotFoundException:
+                raise Cluster.DoesNotExist('No cluster with name "{}" exists in AWS'.format(cluster))
+            return [s for s in response['services'] if s['status'] != 'INACTIVE']
+
         obj = []
-        for data in services:
-            data['cluster'] = data['clusterArn'].split('/')[-1]
-            obj.append(Service(data))
+        for services in concurrent_map(describe_chunk, chunks, max_workers=self.max_workers):
+            for data in services:
+                data['cluster'] = data['clusterArn'].split('/')[-1]
+                obj.append(Service(data))
         return obj
 
     def exists(self, pk: str) -> bool:
@@ -1103,14 +1432,77 @@ class ServiceManager(Manager):
             return True
         return False
 
-    def list(
+    def _iter_pks(
+        self,
+        cluster_name: str = None,
+        service_name: str = None,
+        launch_type: str = 'any',
+        scheduling_strategy: str = 'any'
+    ) -> Iterator[str]:
+        """
+        Yield the primary keys of the services in the clusters matching
+        ``cluster_name``.  We list up to :py:attr:`max_workers` clusters at
+        once, but still yield the clusters' services in the order in which
+        ``list_clusters`` returned the clusters.
+        """
+        client = self.client
+        cluster_arns: List[str] = []
+        kwargs: Dict[str, Any] = {}
+        while True:
+            response = self.limiters['list_clusters'].call(client.list_clusters, **kwargs)
+            cluster_arns.extend(response['clusterArns'])
+            if not response.get('nextToken'):
+                break
+            kwargs['nextToken'] = response['nextToken']
+        clusters = [arn.rsplit('/', 1)[1] for arn in cluster_arns]
+        if cluster_name:
+            clusters = fnmatch.filter(clusters, cluster_name)
+
+        def list_services(cluster: str) -> List[str]:
+            kwargs: Dict[str, Any] = {'cluster': cluster}
+            if launch_type != 'any':
+                kwargs['launchType'] = launch_type
+            if scheduling_strategy != 'any':
+                kwargs['schedulingStrategy'] = scheduling_strategy
+            arns: List[str] = []
+            while True:
+                try:
+                    response = self.limiters['list_services'].call(client.list_services, **kwargs)
+                except client.exceptions.ClusterNotFoundException:
+                    raise Cluster.DoesNotExist('No cluster with name "{}" exists in AWS'.format(cluster))
+                arns.extend(response['serviceArns'])
+                if not response.get('nextToken'):
+                    break
+                kwargs['nextToken'] = response['nextToken']
+            return [
+                f"{cluster}:{arn}" for arn in arns
+                if not service_name or fnmatch.fnmatch(arn.rsplit('/')[-1], service_name)
+            ]
+
+        for pks in concurrent_imap(list_services, clusters, max_workers=self.max_workers):
+            yield from pks
+
+    def iter(
         self,
         cluster_name: str = None,
         service_name: str = None,
         launch_type: str = 'any',
         scheduling_strategy: str = 'any',
-        updated_since: datetime.datetime = None
-    ) -> Sequence["Service"]:
+        updated_since: datetime.datetime = None,
+        prefetch: bool = True,
+        cache: bool = False
+    ) -> QuerySet:
+        """
+        Return a :py:class:`QuerySet` of the services that :py:meth:`list`
+        would return.  Pages of ``list_services`` results are only requested,
+        and described, as the query set needs them.
+
+        Keyword Args:
+            prefetch: if ``True``, also load the clusters and task definitions
+                for the services in bulk: a chunk at a time as we iterate, or
+                all at once if ``cache`` is ``True``.
+            cache: passed to :py:class:`QuerySet`
+        """
         if launch_type not in ['any', 'EC2', 'FARGATE']:
             raise Service.OperationFailed(
                 f'{launch_type} is not a valid launch_type.  Valid types are: EC2, FARGATE.'
@@ -1119,39 +1511,95 @@ class ServiceManager(Manager):
             raise Service.OperationFailed(
                 f'{scheduling_strategy} is not a valid launch_type.  Valid types are: REPLICA, DAEMON.'
             )
+        services = QuerySet(
+            self,
+            pks=lambda: self._iter_pks(
+                cluster_name=cluster_name,
+                service_name=service_name,
+                launch_type=launch_type,
+                scheduling_strategy=scheduling_strategy
+            ),
+            prefetch=self.prefetch_related if prefetch else None,
+            cache=cache
+        )
         if updated_since:
             local_tz = get_localzone()
-            updated_since = updated_since.astimezone(local_tz)
-        paginator = self.client.get_paginator('list_clusters')
-        response_iterator = paginator.paginate()
-        cluster_arns = []
-        for response in response_iterator:
-            cluster_arns.extend(response['clusterArns'])
-        clusters = [arn.rsplit('/', 1)[1] for arn in cluster_arns]
-        if cluster_name:
-            clusters = fnmatch.filter(clusters, cluster_name)
-        service_arns: List[str] = []
-        for cluster in clusters:
-            kwargs = {'cluster': cluster}
-            if launch_type != 'any':
-                kwargs['launchType'] = launch_type
-            if scheduling_strategy != 'any':
-                kwargs['schedulingStrategy'] = scheduling_strategy
-            paginator = self.client.get_paginator('list_services')
-            response_iterator = paginator.paginate(**kwargs)
-            try:
-                for response in response_iterator:
-                    service_arns.extend(f"{cluster}:{arn}" for arn in response['serviceArns'])
-            except self.client.exceptions.ClusterNotFoundException:
-                raise Cluster.DoesNotExist('No cluster with name "{}" exists in AWS'.format(cluster))
-        if service_name:
-            service_arns = [arn for arn in service_arns if fnmatch.fnmatch(arn.rsplit('/')[1], service_name)]
-        services = self.get_many(service_arns)
-        if updated_since is not None:
-            services = [
-                s for s in services
-                if s.last_updated is not None and s.last_updated >= updated_since
-            ]
+            since = updated_since.astimezone(local_tz)
+            services = services.filter(lambda s: s.last_updated is not None and s.last_updated >= since)
+        return services
+
+    def list(
+        self,
+        cluster_name: str = None,
+        service_name: str = None,
+        launch_type: str = 'any',
+        scheduling_strategy: str = 'any',
+        updated_since: datetime.datetime = None,
+        prefetch: bool = True
+    ) -> QuerySet:
+        return self.iter(
+            cluster_name=cluster_name,
+            service_name=service_name,
+            launch_type=launch_type,
+            scheduling_strategy=scheduling_strategy,
+            updated_since=updated_since,
+            prefetch=prefetch,
+            cache=True
+        )
+
+    def prefetch_related(self, services: Sequence["Service"]) -> None:
+        """
+        The synchronous version of :py:meth:`aprefetch_related`.
+
+        Args:
+            services: the services for which to load related objects
+        """
+        run_async(self.aprefetch_related(services))
+
+    async def aprefetch_related(self, services: Sequence["Service"]) -> None:
+        """
+        Load the :py:class:`Cluster` and :py:class:`TaskDefinition` objects for
+        all of ``services`` concurrently and stash them in each service's cache,
+        so that ``service.cluster`` and ``service.version`` don't each cost
+        their own API call.  Each distinct cluster and task definition is
+        loaded only once.
+
+        Args:
+            services: the services for which to load related objects
+        """
+        if not services:
+            return
+        cluster_names = sorted({service.data['cluster'] for service in services})
+        arns = sorted({service.data['taskDefinition'] for service in services})
+        clusters, task_definitions = await asyncio.gather(
+            Cluster.objects.aget_many(cluster_names),
+            # A task definition may have been deregistered; leave those for the
+            # synchronous properties to complain about
+            asyncio.gather(*[TaskDefinition.objects.aget(arn) for arn in arns], return_exceptions=True)
+        )
+        clusters_by_name = {cluster.name: cluster for cluster in clusters}
+        task_definitions_by_arn = {
+            arn: task_definition for arn, task_definition in zip(arns, task_definitions)
+            if isinstance(task_definition, TaskDefinition)
+        }
+        for service in services:
+            if service.data['cluster'] in clusters_by_name:
+                service.cache['cluster'] = clusters_by_name[service.data['cluster']]
+            if service.data['taskDefinition'] in task_definitions_by_arn:
+                service.task_definition = task_definitions_by_arn[service.data['taskDefinition']]
+
+    async def alist(self, *args, prefetch: bool = True, **kwargs) -> List["Service"]:
+        """
+        The awaitable version of :py:meth:`list`.
+
+        Keyword Args:
+            prefetch: if ``True``, also load the clusters and task definitions
+                for the services.  See :py:meth:`aprefetch_related`.
+        """
+        # Prefetch once for all the services rather than per chunk in a worker thread
+        services = await super().alist(*args, prefetch=False, **kwargs)
+        if prefetch:
+            await self.aprefetch_related(services)
         return services
 
     def save(self, obj: Model, **_) -> None:
@@ -1205,6 +1653,54 @@ class ServiceManager(Manager):
     def scale(self, obj: "Service", count: int) -> None:
         self.client.update_service(**obj.render_for_scale(count))
 
+    def restart_many(
+        self,
+        services: Sequence["Service"],
+        hard: bool = False,
+        waiter_hooks: List[Callable] = None,
+        polling: PollingStrategy = None
+    ) -> None:
+        """
+        Restart the running tasks for several services at once, waiting on all
+        of them together with a :py:class:`deployfish.core.waiters.fleet.ServiceFleetWaiter`
+        instead of on each service in turn.
+
+        If ``hard`` is ``True``, stop all the tasks of all the services and
+        then wait once.  Otherwise, stop one task from each service per round,
+        and wait for the whole fleet to stabilize before starting the next
+        round.
+
+        Args:
+            services: the services to restart
+
+        Keyword Args:
+            hard: if ``True``, kill off all the tasks at once
+            waiter_hooks: hooks for the fleet waiter, e.g.
+                :py:class:`deployfish.core.waiters.hooks.ecs.ECSServiceFleetStatusWaiterHook`
+            polling: the polling strategy for the fleet waiter
+        """
+        if not services:
+            return
+        pks = [service.pk for service in services]
+
+        def list_tasks(service: "Service") -> List["InvokedTask"]:
+            # We only need the task ARNs to stop the tasks, so don't bother
+            # loading their task definitions and container instances
+            return list(InvokedTask.objects.list(service.data['cluster'], service=service.name, prefetch=False))
+
+        tasks = dict(zip(pks, concurrent_map(list_tasks, services)))
+        if hard:
+            rounds = [[task for pk in pks for task in tasks[pk]]]
+        else:
+            rounds = [
+                [tasks[pk][i] for pk in pks if i < len(tasks[pk])]
+                for i in range(max(len(t) for t in tasks.values()))
+            ]
+        for doomed in rounds:
+            for task in doomed:
+                task.delete()
+            ServiceFleetWaiter(pks, hooks=waiter_hooks, polling=polling).wait()
+
 
 # ----------------------------------------
 # Models
@@ -1760,7 +2256,10 @@ class Task(TagsMixin, VPCConfigurationMixin, Model):
 
     @property
     def running_tasks(self) -> Sequence["InvokedTask"]:
-        pass
+        """
+        The tasks from our task definition family that are currently running in our cluster.
+        """
+        return InvokedTask.objects.list(self.data['cluster'], family=self.family, prefetch=False)
 
     # ------------------------
     # Task-specific actions
@@ -2081,6 +2580,21 @@ class Cluster(TagsMixin, SSHMixin, Model):
     def services(self) -> Sequence["Service"]:
         return self.get_cached('services', Service.objects.list, [self.pk])
 
+    async def aload_related(self) -> None:
+        """
+        Load our services (with their task definitions) and, for EC2 clusters,
+        our container instances (with their EC2 instances) concurrently.
+        """
+        if self.cluster_type == 'EC2':
+            services, container_instances = await asyncio.gather(
+                Service.objects.alist(self.pk),
+                ContainerInstance.objects.alist(self.pk)
+            )
+            self.cache['container_instances'] = container_instances
+        else:
+            services = await Service.objects.alist(self.pk)
+        self.cache['services'] = services
+
     @property
     def autoscaling_group(self) -> Optional[AutoscalingGroup]:
         if self.cluster_type == 'EC2':
@@ -2113,12 +2627,23 @@ class Cluster(TagsMixin, SSHMixin, Model):
     def ssh_targets(self) -> Sequence[Instance]:
         return self.ec2_instances
 
-    def ssh_command_all_instances(self, cmd: str) -> List[Tuple[bool, str]]:
-        responses = []
-        for instance in self.ec2_instances:
-            success, output = instance.ssh_noninteractive(cmd)
-            responses.append((success, output))
-        return responses
+    def ssh_command_all_instances(
+        self,
+        cmd: str,
+        max_workers: int = 10,
+        timeout: float = None,
+        on_line: Callable[[Instance, str], None] = None,
+        on_done: Callable[[SSHCommandResult], None] = None
+    ) -> List[SSHCommandResult]:
+        """
+        Run ``cmd`` on all of our EC2 instances, ``max_workers`` at a time.  See
+        :py:class:`deployfish.core.ssh.SSHFanout` for the keyword arguments.
+
+        Returns:
+            One :py:class:`deployfish.core.ssh.SSHCommandResult` per instance.
+        """
+        fanout = SSHFanout(cmd, max_workers=max_workers, timeout=timeout, on_line=on_line, on_done=on_done)
+        return fanout.run(self.ec2_instances)
 
     # ------------------------
     # Cluster-specific actions
@@ -2781,7 +3306,10 @@ class Service(
         if not waiter_hooks:
             waiter_hooks = []
         waiter = self.objects.get_waiter('services_stable')
-        for task in self.running_tasks:
+        # We only need the task ARNs to stop the tasks, so don't bother loading
+        # their task definitions and container instances
+        tasks = InvokedTask.objects.list(self.data['cluster'], service=self.name, prefetch=False)
+        for task in tasks:
             task.delete()
             if not hard:
                 waiter.wait(
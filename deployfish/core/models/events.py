@@ -1,6 +1,8 @@
 from copy import copy
 from typing import Optional, Sequence, cast, Dict, Any
 
+from deployfish.core.utils import concurrent_map
+
 from .abstract import Manager, Model
 
 
@@ -71,9 +73,13 @@ class EventScheduleRuleManager(Manager):
         rules = []
         for response in response_iterator:
             for data in response['Rules']:
-                rule = EventScheduleRule(data)
-                rule.target = EventTarget.objects.get(rule.pk, rule=rule)
-                rules.append(rule)
+                rules.append(EventScheduleRule(data))
+
+        def load_target(rule: EventScheduleRule) -> None:
+            rule.target = EventTarget.objects.get(rule.pk, rule=rule)
+
+        # Each rule needs its own list_targets_by_rule call, so do those in parallel
+        concurrent_map(load_target, rules)
         return rules
 
     def save(self, obj: Model, **_) -> str:
@@ -4,6 +4,8 @@ from typing import Dict, Any, Sequence, List, Union, Type, Tuple, Optional
 
 from jsondiff import diff
 
+from deployfish.core.aws import AdaptiveRateLimiter
+from deployfish.core.utils import concurrent_map
 from deployfish.types import SupportsCache
 
 from .abstract import Manager, Model
@@ -48,19 +50,36 @@ class SecretsMixin:
         self.cache['secrets'] = value
 
     def write_secrets(self: SupportsSecrets) -> None:
+        """
+        Make the SSM Parameter Store parameters under our :py:attr:`secrets_prefix`
+        match our :py:attr:`secrets`: write the secrets that are new or differ
+        from what is in AWS, and delete any parameters under our prefix that we
+        no longer have.  ``ExternalSecrets`` are read only and are never
+        written.
+        """
+        if not self.secrets:
+            return
+        try:
+            live = Secret.objects.list(self.secrets_prefix)
+        except Secret.DecryptionFailed:
+            # We can't read the live SecureString values, so they will all look
+            # changed and be rewritten
+            live = Secret.objects.list(self.secrets_prefix, decrypt=False)
+        live_secrets = {s.pk: s for s in live}
         # Add and update secrets we do need
-        for secret in list(self.secrets.values()):
-            try:
-                secret.save()
-            except secret.ReadOnly:
-                pass
+        changed = [
+            secret for secret in self.secrets.values()
+            if not isinstance(secret, ExternalSecret) and (
+                secret.pk not in live_secrets or secret.differs_from(live_secrets[secret.pk])
+            )
+        ]
+        if changed:
+            Secret.objects.save_many(changed)
         # now delete any secrets that we no longer need
-        if self.secrets:
-            aws_pks = Secret.objects.list_names(self.secrets_prefix)
-            our_pks = [s.pk for s in list(self.secrets.values())]
-            for_deletion = list(set(aws_pks) - set(our_pks))
-            if for_deletion:
-                Secret.objects.delete_many_by_name(for_deletion)
+        our_pks = [s.pk for s in list(self.secrets.values())]
+        for_deletion = list(set(live_secrets) - set(our_pks))
+        if for_deletion:
+            Secret.objects.delete_many_by_name(for_deletion)
 
     def reload_secrets(self: SupportsSecrets) -> None:
         if 'secrets' in self.cache:
@@ -104,6 +123,24 @@ class SecretManager(Manager):
 
     service = 'ssm'
 
+    #: ``get_parameters`` accepts at most this many names per call
+    GET_PARAMETERS_CHUNK_SIZE: int = 10
+    #: ``describe_parameters`` filters accept at most this many values, and it
+    #: returns at most this many parameters per page
+    DESCRIBE_PARAMETERS_CHUNK_SIZE: int = 50
+
+    #: How many SSM calls to have in flight at once
+    max_workers: int = 4
+
+    #: SSM has low per-account API rate limits, so all of our threads, and
+    #: both the ``Secret`` and ``ExternalSecret`` managers, share these
+    limiters: Dict[str, AdaptiveRateLimiter] = {
+        'get_parameters': AdaptiveRateLimiter(rate=10),
+        'describe_parameters': AdaptiveRateLimiter(rate=5),
+        'put_parameter': AdaptiveRateLimiter(rate=3),
+        'delete_parameters': AdaptiveRateLimiter(rate=3),
+    }
+
     def __init__(self, model: Union[Type["Secret"], Type["ExternalSecret"]], readonly: bool = False) -> None:
         self.model = model
         self.readonly = readonly
@@ -114,33 +151,85 @@ class SecretManager(Manager):
             option = 'BeginsWith'
         else:
             option = 'Equals'
-        paginator = self.client.get_paginator('describe_parameters')
-        response_iterator = paginator.paginate(
-            ParameterFilters=[
-                {'Key': 'Name', 'Option': option, 'Values': [key]}
-            ]
-        )
+        return self._describe_parameters_with_filter(option, [key])
+
+    def _describe_parameters_with_filter(self, option: str, values: List[str]) -> List[Dict[str, Any]]:
+        """
+        Page through ``describe_parameters`` for a single ``Name`` filter.  We
+        do the paging ourselves instead of using a paginator so that each page
+        goes through our rate limiter.
+        """
+        kwargs: Dict[str, Any] = {
+            'ParameterFilters': [{'Key': 'Name', 'Option': option, 'Values': values}],
+            'MaxResults': self.DESCRIBE_PARAMETERS_CHUNK_SIZE,
+        }
         parameters = []
-        for page in response_iterator:
-            parameters.extend(page['Parameters'])
+        while True:
+            response = self.limiters['describe_parameters'].call(self.client.describe_parameters, **kwargs)
+            parameters.extend(response['Parameters'])
+            if not response.get('NextToken'):
+                break
+            kwargs['NextToken'] = response['NextToken']
         return parameters
 
+    def _describe_parameters_by_name(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Describe the parameters named ``names``, by chunking them into
+        ``Equals`` filters and running the chunks concurrently.
+
+        .. note::
+
+            We used to scan each distinct prefix in ``names`` with a
+            ``BeginsWith`` filter instead.  An ``Equals`` filter takes up to 50
+            names and returns up to 50 results per page, so describing ``n``
+            names costs ``ceil(n / 50)`` calls, while scanning a prefix holding
+            ``N >= n`` parameters costs ``ceil(N / 50)`` calls that must be made
+            one after the other.  The break-even point is thus never in favor
+            of the prefix scan.
+
+        Returns:
+            A dict of parameter name to parameter description.
+        """
+        chunks = self._chunk(names, self.DESCRIBE_PARAMETERS_CHUNK_SIZE)
+        descriptions = {}
+        for parameters in concurrent_map(
+            lambda chunk: self._describe_parameters_with_filter('Equals', chunk),
+            chunks,
+            max_workers=self.max_workers
+        ):
+            for p in parameters:
+                descriptions[p['Name']] = p
+        return descriptions
+
     def _get_parameter_values(self, names: List[str], decrypt: bool = True) -> Tuple[Dict[str, Any], List[str]]:
         # get_parameters only accepts 10 or fewer names in the Names kwarg, so we have to
-        # split names into sub lists of 10 of fewer names and iterate
-        names_chunks = [names[i * 10:(i + 1) * 10] for i in range((len(names) + 9) // 10)]
-        parameters = []
-        non_existant = []
-        for chunk in names_chunks:
+        # split names into sub lists of 10 of fewer names and fetch them concurrently
+        def get_chunk(chunk: List[str]) -> Dict[str, Any]:
             try:
-                response = self.client.get_parameters(Names=chunk, WithDecryption=decrypt)
+                return self.limiters['get_parameters'].call(
+                    self.client.get_parameters,
+                    Names=chunk,
+                    WithDecryption=decrypt
+                )
             except self.client.exceptions.InvalidKeyId as e:
                 raise self.model.DecryptionFailed(str(e))
+
+        parameters = []
+        non_existant = []
+        for response in concurrent_map(
+            get_chunk,
+            self._chunk(names, self.GET_PARAMETERS_CHUNK_SIZE),
+            max_workers=self.max_workers
+        ):
             if 'InvalidParameters' in response and response['InvalidParameters']:
                 non_existant.extend(response['InvalidParameters'])
             parameters.extend(response['Parameters'])
         return {p['Name']: p for p in parameters}, non_existant
 
+    @staticmethod
+    def _chunk(names: List[str], size: int) -> List[List[str]]:
+        return [names[i * size:(i + 1) * size] for i in range((len(names) + size - 1) // size)]
+
     def convert(self, parameter_data: Dict[str, Any]) -> "Secret":
         name = parameter_data['Name'].split('.')[-1]
         return self.model(parameter_data, name=name)
@@ -162,27 +251,25 @@ class SecretManager(Manager):
 
             What we want to return is data that contains both the encryption information (which is only
             available from describe_paramters) and the actual parameter value (which is only available
-            from get_parameters).  So we do one call to describe_parameters and one to get_parameters for
-            each parameter (well, we bundle the calls as much as possible) and combine the results.
+            from get_parameters).  So we call describe_parameters and get_parameters for batches of
+            parameters, concurrently, and combine the results.
         """
-        # Use get_parameter to get the parameter values
-        values, non_existant_parameters = self._get_parameter_values(pks)
-        prefixes = set()
-        # FIXME: we're getting all parameters for a service even if we wanted just a few, and that takes a long time.
-        # Find the breakeven point below which it's faster to get parameters individually and above which is better to
-        # get all the parameters.
-        for pk in pks:
-            prefixes.add(pk.rsplit('.', 1)[0] + ".")
-        descriptions = {}
-        for prefix in prefixes:
-            params = self._describe_parameters(prefix)
-            for p in params:
-                descriptions[p['Name']] = p
+        pks = list(dict.fromkeys(pks))
+        (values, non_existant_parameters), descriptions = concurrent_map(
+            lambda func: func(),
+            [
+                lambda: self._get_parameter_values(pks),
+                lambda: self._describe_parameters_by_name(pks),
+            ]
+        )
         secrets = []
-        for name, data in list(descriptions.items()):
-            if name in values:
-                data['ARN'] = values[name]['ARN']
-                data['Value'] = values[name]['Value']
+        for pk in pks:
+            if pk not in descriptions:
+                continue
+            data = descriptions[pk]
+            if pk in values:
+                data['ARN'] = values[pk]['ARN']
+                data['Value'] = values[pk]['Value']
             secrets.append(self.convert(data))
         # Fake the non-existant parameters
         for param in non_existant_parameters:
@@ -222,19 +309,30 @@ class SecretManager(Manager):
 
     def save(self, obj: Model, **_) -> str:
         if not self.readonly:
-            response = self.client.put_parameter(**obj.render_for_create())
+            response = self.limiters['put_parameter'].call(self.client.put_parameter, **obj.render_for_create())
             return response['Version']
         raise self.model.ReadOnly('This Secret is read only.')
 
+    def save_many(self, objs: Sequence[Model]) -> List[str]:
+        """
+        Save each of ``objs`` to AWS, concurrently.
+
+        Args:
+            objs: the Secrets to save
+
+        Returns:
+            The new versions of each of ``objs``, in order.
+        """
+        return concurrent_map(self.save, list(objs), max_workers=self.max_workers)
+
     def delete_many_by_name(self, pks: List[str]) -> None:
-        if len(pks) <= 10:
-            self.client.delete_parameters(Names=pks)
-        else:
-            # delete_parameters() will only take 10 params at a time, so we have
-            # to split it up if we have more than 10
-            chunks = [pks[i * 10:(i + 1) * 10] for i in range((len(pks) + 9) // 10)]
-            for chunk in chunks:
-                self.client.delete_parameters(Names=chunk)
+        # delete_parameters() will only take 10 params at a time, so we have
+        # to split it up if we have more than 10
+        concurrent_map(
+            lambda chunk: self.limiters['delete_parameters'].call(self.client.delete_parameters, Names=chunk),
+            self._chunk(pks, 10),
+            max_workers=self.max_workers
+        )
 
     def delete(self, obj: Model, **_) -> None:
         if self.readonly:
@@ -300,6 +398,28 @@ class Secret(Model):
             del data['Policies']
         return data
 
+    def differs_from(self, other: "Secret") -> bool:
+        """
+        Return ``True`` if saving us would change ``other``, the live version
+        of this parameter in AWS.
+
+        We compare only the attributes we would send with ``put_parameter``.
+        """
+        ours = self.render_for_create()
+        theirs = other.render()
+        for key in ('Value', 'Type', 'KeyId', 'Tier', 'DataType', 'Description', 'AllowedPattern'):
+            if key not in ours:
+                continue
+            our_value = ours[key]
+            their_value = theirs.get(key, None)
+            if key == 'KeyId' and ours.get('Type') == 'SecureString':
+                # No KeyId means "use the AWS managed key"
+                our_value = our_value or 'alias/aws/ssm'
+                their_value = their_value or 'alias/aws/ssm'
+            if our_value != their_value:
+                return True
+        return False
+
     # ----------------------------
     # Secret-specific properties
     # ----------------------------
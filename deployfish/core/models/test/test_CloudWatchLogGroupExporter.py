@@ -0,0 +1,135 @@
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.aws import AdaptiveRateLimiter
+from deployfish.core.models import CloudWatchLogGroup
+from deployfish.core.models.cloudwatchlogs import CloudWatchLogGroupExporter
+
+
+START = 1672531200000
+HOUR = 3600 * 1000
+
+
+class TestCloudWatchLogGroupExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, 'foobar.jsonl.gz')
+        # One event every 10 minutes for 4 hours, from two streams, returned out of order
+        self.events = [
+            {
+                'eventId': str(i),
+                'timestamp': START + i * 600 * 1000,
+                'logStreamName': f'foobar/web/{i % 2}',
+                'message': f'message {i}',
+            }
+            for i in reversed(range(24))
+        ]
+        self.fail_at = None
+        self.client = Mock()
+        self.client.filter_log_events.side_effect = self.filter_log_events
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.models.cloudwatchlogs.get_boto3_client', Mock(return_value=self.client))
+        self.replacer(
+            'deployfish.core.models.cloudwatchlogs.CloudWatchLogGroupExporter.limiter',
+            AdaptiveRateLimiter(rate=10000)
+        )
+        self.group = CloudWatchLogGroup({'logGroupName': 'foobar'})
+
+    def tearDown(self):
+        self.replacer.restore()
+        shutil.rmtree(self.tmpdir)
+
+    def filter_log_events(self, startTime=None, endTime=None, nextToken=None, **kwargs):
+        if startTime == self.fail_at:
+            raise RuntimeError('interrupted')
+        events = [dict(e) for e in self.events if startTime <= e['timestamp'] <= endTime]
+        # Return each slice in two pages
+        if nextToken is None:
+            return {'events': events[:2], 'nextToken': 'page2'}
+        return {'events': events[2:]}
+
+    def read(self):
+        with gzip.open(self.path, 'rt') as fd:
+            return [json.loads(line) for line in fd]
+
+    def test_slices(self):
+        exporter = CloudWatchLogGroupExporter(self.group, START, START + HOUR + 1000, slice_seconds=1800)
+        self.assertEqual(exporter.slices(), [
+            (START, START + HOUR // 2),
+            (START + HOUR // 2, START + HOUR),
+            (START + HOUR, START + HOUR + 1000),
+        ])
+
+    def test_export_is_ordered(self):
+        exporter = CloudWatchLogGroupExporter(self.group, START, START + 4 * HOUR, slice_seconds=1800)
+        self.assertEqual(exporter.export(self.path), 24)
+        self.assertEqual([e['eventId'] for e in self.read()], [str(i) for i in range(24)])
+        self.assertEqual(self.client.filter_log_events.call_count, 16)
+        self.assertFalse(os.path.exists(f'{self.path}.checkpoint'))
+
+    def test_stream_names_are_batched(self):
+        names = [f'foobar/web/{i}' for i in range(150)]
+        exporter = CloudWatchLogGroupExporter(self.group, START, START + HOUR, stream_names=names, slice_seconds=3600)
+        exporter.export(self.path)
+        first_pages = [c[1] for c in self.client.filter_log_events.call_args_list if 'nextToken' not in c[1]]
+        self.assertEqual([len(kwargs['logStreamNames']) for kwargs in first_pages], [100, 50])
+
+    def test_export_resumes_from_checkpoint(self):
+        exporter = CloudWatchLogGroupExporter(self.group, START, START + 4 * HOUR, slice_seconds=1800, max_workers=1)
+        self.fail_at = START + 2 * HOUR
+        with self.assertRaises(RuntimeError):
+            exporter.export(self.path)
+        with open(f'{self.path}.checkpoint') as fd:
+            self.assertEqual(json.load(fd)['slices'], 4)
+        self.fail_at = None
+        self.client.filter_log_events.reset_mock()
+        self.assertEqual(exporter.export(self.path), 24)
+        self.assertEqual([e['eventId'] for e in self.read()], [str(i) for i in range(24)])
+        # Only the last four slices were fetched again
+        self.assertEqual(self.client.filter_log_events.call_count, 8)
+
+    def test_export_without_end_resumes_with_original_end(self):
+        now = self.replacer(
+            'deployfish.core.models.cloudwatchlogs.time.time',
+            Mock(return_value=(START + 4 * HOUR) / 1000)
+        )
+        self.fail_at = START + 2 * HOUR
+        with self.assertRaises(RuntimeError):
+            CloudWatchLogGroupExporter(self.group, START, None, slice_seconds=1800, max_workers=1).export(self.path)
+        with open(f'{self.path}.checkpoint') as fd:
+            self.assertEqual(json.load(fd)['endTime'], START + 4 * HOUR)
+        # Time has moved on by the time we run the same export again
+        now.return_value = (START + 6 * HOUR) / 1000
+        self.fail_at = None
+        self.client.filter_log_events.reset_mock()
+        exporter = CloudWatchLogGroupExporter(self.group, START, None, slice_seconds=1800, max_workers=1)
+        self.assertEqual(exporter.export(self.path), 24)
+        self.assertEqual(exporter.end_time, START + 4 * HOUR)
+        self.assertEqual([e['eventId'] for e in self.read()], [str(i) for i in range(24)])
+        self.assertEqual(self.client.filter_log_events.call_count, 8)
+
+    def test_checkpoint_with_other_end_is_refused(self):
+        exporter = CloudWatchLogGroupExporter(self.group, START, START + 4 * HOUR, slice_seconds=1800)
+        exporter.save_checkpoint(
+            f'{self.path}.checkpoint',
+            {'signature': exporter.signature, 'endTime': START + 2 * HOUR, 'slices': 1, 'bytes': 0, 'events': 0}
+        )
+        with self.assertRaises(CloudWatchLogGroup.OperationFailed):
+            exporter.export(self.path)
+
+    def test_checkpoint_for_other_export_is_refused(self):
+        CloudWatchLogGroupExporter(self.group, START, START + 4 * HOUR, slice_seconds=1800).save_checkpoint(
+            f'{self.path}.checkpoint',
+            {'signature': {}, 'slices': 1, 'bytes': 0, 'events': 0}
+        )
+        exporter = CloudWatchLogGroupExporter(self.group, START, START + 4 * HOUR, slice_seconds=1800)
+        with self.assertRaises(CloudWatchLogGroup.OperationFailed):
+            exporter.export(self.path)
@@ -0,0 +1,91 @@
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.models import CloudWatchLogGroup
+from deployfish.core.models.cloudwatchlogs import CloudWatchLogGroupTailer
+
+
+START = 1672531200000
+
+
+def event(i, timestamp=None):
+    return {
+        'eventId': str(i),
+        'timestamp': START + (timestamp if timestamp is not None else i) * 1000,
+        'logStreamName': 'foobar/web/aaaa',
+        'message': f'message {i}',
+    }
+
+
+class TestCloudWatchLogGroupTailer(unittest.TestCase):
+
+    def setUp(self):
+        self.events = []
+        self.client = Mock()
+        self.client.get_paginator.return_value.paginate.side_effect = self.filter_log_events
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.models.cloudwatchlogs.get_boto3_client', Mock(return_value=self.client))
+        self.group = CloudWatchLogGroup({'logGroupName': 'foobar'})
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def filter_log_events(self, **kwargs):
+        events = sorted(
+            (
+                dict(e) for e in self.events
+                if e['timestamp'] >= kwargs['startTime']
+                and ('logStreamNames' not in kwargs or e['logStreamName'] in kwargs['logStreamNames'])
+            ),
+            key=lambda e: e['timestamp']
+        )
+        # Two events per page, so we can count pages as API calls
+        return [{'events': events[i:i + 2]} for i in range(0, max(len(events), 1), 2)]
+
+    def test_late_events_inside_overlap_are_not_lost_or_repeated(self):
+        tailer = CloudWatchLogGroupTailer(self.group, start_time=START, sleep=5, overlap=5)
+        self.events.extend([event(1), event(2), event(10)])
+        self.assertEqual([e['eventId'] for e in tailer.fetch()], ['1', '2', '10'])
+        # event 3 was ingested late, with a timestamp older than the newest event we've seen
+        self.events.append(event(3, timestamp=7))
+        self.assertEqual([e['eventId'] for e in tailer.fetch()], ['3'])
+        self.assertEqual(tailer.kwargs['startTime'], START + 5000)
+        self.assertEqual(tailer.fetch(), [])
+
+    def test_stream_names_are_batched(self):
+        names = [f'foobar/web/{i}' for i in range(250)]
+        self.events.extend([dict(event(i), logStreamName=names[i * 50]) for i in range(5)])
+        tailer = CloudWatchLogGroupTailer(self.group, start_time=START, stream_names=names)
+        self.assertEqual([e['eventId'] for e in tailer.fetch()], ['0', '1', '2', '3', '4'])
+        paginate = self.client.get_paginator.return_value.paginate
+        self.assertEqual([len(c[1]['logStreamNames']) for c in paginate.call_args_list], [100, 100, 50])
+
+    def test_seen_event_ids_are_bounded(self):
+        tailer = CloudWatchLogGroupTailer(self.group, start_time=START, max_seen=3)
+        self.events.extend([event(i) for i in range(1, 6)])
+        tailer.fetch()
+        self.assertEqual(list(tailer.seen), ['3', '4', '5'])
+
+    def test_interval_adapts_to_load(self):
+        tailer = CloudWatchLogGroupTailer(self.group, start_time=START, sleep=8, min_sleep=1, max_sleep=12)
+        self.events.append(event(1))
+        tailer.fetch()
+        self.assertEqual(tailer.sleep, 4)
+        tailer.fetch()
+        tailer.fetch()
+        self.assertEqual(tailer.sleep, 9)
+        tailer.fetch()
+        self.assertEqual(tailer.sleep, 12)
+
+    def test_calls_per_minute(self):
+        tailer = CloudWatchLogGroupTailer(self.group, start_time=START)
+        self.events.extend([event(i) for i in range(1, 6)])
+        tailer.fetch()
+        self.assertEqual(tailer.api_calls, 3)
+        self.assertEqual(tailer.calls_per_minute, 3)
+        with Replacer() as r:
+            r('deployfish.core.models.cloudwatchlogs.time.monotonic', Mock(return_value=tailer._call_times[-1] + 61))
+            self.assertEqual(tailer.calls_per_minute, 0)
+        self.assertEqual(tailer.api_calls, 3)
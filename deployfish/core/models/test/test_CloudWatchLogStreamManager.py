@@ -0,0 +1,92 @@
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.models import CloudWatchLogStream
+
+
+def stream(name, last_event):
+    return {'logStreamName': name, 'creationTime': 0, 'lastEventTimestamp': last_event}
+
+
+class TestCloudWatchLogStreamManager_newest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.replacer = Replacer()
+        self.replacer.in_environ('DEPLOYFISH_CACHE_DIR', self.tmpdir)
+        self.replacer.in_environ('DEPLOYFISH_DISABLE_CACHE', 'false')
+        # Newest first, 2 streams per page
+        self.streams = [
+            stream('other/web/1', 900),
+            stream('foobar/web/3', 800),
+            stream('other/web/2', 700),
+            stream('foobar/web/2', 600),
+            stream('foobar/web/1', 500),
+        ]
+        self.client = Mock()
+        self.client.meta.region_name = 'us-west-2'
+        self.client.get_paginator.return_value.paginate.side_effect = self.paginate
+        self.client.describe_log_streams.side_effect = lambda logGroupName=None, logStreamNamePrefix=None: {
+            'logStreams': [dict(s) for s in self.streams if s['logStreamName'].startswith(logStreamNamePrefix)]
+        }
+        self.replacer('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+        self.replacer('deployfish.core.models.cloudwatchlogs.get_aws_account_id', Mock(return_value='123456789012'))
+        self.pages = 0
+
+    def tearDown(self):
+        self.replacer.restore()
+        shutil.rmtree(self.tmpdir)
+
+    def paginate(self, logStreamNamePrefix='', **kwargs):
+        streams = [s for s in self.streams if s['logStreamName'].startswith(logStreamNamePrefix)]
+        for i in range(0, len(streams), 2):
+            self.pages += 1
+            yield {'logStreams': [dict(s) for s in streams[i:i + 2]]}
+
+    def test_from_stream_names(self):
+        newest = CloudWatchLogStream.objects.newest('foobar', stream_names=['foobar/web/1', 'foobar/web/2', 'gone'])
+        self.assertEqual(newest.pk, 'foobar:foobar/web/2')
+        self.assertEqual(self.client.describe_log_streams.call_count, 3)
+        self.assertEqual(self.pages, 0)
+
+    def test_from_prefix_uses_index(self):
+        newest = CloudWatchLogStream.objects.newest('foobar', prefix='foobar/')
+        self.assertEqual(newest.name, 'foobar/web/3')
+        self.assertEqual(self.pages, 1)
+        # Another family got busy, but none of our streams have new events
+        self.streams = [stream(f'other/web/{i}', 2000 - i) for i in range(3)] + [stream('other/web/old', 100)]
+        self.pages = 0
+        newest = CloudWatchLogStream.objects.newest('foobar', prefix='foobar/')
+        self.assertEqual(newest.name, 'foobar/web/3')
+        self.assertEqual(newest.data['logGroupName'], 'foobar')
+        self.assertEqual(self.pages, 2)
+
+    def test_cold_index_with_old_prefix_falls_back_to_prefix_listing(self):
+        self.streams = [stream(f'other/web/{i}', 2000 - i) for i in range(20)] + [
+            stream('foobar/web/1', 500),
+            stream('foobar/web/2', 600),
+        ]
+        newest = CloudWatchLogStream.objects.newest('foobar', prefix='foobar/')
+        self.assertEqual(newest.name, 'foobar/web/2')
+        # 3 pages newest first, then the single page of foobar/ streams
+        self.assertEqual(self.pages, 4)
+        self.assertEqual(
+            self.client.get_paginator.return_value.paginate.call_args[1],
+            {'logGroupName': 'foobar', 'logStreamNamePrefix': 'foobar/'}
+        )
+
+    def test_index_is_per_region(self):
+        newest = CloudWatchLogStream.objects.newest('foobar', prefix='foobar/')
+        self.assertEqual(newest.name, 'foobar/web/3')
+        # The same group in another region has only old streams of ours, behind a busy other family
+        self.client.meta.region_name = 'us-east-1'
+        self.streams = [stream(f'other/web/{i}', 2000 - i) for i in range(3)] + [
+            stream('other/web/old', 100),
+            stream('foobar/web/east', 50),
+        ]
+        newest = CloudWatchLogStream.objects.newest('foobar', prefix='foobar/')
+        self.assertEqual(newest.name, 'foobar/web/east')
@@ -0,0 +1,63 @@
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.aws import AdaptiveRateLimiter
+from deployfish.core.models import CloudWatchLogsQuery
+
+
+START = 1672531200000
+
+
+class TestCloudWatchLogsQueryManager_run(unittest.TestCase):
+
+    def setUp(self):
+        self.polls = {}
+        self.client = Mock()
+        self.client.start_query.side_effect = lambda logGroupName=None, **kwargs: {'queryId': f'q-{logGroupName}'}
+        self.client.get_query_results.side_effect = self.get_query_results
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+        self.replacer(
+            'deployfish.core.models.cloudwatchlogs.CloudWatchLogsQueryManager.limiters',
+            {
+                'start_query': AdaptiveRateLimiter(rate=10000),
+                'get_query_results': AdaptiveRateLimiter(rate=10000),
+            }
+        )
+        self.sleep = self.replacer('deployfish.core.models.cloudwatchlogs.time.sleep', Mock())
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def get_query_results(self, queryId=None):
+        self.polls[queryId] = self.polls.get(queryId, 0) + 1
+        if self.polls[queryId] < 3:
+            return {'status': 'Running', 'results': []}
+        if queryId == 'q-broken':
+            return {'status': 'Failed'}
+        return {
+            'status': 'Complete',
+            'results': [[
+                {'field': '@logStream', 'value': f'{queryId}/web/aaaa'},
+                {'field': 'errors', 'value': '3'},
+                {'field': '@ptr', 'value': 'CmAKJwoj'},
+            ]],
+            'statistics': {'recordsMatched': 3.0, 'recordsScanned': 100.0, 'bytesScanned': 1000.0},
+        }
+
+    def test_one_query_per_group(self):
+        queries = CloudWatchLogsQuery.objects.run(
+            'stats count(*) as errors by @logStream', ['foo', 'bar'], START, START + 3600 * 1000
+        )
+        self.assertEqual([q.log_group_name for q in queries], ['foo', 'bar'])
+        self.assertEqual(queries[0].results, [{'@logStream': 'q-foo/web/aaaa', 'errors': '3'}])
+        self.assertEqual(queries[1].statistics['recordsMatched'], 3.0)
+        self.assertEqual(self.client.start_query.call_args[1]['startTime'], START // 1000)
+        # We back off between polls
+        self.assertEqual(sorted(c[0][0] for c in self.sleep.call_args_list), [0.5, 0.5, 1.0, 1.0])
+
+    def test_failed_query_raises(self):
+        with self.assertRaises(CloudWatchLogsQuery.OperationFailed):
+            CloudWatchLogsQuery.objects.run('fields @message', ['foo', 'broken'], START, START + 1000)
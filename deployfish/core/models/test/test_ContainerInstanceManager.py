@@ -0,0 +1,53 @@
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.models import Cluster, ContainerInstance, Instance
+
+
+def instance_arn(i):
+    return f'arn:aws:ecs:us-west-2:123456789012:container-instance/foobar-cluster/{i}'
+
+
+def describe_container_instances(cluster=None, containerInstances=None):
+    return {
+        'containerInstances': [
+            {'containerInstanceArn': arn, 'ec2InstanceId': 'i-{}'.format(arn.rsplit('/', 1)[1])}
+            for arn in containerInstances
+        ]
+    }
+
+
+class TestContainerInstanceManager_list(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Mock()
+        self.client.describe_container_instances.side_effect = describe_container_instances
+        paginator = Mock()
+        paginator.paginate.return_value = [
+            {'containerInstanceArns': [instance_arn(i) for i in range(100)]},
+            {'containerInstanceArns': [instance_arn(i) for i in range(100, 150)]},
+        ]
+        self.client.get_paginator.return_value = paginator
+        self.get_many = Mock(side_effect=lambda ids: [Instance({'InstanceId': pk, 'Tags': []}) for pk in ids])
+
+    def test_list_joins_ec2_instances_in_bulk(self):
+        with Replacer() as r:
+            r('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+            r('deployfish.core.models.ec2.InstanceManager.get_many', self.get_many)
+            instances = ContainerInstance.objects.list('foobar-cluster')
+        self.assertEqual(len(instances), 150)
+        self.assertEqual(self.client.describe_container_instances.call_count, 2)
+        self.assertEqual(self.get_many.call_count, 1)
+        for instance in instances:
+            self.assertEqual(instance.ec2_instance.pk, instance.data['ec2InstanceId'])
+
+    def test_cluster_ec2_instances(self):
+        cluster = Cluster({'clusterName': 'foobar-cluster', 'clusterArn': 'arn'})
+        with Replacer() as r:
+            r('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+            r('deployfish.core.models.ec2.InstanceManager.get_many', self.get_many)
+            ec2_instances = cluster.ec2_instances
+        self.assertEqual(len(ec2_instances), 150)
+        self.assertEqual(self.get_many.call_count, 1)
@@ -0,0 +1,72 @@
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.models import Cluster, IdentityMap
+
+
+def describe_clusters(clusters=None, include=None):
+    return {
+        'clusters': [
+            {'clusterName': name, 'clusterArn': f'arn:aws:ecs:us-west-2:123456789012:cluster/{name}'}
+            for name in clusters
+        ]
+    }
+
+
+class TestIdentityMap(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Mock()
+        self.client.describe_clusters.side_effect = describe_clusters
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def test_inactive_by_default(self):
+        Cluster.objects.get('foo')
+        Cluster.objects.get('foo')
+        self.assertEqual(self.client.describe_clusters.call_count, 2)
+
+    def test_get_is_deduplicated(self):
+        with IdentityMap() as identity_map:
+            first = Cluster.objects.get('foo')
+            second = Cluster.objects.get('foo')
+            by_arn = Cluster.objects.get('arn:aws:ecs:us-west-2:123456789012:cluster/foo')
+        self.assertIs(first, second)
+        self.assertIs(first, by_arn)
+        self.assertEqual(self.client.describe_clusters.call_count, 1)
+        stats = identity_map.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['by_model']['Cluster']['hits'], 2)
+        self.assertIsNone(IdentityMap.active())
+
+    def test_get_many_only_fetches_misses(self):
+        with IdentityMap():
+            foo = Cluster.objects.get('foo')
+            clusters = Cluster.objects.get_many(['foo', 'bar'])
+            again = Cluster.objects.get_many(['bar', 'foo'])
+        self.assertEqual(self.client.describe_clusters.call_args[1]['clusters'], ['bar'])
+        self.assertIn(foo, clusters)
+        self.assertEqual(sorted(c.name for c in clusters), ['bar', 'foo'])
+        self.assertEqual(self.client.describe_clusters.call_count, 2)
+        self.assertEqual(len(again), 2)
+
+    def test_get_many_keeps_the_order_of_pks(self):
+        with IdentityMap():
+            Cluster.objects.get('bar')
+            clusters = Cluster.objects.get_many(['foo', 'bar', 'baz'])
+        self.assertEqual([c.name for c in clusters], ['foo', 'bar', 'baz'])
+        self.assertEqual(self.client.describe_clusters.call_args[1]['clusters'], ['foo', 'baz'])
+
+    def test_reload_from_db_bypasses_map(self):
+        with IdentityMap():
+            cluster = Cluster.objects.get('foo')
+            cluster.reload_from_db()
+            self.assertEqual(self.client.describe_clusters.call_count, 2)
+            self.assertIsNot(Cluster.objects.get('foo'), cluster)
+        self.assertEqual(self.client.describe_clusters.call_count, 2)
@@ -0,0 +1,73 @@
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.models import InvokedTask, TaskDefinition
+
+
+CLUSTER_ARN = 'arn:aws:ecs:us-west-2:123456789012:cluster/foobar-cluster'
+
+
+def task_data(i):
+    return {
+        'taskArn': f'arn:aws:ecs:us-west-2:123456789012:task/foobar-cluster/{i:032x}',
+        'clusterArn': CLUSTER_ARN,
+        'taskDefinitionArn': f'arn:aws:ecs:us-west-2:123456789012:task-definition/foobar:{i % 2}',
+        'containerInstanceArn': f'arn:aws:ecs:us-west-2:123456789012:container-instance/foobar-cluster/{i % 3}',
+    }
+
+
+def describe_tasks(cluster=None, tasks=None):
+    return {'tasks': [task_data(int(arn.rsplit('/', 1)[1], 16)) for arn in tasks], 'failures': []}
+
+
+def describe_container_instances(cluster=None, containerInstances=None):
+    return {'containerInstances': [{'containerInstanceArn': arn} for arn in containerInstances]}
+
+
+class TestInvokedTaskManager_list(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Mock()
+        self.client.describe_tasks.side_effect = describe_tasks
+        self.client.describe_container_instances.side_effect = describe_container_instances
+        arns = [task_data(i)['taskArn'] for i in range(250)]
+        paginator = Mock()
+        paginator.paginate.return_value = [
+            {'taskArns': arns[:100]},
+            {'taskArns': arns[100:200]},
+            {'taskArns': arns[200:]},
+        ]
+        self.client.get_paginator.return_value = paginator
+
+    def test_list_is_paginated_and_batched(self):
+        with Replacer() as r:
+            r('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+            tasks = InvokedTask.objects.list('foobar-cluster', prefetch=False)
+            self.assertEqual(len(tasks), 250)
+        self.assertEqual(self.client.describe_tasks.call_count, 3)
+        self.assertEqual(self.client.describe_container_instances.call_count, 0)
+
+    def test_prefetch_loads_related_objects_once(self):
+        td_get = Mock(side_effect=lambda arn: TaskDefinition({'family': 'foobar', 'taskDefinitionArn': arn}))
+        with Replacer() as r:
+            r('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+            r('deployfish.core.models.ecs.TaskDefinitionManager.get', td_get)
+            tasks = InvokedTask.objects.list('foobar-cluster')
+            self.assertEqual(len(tasks), 250)
+        self.assertEqual(td_get.call_count, 2)
+        self.assertEqual(self.client.describe_container_instances.call_count, 1)
+        for task in tasks:
+            self.assertEqual(task.cache['task_definition'].arn, task.data['taskDefinitionArn'])
+            self.assertEqual(task.cache['container_machine'].arn, task.data['containerInstanceArn'])
+
+    def test_iter_yields_each_page_as_it_arrives(self):
+        with Replacer() as r:
+            r('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+            tasks = iter(InvokedTask.objects.iter('foobar-cluster', prefetch=False))
+            first = next(tasks)
+            self.assertEqual(self.client.describe_tasks.call_count, 1)
+            self.assertEqual(first.arn, task_data(0)['taskArn'])
+            self.assertEqual(len(list(tasks)), 249)
+        self.assertEqual(self.client.describe_tasks.call_count, 3)
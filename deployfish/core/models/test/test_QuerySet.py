@@ -0,0 +1,125 @@
+import unittest
+
+from mock import Mock
+
+from deployfish.core.models import Manager, Model, QuerySet
+from deployfish.core.utils import run_async
+
+
+class Widget(Model):
+
+    @property
+    def pk(self):
+        return self.data['pk']
+
+    @property
+    def name(self):
+        return self.data['name']
+
+    @property
+    def size(self):
+        return self.data['size']
+
+
+class WidgetManager(Manager):
+
+    service = None
+    chunk_size = 10
+    pk_fields = {'pk': lambda pk: pk}
+
+    def __init__(self, count=25):
+        super().__init__()
+        self.pages = 0
+        self.count = count
+        self.get_many_mock = Mock(side_effect=lambda pks: [
+            Widget({'pk': pk, 'name': f'widget-{pk}', 'size': int(pk) % 3}) for pk in pks
+        ])
+
+    def iter_pks(self):
+        for page in range(0, self.count, 10):
+            self.pages += 1
+            for i in range(page, min(page + 10, self.count)):
+                yield str(i)
+
+    def get_many(self, pks, **_):
+        return self.get_many_mock(pks)
+
+    def iter(self, cache=False):
+        return QuerySet(self, pks=self.iter_pks, cache=cache)
+
+
+class TestQuerySet(unittest.TestCase):
+
+    def setUp(self):
+        self.manager = WidgetManager()
+
+    def test_is_lazy(self):
+        self.manager.iter()
+        self.assertEqual(self.manager.pages, 0)
+
+    def test_first_stops_early(self):
+        widget = self.manager.iter().first()
+        self.assertEqual(widget.pk, '0')
+        self.assertEqual(self.manager.pages, 1)
+        self.manager.get_many_mock.assert_called_once_with(['0'])
+
+    def test_slicing_hydrates_only_what_it_needs(self):
+        widgets = list(self.manager.iter()[12:15])
+        self.assertEqual([w.pk for w in widgets], ['12', '13', '14'])
+        self.assertEqual(self.manager.pages, 2)
+        self.assertEqual(self.manager.get_many_mock.call_args_list[-1][0][0], ['10', '11', '12', '13', '14'])
+        self.assertEqual(self.manager.iter()[3].pk, '3')
+        with self.assertRaises(IndexError):
+            self.manager.iter()[100]
+
+    def test_empty_slices_are_empty(self):
+        for cache in (False, True):
+            widgets = self.manager.iter(cache=cache)
+            self.assertEqual(list(widgets[:0]), [])
+            self.assertEqual(list(widgets[5:5]), [])
+            self.assertEqual(list(widgets[10:20][3:3]), [])
+            self.assertEqual(widgets[:0].count(), 0)
+            self.assertIsNone(widgets[:0].first())
+        self.manager.get_many_mock.assert_not_called()
+        self.assertEqual(self.manager.pages, 0)
+
+    def test_count_and_only_skip_hydration(self):
+        self.assertEqual(self.manager.iter().count(), 25)
+        self.assertEqual(self.manager.iter()[20:30].count(), 5)
+        self.assertEqual(list(self.manager.iter().only('pk')[:2]), [{'pk': '0'}, {'pk': '1'}])
+        self.manager.get_many_mock.assert_not_called()
+
+    def test_filter(self):
+        widgets = self.manager.iter().filter(lambda w: int(w.pk) > 5, size=0)
+        self.assertEqual([w.pk for w in widgets], ['6', '9', '12', '15', '18', '21', '24'])
+        self.assertEqual(widgets.count(), 7)
+        self.assertEqual(list(widgets.only('name')[:1]), [{'name': 'widget-6'}])
+
+    def test_chunked_hydration(self):
+        list(self.manager.iter().chunks(4))
+        self.assertEqual(
+            [len(call[0][0]) for call in self.manager.get_many_mock.call_args_list],
+            [4, 4, 4, 4, 4, 4, 1]
+        )
+
+    def test_cached_results_behave_like_a_list(self):
+        widgets = self.manager.iter(cache=True)
+        self.assertEqual(len(widgets), 25)
+        self.assertTrue(widgets)
+        self.assertEqual(widgets[-1].pk, '24')
+        self.assertEqual([w.pk for w in widgets[:2]], ['0', '1'])
+        self.assertEqual(self.manager.get_many_mock.call_count, 3)
+
+    def test_alist_hydrates_chunks_concurrently(self):
+        widgets = run_async(self.manager.iter().filter(size=0).alist())
+        self.assertEqual([w.pk for w in widgets], ['0', '3', '6', '9', '12', '15', '18', '21', '24'])
+        self.assertEqual(self.manager.get_many_mock.call_count, 3)
+
+    def test_concurrent_hydration_keeps_order(self):
+        self.manager.max_workers = 4
+        self.assertEqual([w.pk for w in self.manager.iter().chunks(3)], [str(i) for i in range(25)])
+        self.assertEqual(self.manager.get_many_mock.call_count, 9)
+        # slices still hydrate only what they need
+        self.manager.get_many_mock.reset_mock()
+        self.assertEqual(self.manager.iter().first().pk, '0')
+        self.manager.get_many_mock.assert_called_once_with(['0'])
@@ -0,0 +1,144 @@
+import unittest
+
+from botocore.exceptions import ClientError
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.aws import AdaptiveRateLimiter
+from deployfish.core.models import ExternalSecret, Secret, SecretsMixin
+
+
+def describe_parameters(ParameterFilters=None, MaxResults=None, NextToken=None):
+    names = ParameterFilters[0]['Values']
+    return {
+        'Parameters': [
+            {'Name': name, 'Type': 'SecureString', 'KeyId': 'alias/aws/ssm'}
+            for name in names if not name.endswith('missing')
+        ]
+    }
+
+
+def get_parameters(Names=None, WithDecryption=True):
+    return {
+        'Parameters': [
+            {'Name': name, 'ARN': f'arn:aws:ssm:us-west-2:123456789012:parameter/{name}', 'Value': 'value'}
+            for name in Names if not name.endswith('missing')
+        ],
+        'InvalidParameters': [name for name in Names if name.endswith('missing')]
+    }
+
+
+class TestSecretManager_get_many(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Mock()
+        self.client.describe_parameters.side_effect = describe_parameters
+        self.client.get_parameters.side_effect = get_parameters
+        self.client.exceptions.InvalidKeyId = type('InvalidKeyId', (Exception,), {})
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+        self.replacer(
+            'deployfish.core.models.secrets.SecretManager.limiters',
+            {
+                'get_parameters': AdaptiveRateLimiter(rate=10000),
+                'describe_parameters': AdaptiveRateLimiter(rate=10000),
+            }
+        )
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def test_batches(self):
+        names = [f'foobar-prod.task.VAR{i}' for i in range(150)]
+        secrets = Secret.objects.get_many(names)
+        self.assertEqual([s.pk for s in secrets], names)
+        self.assertEqual(self.client.get_parameters.call_count, 15)
+        self.assertEqual(self.client.describe_parameters.call_count, 3)
+        for call in self.client.describe_parameters.call_args_list:
+            self.assertEqual(call[1]['ParameterFilters'][0]['Option'], 'Equals')
+        self.assertEqual(secrets[0].value, 'value')
+
+    def test_missing_parameters_are_faked(self):
+        secrets = Secret.objects.get_many(['foobar-prod.task.FOO', 'foobar-prod.task.missing'])
+        self.assertEqual([s.pk for s in secrets], ['foobar-prod.task.FOO', 'foobar-prod.task.missing'])
+        self.assertFalse('Value' in secrets[1].data)
+
+
+def make_secret(name, value, model=Secret, **kwargs):
+    data = {
+        'Name': f'foobar-prod.task.{name}',
+        'Value': value,
+        'Type': 'String',
+        'Tier': 'Standard',
+        'DataType': 'text',
+    }
+    data.update(kwargs)
+    return model(data, name=name)
+
+
+class FakeTask(SecretsMixin):
+
+    secrets_prefix = 'foobar-prod.task.'
+
+    def __init__(self, secrets):
+        self.cache = {'secrets': {s.name: s for s in secrets}}
+
+
+class TestSecretsMixin_write_secrets(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Mock()
+        self.client.put_parameter.return_value = {'Version': 2}
+        live = [
+            make_secret('SAME', 'value', ARN='arn', Version=1),
+            make_secret('CHANGED', 'old', ARN='arn', Version=1),
+            make_secret('SECURE', 'secret', Type='SecureString', KeyId='alias/aws/ssm', ARN='arn', Version=1),
+            make_secret('GONE', 'value', ARN='arn', Version=1),
+        ]
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+        self.replacer('deployfish.core.models.secrets.SecretManager.list', Mock(return_value=live))
+        self.replacer(
+            'deployfish.core.models.secrets.SecretManager.limiters',
+            {
+                'put_parameter': AdaptiveRateLimiter(rate=10000),
+                'delete_parameters': AdaptiveRateLimiter(rate=10000),
+            }
+        )
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def test_only_changes_are_written(self):
+        task = FakeTask([
+            make_secret('SAME', 'value'),
+            make_secret('CHANGED', 'new'),
+            make_secret('SECURE', 'secret', Type='SecureString', KeyId=None),
+            make_secret('NEW', 'value'),
+            make_secret('EXTERNAL', 'value', model=ExternalSecret),
+        ])
+        task.write_secrets()
+        written = sorted(c[1]['Name'] for c in self.client.put_parameter.call_args_list)
+        self.assertEqual(written, ['foobar-prod.task.CHANGED', 'foobar-prod.task.NEW'])
+        self.client.delete_parameters.assert_called_once_with(Names=['foobar-prod.task.GONE'])
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+
+    def test_retries_throttled_calls(self):
+        throttled = ClientError({'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}}, 'GetParameters')
+        func = Mock(side_effect=[throttled, throttled, 'result'])
+        limiter = AdaptiveRateLimiter(rate=100)
+        with Replacer() as r:
+            r('deployfish.core.aws.time.sleep', Mock())
+            self.assertEqual(limiter.call(func), 'result')
+        self.assertEqual(func.call_count, 3)
+        self.assertEqual(limiter.throttles, 2)
+        self.assertLess(limiter.rate, 100)
+
+    def test_other_errors_are_raised(self):
+        error = ClientError({'Error': {'Code': 'AccessDeniedException', 'Message': 'Nope'}}, 'GetParameters')
+        limiter = AdaptiveRateLimiter(rate=100)
+        with self.assertRaises(ClientError):
+            limiter.call(Mock(side_effect=error))
+        self.assertEqual(limiter.throttles, 0)
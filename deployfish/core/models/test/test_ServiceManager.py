@@ -0,0 +1,197 @@
+import unittest
+
+from botocore.exceptions import ClientError
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.aws import AdaptiveRateLimiter
+from deployfish.core.models import Service
+from deployfish.core.utils import run_async
+
+
+def service_data(cluster, name):
+    return {
+        'serviceName': name,
+        'serviceArn': f'arn:aws:ecs:us-west-2:123456789012:service/{cluster}/{name}',
+        'clusterArn': f'arn:aws:ecs:us-west-2:123456789012:cluster/{cluster}',
+        'taskDefinition': f'arn:aws:ecs:us-west-2:123456789012:task-definition/{name[:4]}:1',
+        'status': 'ACTIVE',
+    }
+
+
+def describe_services(cluster=None, services=None, include=None):
+    return {'services': [service_data(cluster, arn.rsplit('/', 1)[-1]) for arn in services]}
+
+
+def describe_clusters(clusters=None, include=None):
+    return {
+        'clusters': [
+            {'clusterName': name, 'clusterArn': f'arn:aws:ecs:us-west-2:123456789012:cluster/{name}'}
+            for name in clusters
+        ]
+    }
+
+
+def describe_task_definition(taskDefinition=None, include=None):
+    family, revision = taskDefinition.rsplit('/', 1)[1].split(':')
+    return {
+        'taskDefinition': {
+            'family': family,
+            'revision': int(revision),
+            'taskDefinitionArn': taskDefinition,
+            'containerDefinitions': [{'name': family, 'image': f'{family}:1.2.3'}]
+        },
+        'tags': []
+    }
+
+
+def list_services(cluster=None, nextToken=None, **_):
+    # 15 services per cluster, in pages of 10
+    start = int(nextToken) if nextToken else 0
+    response = {
+        'serviceArns': [
+            f'arn:aws:ecs:us-west-2:123456789012:service/{cluster}/svc{i:02d}'
+            for i in range(start, min(start + 10, 15))
+        ]
+    }
+    if start + 10 < 15:
+        response['nextToken'] = str(start + 10)
+    return response
+
+
+class TestServiceManager(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Mock()
+        self.client.meta.region_name = 'us-west-2'
+        self.client.describe_services.side_effect = describe_services
+        self.client.describe_clusters.side_effect = describe_clusters
+        self.client.describe_task_definition.side_effect = describe_task_definition
+        self.client.list_clusters.return_value = {'clusterArns': [
+            'arn:aws:ecs:us-west-2:123456789012:cluster/foo',
+            'arn:aws:ecs:us-west-2:123456789012:cluster/bar',
+        ]}
+        self.client.list_services.side_effect = list_services
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+        self.replacer.in_environ('DEPLOYFISH_DISABLE_CACHE', 'true')
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def test_list_is_lazy(self):
+        services = Service.objects.list()
+        self.client.list_clusters.assert_not_called()
+        self.assertEqual(len(services), 30)
+        self.assertEqual(self.client.describe_services.call_count, 4)
+        # services are listed in the order of their clusters, however the listing was scheduled
+        self.assertEqual(services[0].pk, 'foo:svc00')
+        self.assertEqual(services[14].pk, 'foo:svc14')
+        self.assertEqual(services[15].pk, 'bar:svc00')
+        self.assertEqual(self.client.list_services.call_count, 4)
+
+    def test_first_describes_one_service(self):
+        service = Service.objects.iter(service_name='svc1*').first()
+        self.assertEqual(service.pk, 'foo:svc10')
+        self.client.describe_services.assert_called_once()
+        self.assertEqual(self.client.describe_services.call_args[1]['services'], [
+            'arn:aws:ecs:us-west-2:123456789012:service/foo/svc10'
+        ])
+
+    def test_count_and_names_need_no_describes(self):
+        self.assertEqual(Service.objects.iter(cluster_name='b*').count(), 15)
+        names = [row['name'] for row in Service.objects.iter().only('name')[:3]]
+        self.assertEqual(names, ['svc00', 'svc01', 'svc02'])
+        self.client.describe_services.assert_not_called()
+
+    def test_alist_prefetches_related_objects(self):
+        services = run_async(Service.objects.alist(cluster_name='foo'))
+        self.assertEqual(len(services), 15)
+        self.assertEqual(self.client.describe_services.call_count, 2)
+        self.client.describe_clusters.assert_called_once()
+        # one task definition for svc00-svc09, one for svc10-svc14
+        self.assertEqual(self.client.describe_task_definition.call_count, 2)
+        self.assertEqual(services[0].cluster.name, 'foo')
+        self.assertEqual(services[0].version, '1.2.3')
+        # the related objects came from the prefetch, not from new calls
+        self.client.describe_clusters.assert_called_once()
+        self.assertEqual(self.client.describe_task_definition.call_count, 2)
+
+    def test_iter_prefetches_related_objects_per_chunk(self):
+        services = Service.objects.iter(cluster_name='foo')
+        for service in services:
+            self.assertEqual(service.cluster.name, 'foo')
+            self.assertEqual(service.version, '1.2.3')
+        # one prefetch per chunk of 10 services, each describing its one cluster and one task definition
+        self.assertEqual(self.client.describe_services.call_count, 2)
+        self.assertEqual(self.client.describe_clusters.call_count, 2)
+        self.assertEqual(self.client.describe_task_definition.call_count, 2)
+
+    def test_get_many_batches_by_cluster(self):
+        pks = [f'foo:svc{i:02d}' for i in range(12)] + ['bar:svc00']
+        services = Service.objects.get_many(pks)
+        self.assertEqual([s.pk for s in services], pks)
+        self.assertEqual(
+            sorted((c[1]['cluster'], len(c[1]['services'])) for c in self.client.describe_services.call_args_list),
+            [('bar', 1), ('foo', 2), ('foo', 10)]
+        )
+
+    def test_throttled_describes_are_retried(self):
+        throttled = ClientError(
+            {'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}},
+            'DescribeServices'
+        )
+        calls = []
+
+        def flaky_describe_services(**kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise throttled
+            return describe_services(**kwargs)
+        self.client.describe_services.side_effect = flaky_describe_services
+        self.replacer('deployfish.core.aws.time.sleep', Mock())
+        self.replacer(
+            'deployfish.core.models.ecs.ServiceManager.limiters',
+            {name: AdaptiveRateLimiter(rate=10000) for name in ('list_clusters', 'list_services', 'describe_services')}
+        )
+        services = Service.objects.list(cluster_name='foo')
+        self.assertEqual(len(services), 15)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(Service.objects.limiters['describe_services'].throttles, 1)
+
+
+class TestServiceManager_restart_many(unittest.TestCase):
+
+    def setUp(self):
+        self.services = [
+            Service(dict(service_data('foo', name), cluster='foo')) for name in ('web', 'worker')
+        ]
+        self.events = []
+        tasks = {
+            'web': [self.task(f'web-{i}') for i in range(3)],
+            'worker': [self.task('worker-0')],
+        }
+        self.replacer = Replacer()
+        self.replacer(
+            'deployfish.core.models.ecs.InvokedTaskManager.list',
+            Mock(side_effect=lambda cluster, service=None, prefetch=True: tasks[service])
+        )
+        self.waiter = self.replacer('deployfish.core.models.ecs.ServiceFleetWaiter', Mock())
+        self.waiter.return_value.wait.side_effect = lambda: self.events.append('wait')
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def task(self, name):
+        task = Mock()
+        task.delete.side_effect = lambda: self.events.append(name)
+        return task
+
+    def test_rolling_restart_stops_one_task_per_service_per_round(self):
+        Service.objects.restart_many(self.services)
+        self.assertEqual(self.events, ['web-0', 'worker-0', 'wait', 'web-1', 'wait', 'web-2', 'wait'])
+        self.assertEqual(self.waiter.call_args[0][0], ['foo:web', 'foo:worker'])
+
+    def test_hard_restart_waits_once(self):
+        Service.objects.restart_many(self.services, hard=True)
+        self.assertEqual(self.events, ['web-0', 'web-1', 'web-2', 'worker-0', 'wait'])
@@ -0,0 +1,76 @@
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.models import EventScheduleRule, EventTarget, StandaloneTask, TaskDefinition
+
+
+def get_task_definition(pk):
+    family = pk.split(':')[0]
+    return TaskDefinition(
+        {
+            'family': family,
+            'revision': 3,
+            'taskDefinitionArn': f'arn:aws:ecs:us-west-2:123456789012:task-definition/{family}:3',
+            'tags': [
+                {'key': 'deployfish:type', 'value': 'standalone'},
+                {'key': 'deployfish:task-name', 'value': family},
+                {'key': 'deployfish:cluster', 'value': 'foobar-cluster'},
+            ]
+        },
+        containers=[]
+    )
+
+
+def make_rule(family, revision):
+    rule = EventScheduleRule({'Name': f'deployfish-{family}', 'ScheduleExpression': 'cron(0 * * * ? *)'})
+    rule.target = EventTarget(
+        {
+            'Id': f'deployfish-{family}',
+            'EcsParameters': {
+                'TaskDefinitionArn': f'arn:aws:ecs:us-west-2:123456789012:task-definition/{family}:{revision}'
+            }
+        },
+        rule=rule
+    )
+    return rule
+
+
+class TestStandaloneTaskManager_hydrate(unittest.TestCase):
+
+    def setUp(self):
+        self.td_get = Mock(side_effect=get_task_definition)
+        self.rule_get = Mock(side_effect=EventScheduleRule.DoesNotExist)
+        self.rules = {
+            'deployfish-foo': make_rule('foo', 3),
+            'deployfish-bar': make_rule('bar', 2),
+        }
+
+    def test_duplicate_pks_are_described_once(self):
+        with Replacer() as r:
+            r('deployfish.core.models.ecs.TaskDefinitionManager.get', self.td_get)
+            r('deployfish.core.models.events.EventScheduleRuleManager.get', self.rule_get)
+            tasks = StandaloneTask.objects.hydrate(['foo', 'bar', 'foo'])
+        self.assertEqual([t.family for t in tasks], ['foo', 'bar'])
+        self.assertEqual(self.td_get.call_count, 2)
+        self.assertEqual(self.rule_get.call_count, 2)
+
+    def test_schedules_are_joined_in_memory(self):
+        with Replacer() as r:
+            r('deployfish.core.models.ecs.TaskDefinitionManager.get', self.td_get)
+            r('deployfish.core.models.events.EventScheduleRuleManager.get', self.rule_get)
+            tasks = StandaloneTask.objects.hydrate(['foo', 'bar', 'baz'], rules=self.rules)
+        self.assertEqual(self.rule_get.call_count, 0)
+        schedules = {t.family: t.schedule for t in tasks}
+        self.assertIs(schedules['foo'], self.rules['deployfish-foo'])
+        # bar's schedule runs an older revision than the one we loaded
+        self.assertIsNone(schedules['bar'])
+        self.assertIsNone(schedules['baz'])
+
+    def test_missing_task_definition(self):
+        self.td_get.side_effect = TaskDefinition.DoesNotExist
+        with Replacer() as r:
+            r('deployfish.core.models.ecs.TaskDefinitionManager.get', self.td_get)
+            with self.assertRaises(StandaloneTask.DoesNotExist):
+                StandaloneTask.objects.hydrate(['foo', 'bar'], rules={})
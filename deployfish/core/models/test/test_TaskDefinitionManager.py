@@ -0,0 +1,57 @@
+import shutil
+import tempfile
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.models import TaskDefinition
+
+
+ARN = 'arn:aws:ecs:us-west-2:123456789012:task-definition/foobar:42'
+
+
+class TestTaskDefinitionManager_cache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.replacer = Replacer()
+        self.replacer.in_environ('DEPLOYFISH_CACHE_DIR', self.tmpdir)
+        self.replacer.in_environ('DEPLOYFISH_DISABLE_CACHE', 'false')
+        self.client = Mock()
+        self.client.meta.region_name = 'us-west-2'
+        self.client.describe_task_definition.side_effect = lambda **kwargs: {
+            'taskDefinition': {
+                'family': 'foobar',
+                'revision': 42,
+                'taskDefinitionArn': ARN,
+                'containerDefinitions': [{'name': 'foobar', 'image': 'foobar:1.0.0'}]
+            },
+            'tags': [],
+            'ResponseMetadata': {}
+        }
+        self.replacer('deployfish.core.models.abstract.get_boto3_client', Mock(return_value=self.client))
+        self.replacer('deployfish.core.models.ecs.get_aws_account_id', Mock(return_value='123456789012'))
+
+    def tearDown(self):
+        self.replacer.restore()
+        shutil.rmtree(self.tmpdir)
+
+    def test_cache_key(self):
+        objects = TaskDefinition.objects
+        self.assertEqual(objects.cache_key(ARN), '123456789012:us-west-2:foobar:42')
+        self.assertEqual(objects.cache_key('foobar:42'), '123456789012:us-west-2:foobar:42')
+        self.assertIsNone(objects.cache_key('foobar'))
+        self.assertIsNone(objects.cache_key('arn:aws:ecs:us-west-2:123456789012:task-definition/foobar'))
+
+    def test_revisions_are_cached(self):
+        first = TaskDefinition.objects.get(ARN)
+        second = TaskDefinition.objects.get('foobar:42')
+        self.assertEqual(self.client.describe_task_definition.call_count, 1)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(second.containers[0].name, 'foobar')
+
+    def test_families_are_not_cached(self):
+        TaskDefinition.objects.get('foobar')
+        TaskDefinition.objects.get('foobar')
+        self.assertEqual(self.client.describe_task_definition.call_count, 2)
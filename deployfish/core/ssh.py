@@ -1,9 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 from io import IOBase
 import os
 import random
 import signal
+import stat
 import subprocess
-from typing import Dict, Type, Any, Tuple, TYPE_CHECKING, Optional, cast, Sequence, Callable
+import tempfile
+import threading
+import time
+from typing import Dict, List, Set, Type, Any, Tuple, TYPE_CHECKING, Optional, cast, Sequence, Callable
 
 import shellescape
 
@@ -51,6 +57,133 @@ def build_sigint_handler(p: subprocess.Popen) -> Callable:
     return sigint_handler
 
 
+class SSHMultiplexer:
+    """
+    Share one ssh connection per destination among all the ssh commands we run
+    during a deployfish session, using OpenSSH's ``ControlMaster`` feature.
+
+    The first ssh command to a destination becomes the master connection and
+    leaves a control socket in :py:attr:`control_dir`.  Later commands to the
+    same destination run as new channels over that connection, skipping the TCP
+    and key exchange handshakes.  A master exits after it has been idle for
+    ``ttl`` seconds, and :py:meth:`close` shuts down the masters we started
+    when deployfish exits.
+
+    This is off by default.  Turn it on in the ``ssh`` section of the
+    ``deployfish`` section of ``deployfish.yml``::
+
+        deployfish:
+          ssh:
+            multiplex: true
+            multiplex_ttl: 300
+
+    or with ``DEPLOYFISH_SSH_MULTIPLEX=true`` (and optionally
+    ``DEPLOYFISH_SSH_MULTIPLEX_TTL``) in the environment.
+
+    Anyone who can write to :py:attr:`control_dir` could plant a control socket
+    there and take over our ssh sessions, so we refuse to use it unless it is a
+    directory owned by us with mode ``0700``.
+
+    Keyword Args:
+        ttl: close an idle master connection after this many seconds
+        control_dir: keep our control sockets in this directory
+    """
+
+    class UnsafeControlDir(Exception):
+        pass
+
+    def __init__(self, ttl: int = 600, control_dir: str = None) -> None:
+        self.ttl = ttl
+        if not control_dir:
+            # Unix socket paths are limited to ~100 characters, so stay short
+            control_dir = os.path.join(tempfile.gettempdir(), f'deployfish-ssh-{os.getuid()}')
+        self.control_dir = control_dir
+        #: The control sockets for the destinations we've used
+        self.sockets: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def make_control_dir(self) -> None:
+        """
+        Create :py:attr:`control_dir` if necessary, and make sure that nobody
+        else can use it.
+
+        Raises:
+            SSHMultiplexer.UnsafeControlDir: :py:attr:`control_dir` is not a
+                directory, is owned by someone else, or is open to other users
+        """
+        # Nobody else should be able to use our connections
+        os.makedirs(self.control_dir, mode=0o700, exist_ok=True)
+        # makedirs() happily accepts a directory someone else created first, so check what we actually got
+        st = os.lstat(self.control_dir)
+        if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) != 0o700:
+            raise self.UnsafeControlDir(
+                f'Refusing to use {self.control_dir} for ssh control sockets: it must be a directory owned by '
+                'you with mode 0700.  Remove it, or turn off ssh multiplexing.'
+            )
+
+    def socket_path(self, destination: str) -> str:
+        digest = hashlib.sha1(destination.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.control_dir, digest)
+
+    def options(self, destination: str) -> str:
+        """
+        Return the ssh options that make an ssh command to ``destination`` use
+        our shared connection to it, creating that connection if necessary.
+        """
+        path = self.socket_path(destination)
+        with self._lock:
+            if not self.sockets:
+                self.make_control_dir()
+            self.sockets.add(path)
+        return f'-o ControlMaster=auto -o ControlPath={path} -o ControlPersist={self.ttl}'
+
+    def close(self) -> None:
+        """
+        Tell the master connections for all the destinations we've used to exit.
+        """
+        with self._lock:
+            sockets, self.sockets = self.sockets, set()
+        for path in sockets:
+            if os.path.exists(path):
+                # The destination here is just a placeholder: ssh only uses the socket
+                subprocess.call(
+                    ['ssh', '-o', f'ControlPath={path}', '-O', 'exit', 'deployfish'],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL
+                )
+
+
+#: The multiplexer for this session, once we've looked at our config.  See :py:func:`get_ssh_multiplexer`.
+_multiplexer: Optional[SSHMultiplexer] = None
+_multiplexer_configured: bool = False
+
+
+def get_ssh_multiplexer() -> Optional[SSHMultiplexer]:
+    """
+    Return the :py:class:`SSHMultiplexer` for this session, or ``None`` if
+    multiplexing is not turned on.
+    """
+    global _multiplexer, _multiplexer_configured  # pylint:disable=global-statement
+    if not _multiplexer_configured:
+        try:
+            ssh_config = get_config().get_global_config('ssh')
+        except ConfigProcessingFailed:
+            ssh_config = {}
+        if str(ssh_config.get('multiplex', 'false')).lower() == 'true':
+            _multiplexer = SSHMultiplexer(ttl=int(ssh_config.get('multiplex_ttl', 600)))
+        _multiplexer_configured = True
+    return _multiplexer
+
+
+def close_ssh_multiplexer() -> None:
+    """
+    Shut down the master connections of our :py:class:`SSHMultiplexer`, if we have one.
+    """
+    if _multiplexer:
+        _multiplexer.close()
+
+
 class AbstractSSHProvider:
     """
     Abstract class that provides the methods that ``SSHMixin`` will use to
@@ -74,6 +207,20 @@ class AbstractSSHProvider:
         #: If the caller specified ``verbose=True``, we send SSH the ``-vv`` flag.
         self.ssh_verbose_flag = '-vv' if verbose else ''
 
+    def multiplex_flags(self, destination: str) -> str:
+        """
+        Return the ssh flags for sharing our connection to ``destination``
+        with other commands, or ``''`` if we shouldn't.
+
+        We don't multiplex in verbose mode: a master connection with debug
+        logging on keeps our stderr open after it backgrounds itself, which
+        would hang callers waiting on our output.
+        """
+        multiplexer = get_ssh_multiplexer()
+        if multiplexer is None or self.ssh_verbose_flag:
+            return ''
+        return multiplexer.options(destination)
+
     def ssh(self, command: str = None) -> str:
         """
         Return a shell command suitable for establish an interactive ssh session.
@@ -160,6 +307,9 @@ class SSMSSHProvider(AbstractSSHProvider):
         ssh_target = self.instance.pk
         if profile_name:
             ssh_target = f'{self.instance.pk}.{profile_name}'
+        mux = self.multiplex_flags(f'ec2-user@{ssh_target}')
+        if mux:
+            flags = f'{flags} {mux}'
         return 'ssh -t {} ec2-user@{} {}'.format(flags, ssh_target, shellescape.quote(command))
 
     def tunnel(self, local_port: int, target_host: str, host_port: int) -> str:
@@ -205,6 +355,10 @@ class BastionSSHProvider(AbstractSSHProvider):
         )
         if not self.instance.bastion:
             raise ValueError('No bastion host found')
+        # Only our hop to the bastion can be multiplexed: the hop from the bastion to our instance runs on the bastion
+        mux = self.multiplex_flags(f'ec2-user@{self.instance.bastion.hostname}')
+        if mux:
+            flags = f'{flags} {mux}'
         cmd = "ssh {flags} -o StrictHostKeyChecking=no -A -t ec2-user@{bastion} {hop2}".format(
             flags=flags,
             hop2=shellescape.quote(hop2),
@@ -241,6 +395,152 @@ class BastionSSHProvider(AbstractSSHProvider):
         return 'cat > {}'.format(filename)
 
 
+class SSHCommandResult:
+    """
+    The outcome of running a command on a single instance with :py:class:`SSHFanout`.
+
+    Args:
+        target: the instance we ran the command on
+    """
+
+    def __init__(self, target: "Instance") -> None:
+        self.target = target
+        #: The exit status of our ssh process, or ``None`` if it never finished
+        self.returncode: Optional[int] = None
+        #: Every line of output (stdout and stderr), without the trailing newlines
+        self.lines: List[str] = []
+        #: ``True`` if we killed the command because it ran too long
+        self.timed_out: bool = False
+        #: If we couldn't run ssh at all, why not
+        self.error: Optional[str] = None
+        #: How long the command took, in seconds
+        self.duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and not self.error
+
+    @property
+    def output(self) -> str:
+        return '\n'.join(self.lines)
+
+    @property
+    def status(self) -> str:
+        if self.error:
+            return 'error'
+        if self.timed_out:
+            return 'timeout'
+        return 'ok' if self.returncode == 0 else f'exit {self.returncode}'
+
+
+class SSHFanout:
+    """
+    Run a single command via ssh on many instances at once, with at most
+    ``max_workers`` ssh sessions at a time.
+
+    We read each host's output a line at a time.  If given, we call
+    ``on_line(target, line)`` for every line as it arrives and
+    ``on_done(result)`` as each host finishes.  Both are called while holding a
+    lock, so whatever they print is never interleaved mid-line with output from
+    another host, and ``on_done`` can print a host's entire output as one
+    block.
+
+    If a host's command runs longer than ``timeout`` seconds, we kill its ssh
+    session and mark its result as timed out.
+
+    Args:
+        command: the shell command to run on each instance
+
+    Keyword Args:
+        max_workers: run at most this many ssh sessions at once
+        timeout: kill any ssh session that runs longer than this many seconds
+        verbose: if ``True``, use the verbose flags for ssh
+        on_line: call this with each line of output from each host
+        on_done: call this with each host's :py:class:`SSHCommandResult` as it finishes
+    """
+
+    def __init__(
+        self,
+        command: str,
+        max_workers: int = 10,
+        timeout: float = None,
+        verbose: bool = False,
+        on_line: Callable[["Instance", str], None] = None,
+        on_done: Callable[[SSHCommandResult], None] = None
+    ) -> None:
+        self.command = command
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.verbose = verbose
+        self.on_line = on_line
+        self.on_done = on_done
+        self.lock = threading.Lock()
+
+    def ssh_command(self, target: "Instance") -> str:
+        provider = target.providers[target.ssh_proxy_type](target, verbose=self.verbose)
+        return provider.ssh_command(self.command)
+
+    def run_one(self, target: "Instance") -> SSHCommandResult:
+        """
+        Run our command on ``target`` and wait for it to finish.
+        """
+        result = SSHCommandResult(target)
+        start = time.monotonic()
+        try:
+            p = subprocess.Popen(
+                self.ssh_command(target),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                shell=True,
+                universal_newlines=True,
+                # Give ssh its own process group, so that we can kill it and
+                # everything it started if it times out
+                start_new_session=True
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            result.error = str(e)
+            result.lines.append(str(e))
+        else:
+            timer = None
+            if self.timeout:
+                def kill() -> None:
+                    result.timed_out = True
+                    try:
+                        os.killpg(p.pid, signal.SIGKILL)
+                    except OSError:
+                        pass
+                timer = threading.Timer(self.timeout, kill)
+                timer.daemon = True
+                timer.start()
+            for line in cast(IOBase, p.stdout):
+                line = line.rstrip('\n')
+                result.lines.append(line)
+                if self.on_line:
+                    with self.lock:
+                        self.on_line(target, line)
+            result.returncode = p.wait()
+            if timer:
+                timer.cancel()
+        result.duration = time.monotonic() - start
+        if self.on_done:
+            with self.lock:
+                self.on_done(result)
+        return result
+
+    def run(self, targets: Sequence["Instance"]) -> List[SSHCommandResult]:
+        """
+        Run our command on all of ``targets``.
+
+        Returns:
+            The results for each of ``targets``, in the same order.
+        """
+        if not targets:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(targets))) as executor:
+            return list(executor.map(self.run_one, targets))
+
+
 class SSHMixin(SupportsCache, SupportsModel):
 
     providers: Dict[str, Type[AbstractSSHProvider]] = {
@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from deployfish.core.aws import AsyncAWSExecutor
+from deployfish.core.utils import run_async
+
+
+class TestAsyncAWSExecutor(unittest.TestCase):
+
+    def setUp(self):
+        self.executor = AsyncAWSExecutor(max_workers=8, limits={'ecs': 2})
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def call(self, value):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return value * 2
+
+    def test_results_are_returned_in_order(self):
+        async def main():
+            return await asyncio.gather(*[self.executor.run('ssm', self.call, i) for i in range(6)])
+        self.assertEqual(run_async(main()), [0, 2, 4, 6, 8, 10])
+        self.assertGreater(self.max_running, 2)
+
+    def test_per_service_limit(self):
+        async def main():
+            return await asyncio.gather(*[self.executor.run('ecs', self.call, i) for i in range(6)])
+        run_async(main())
+        self.assertEqual(self.max_running, 2)
+
+    def test_can_be_used_from_several_event_loops(self):
+        async def main():
+            return await self.executor.run('ecs', self.call, 1)
+        self.assertEqual(run_async(main()), 2)
+        self.assertEqual(run_async(main()), 2)
@@ -0,0 +1,59 @@
+import unittest
+from mock import Mock
+
+from botocore.config import Config as BotocoreConfig
+
+from deployfish.core.aws import Boto3ClientPool
+
+
+class TestBoto3ClientPool(unittest.TestCase):
+
+    def setUp(self):
+        self.pool = Boto3ClientPool()
+        self.session = Mock()
+        self.session.region_name = 'us-west-2'
+        self.session.client.side_effect = lambda *args, **kwargs: Mock()
+
+    def test_client_is_reused(self):
+        first = self.pool.get(self.session, 'ecs')
+        second = self.pool.get(self.session, 'ecs')
+        self.assertIs(first, second)
+        self.assertEqual(self.session.client.call_count, 1)
+        self.assertEqual(self.pool.stats()['built'], 1)
+        self.assertEqual(self.pool.stats()['reused'], 1)
+
+    def test_different_services_get_different_clients(self):
+        ecs = self.pool.get(self.session, 'ecs')
+        ssm = self.pool.get(self.session, 'ssm')
+        self.assertIsNot(ecs, ssm)
+        self.assertEqual(self.pool.stats()['built'], 2)
+
+    def test_region_is_part_of_key(self):
+        default = self.pool.get(self.session, 'ecs')
+        other = self.pool.get(self.session, 'ecs', region_name='us-east-1')
+        self.assertIsNot(default, other)
+        self.assertIs(default, self.pool.get(self.session, 'ecs', region_name='us-west-2'))
+
+    def test_equal_configs_share_a_client(self):
+        first = self.pool.get(self.session, 'ecs', config=BotocoreConfig(retries={'max_attempts': 10}))
+        second = self.pool.get(self.session, 'ecs', config=BotocoreConfig(retries={'max_attempts': 10}))
+        third = self.pool.get(self.session, 'ecs', config=BotocoreConfig(retries={'max_attempts': 3}))
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+
+    def test_invalidate(self):
+        first = self.pool.get(self.session, 'ecs')
+        self.pool.invalidate()
+        second = self.pool.get(self.session, 'ecs')
+        self.assertIsNot(first, second)
+        self.assertEqual(self.pool.stats()['invalidations'], 1)
+
+    def test_invalidate_one_session(self):
+        other_session = Mock()
+        other_session.region_name = 'us-west-2'
+        other_session.client.side_effect = lambda *args, **kwargs: Mock()
+        first = self.pool.get(self.session, 'ecs')
+        other = self.pool.get(other_session, 'ecs')
+        self.pool.invalidate(session=other_session)
+        self.assertIs(first, self.pool.get(self.session, 'ecs'))
+        self.assertIsNot(other, self.pool.get(other_session, 'ecs'))
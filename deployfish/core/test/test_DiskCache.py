@@ -0,0 +1,68 @@
+import datetime
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from testfixtures import Replacer
+
+from deployfish.core.cache import DiskCache
+
+
+class TestDiskCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.replacer = Replacer()
+        self.replacer.in_environ('DEPLOYFISH_CACHE_DIR', self.tmpdir)
+        self.replacer.in_environ('DEPLOYFISH_DISABLE_CACHE', 'false')
+
+    def tearDown(self):
+        self.replacer.restore()
+        shutil.rmtree(self.tmpdir)
+
+    def test_roundtrip(self):
+        cache = DiskCache('test')
+        value = {
+            'foo': [1, 2, 3],
+            'registeredAt': datetime.datetime(2023, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc)
+        }
+        cache.set('key', value)
+        self.assertEqual(cache.get('key'), value)
+        self.assertEqual(cache.hits, 1)
+
+    def test_miss(self):
+        cache = DiskCache('test')
+        self.assertIsNone(cache.get('nope'))
+        self.assertEqual(cache.misses, 1)
+
+    def test_disabled(self):
+        self.replacer.in_environ('DEPLOYFISH_DISABLE_CACHE', 'true')
+        cache = DiskCache('test')
+        cache.set('key', 'value')
+        self.assertIsNone(cache.get('key'))
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, 'test')))
+
+    def test_ttl(self):
+        cache = DiskCache('test', ttl=60)
+        cache.set('key', 'value')
+        self.assertEqual(cache.get('key'), 'value')
+        later = time.time() + 61
+        with Replacer() as r:
+            r('deployfish.core.cache.time.time', lambda: later)
+            self.assertIsNone(cache.get('key'))
+
+    def test_lru_eviction(self):
+        cache = DiskCache('test', max_bytes=300)
+        for i in range(3):
+            cache.set(f'key{i}', 'x' * 50)
+            # make sure our mtimes differ
+            path = cache._filename(f'key{i}')
+            os.utime(path, (i, i))
+        # touch key0 so that key1 is now the least recently used
+        self.assertIsNotNone(cache.get('key0'))
+        cache.set('key3', 'x' * 50)
+        self.assertIsNone(cache.get('key1'))
+        self.assertEqual(cache.get('key0'), 'x' * 50)
+        self.assertEqual(cache.get('key3'), 'x' * 50)
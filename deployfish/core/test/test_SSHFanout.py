@@ -0,0 +1,51 @@
+import time
+import unittest
+
+from mock import Mock
+
+from deployfish.core.ssh import SSHFanout
+
+
+def target(name):
+    t = Mock()
+    t.pk = f'i-{name}'
+    t.name = name
+    return t
+
+
+class LocalFanout(SSHFanout):
+    """
+    Run each target's "command" locally instead of over ssh: the target's name
+    is the shell command to run.
+    """
+
+    def ssh_command(self, target):
+        return target.name
+
+
+class TestSSHFanout(unittest.TestCase):
+
+    def test_results_and_statuses(self):
+        lines = []
+        targets = [target("printf 'a\\nb\\n'"), target('echo oops; exit 3'), target('sleep 5')]
+        fanout = LocalFanout('unused', timeout=0.5, on_line=lambda t, line: lines.append((t.pk, line)))
+        results = fanout.run(targets)
+        self.assertEqual([r.target for r in results], targets)
+        self.assertEqual(results[0].lines, ['a', 'b'])
+        self.assertTrue(results[0].success)
+        self.assertEqual(results[1].status, 'exit 3')
+        self.assertEqual(results[2].status, 'timeout')
+        self.assertLess(results[2].duration, 5)
+        self.assertIn((targets[1].pk, 'oops'), lines)
+
+    def test_hosts_run_concurrently(self):
+        targets = [target('sleep 0.5') for _ in range(4)]
+        start = time.monotonic()
+        results = LocalFanout('unused', max_workers=4).run(targets)
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertTrue(all(r.success for r in results))
+
+    def test_on_done_sees_whole_output(self):
+        blocks = []
+        LocalFanout('unused', on_done=lambda r: blocks.append(r.output)).run([target('echo one; echo two')])
+        self.assertEqual(blocks, ['one\ntwo'])
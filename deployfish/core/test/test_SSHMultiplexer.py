@@ -0,0 +1,78 @@
+import os
+import shutil
+import stat
+import tempfile
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.ssh import SSHMultiplexer, SSMSSHProvider
+
+
+class FakeInstance:
+
+    pk = 'i-1234567890'
+
+
+FakeInstance.__name__ = 'Instance'
+
+
+class TestSSHMultiplexer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.control_dir = os.path.join(self.tmpdir, 'control')
+        self.multiplexer = SSHMultiplexer(ttl=30, control_dir=self.control_dir)
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.ssh.get_ssh_multiplexer', Mock(return_value=self.multiplexer))
+        session = Mock()
+        session.profile_name = None
+        self.replacer('deployfish.core.ssh.get_boto3_session', Mock(return_value=session))
+
+    def tearDown(self):
+        self.replacer.restore()
+        shutil.rmtree(self.tmpdir)
+
+    def test_options(self):
+        options = self.multiplexer.options('ec2-user@bastion')
+        path = self.multiplexer.socket_path('ec2-user@bastion')
+        self.assertIn(f'ControlPath={path}', options)
+        self.assertIn('ControlPersist=30', options)
+        self.assertNotEqual(path, self.multiplexer.socket_path('ec2-user@other'))
+        self.assertEqual(stat.S_IMODE(os.stat(self.control_dir).st_mode), 0o700)
+
+    def test_refuses_control_dir_open_to_others(self):
+        os.mkdir(self.control_dir, 0o700)
+        os.chmod(self.control_dir, 0o777)
+        with self.assertRaises(SSHMultiplexer.UnsafeControlDir):
+            self.multiplexer.options('ec2-user@bastion')
+        self.assertEqual(self.multiplexer.sockets, set())
+
+    def test_refuses_control_dir_owned_by_others(self):
+        os.mkdir(self.control_dir, 0o700)
+        self.replacer('deployfish.core.ssh.os.getuid', Mock(return_value=os.getuid() + 1))
+        with self.assertRaises(SSHMultiplexer.UnsafeControlDir):
+            self.multiplexer.options('ec2-user@bastion')
+
+    def test_refuses_symlinked_control_dir(self):
+        target = os.path.join(self.tmpdir, 'elsewhere')
+        os.mkdir(target, 0o700)
+        os.symlink(target, self.control_dir)
+        with self.assertRaises(SSHMultiplexer.UnsafeControlDir):
+            self.multiplexer.options('ec2-user@bastion')
+
+    def test_provider_uses_multiplexer(self):
+        cmd = SSMSSHProvider(FakeInstance()).ssh('docker ps')
+        self.assertIn(f"ControlPath={self.multiplexer.socket_path('ec2-user@i-1234567890')}", cmd)
+        self.assertNotIn('ControlPath', SSMSSHProvider(FakeInstance(), verbose=True).ssh('docker ps'))
+
+    def test_close_only_touches_live_sockets(self):
+        self.multiplexer.options('ec2-user@bastion')
+        self.multiplexer.options('ec2-user@gone')
+        open(self.multiplexer.socket_path('ec2-user@bastion'), 'w').close()
+        call = self.replacer('deployfish.core.ssh.subprocess.call', Mock())
+        self.multiplexer.close()
+        call.assert_called_once()
+        self.assertIn(f"ControlPath={self.multiplexer.socket_path('ec2-user@bastion')}", call.call_args[0][0])
+        self.assertEqual(self.multiplexer.sockets, set())
@@ -1,8 +1,103 @@
-from typing import Optional
+import asyncio
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Deque, Iterable, Iterator, List, Optional
 import re
 
 
+#: The default size of the thread pool used by :py:func:`concurrent_map`
+DEFAULT_MAX_WORKERS: int = 8
+
+
 def is_fnmatch_filter(f: Optional[str]) -> bool:
     if f is not None and re.search(r'[\[?*]', f):
         return True
     return False
+
+
+def concurrent_map(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = DEFAULT_MAX_WORKERS
+) -> List[Any]:
+    """
+    Call ``func`` on each of ``items`` using a bounded pool of threads, and
+    return the results in the same order as ``items``.  If any call raises an
+    exception, that exception is re-raised here.
+
+    This is meant for fanning out independent, I/O bound boto3 calls.  boto3
+    clients are thread-safe, so it's fine for ``func`` to use ``Manager.client``.
+
+    Args:
+        func: the callable to call on each item
+        items: the things to call ``func`` on
+
+    Keyword Args:
+        max_workers: use at most this many threads
+
+    Returns:
+        The list of results of ``func(item)`` for each item in ``items``.
+    """
+    items = list(items)
+    if len(items) <= 1 or max_workers <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
+
+
+def concurrent_imap(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    window: int = None
+) -> Iterator[Any]:
+    """
+    Like :py:func:`concurrent_map`, but yield the results one at a time, in the
+    same order as ``items``, as soon as each is ready and all the results
+    before it have been yielded.
+
+    At most ``window`` calls are in flight or finished-but-not-yet-yielded at
+    once, so memory use stays bounded no matter how many ``items`` there are
+    or how big each result is.
+
+    Args:
+        func: the callable to call on each item
+        items: the things to call ``func`` on
+
+    Keyword Args:
+        max_workers: use at most this many threads
+        window: keep at most this many results pending.  Defaults to
+            ``2 * max_workers``.
+
+    Yields:
+        The result of ``func(item)`` for each item in ``items``.
+    """
+    if window is None:
+        window = 2 * max_workers
+    pending: Deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # If we're abandoned or ``func`` raised, don't start anything else
+            for future in pending:
+                future.cancel()
+
+
+def run_async(awaitable: Awaitable[Any]) -> Any:
+    """
+    Run ``awaitable`` to completion in a new event loop and return its result.
+
+    This is how synchronous code -- a cement controller, say -- drives the
+    ``Manager.aget``, ``Manager.aget_many`` and ``Manager.alist`` coroutines:
+    build one coroutine that does all the work, e.g. with
+    ``asyncio.gather()``, and run it here.
+    """
+    async def runner() -> Any:
+        return await awaitable
+    return asyncio.run(runner())
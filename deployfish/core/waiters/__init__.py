@@ -9,6 +9,8 @@ from botocore.waiter import NormalizedOperationMethod
 
 from botocore.exceptions import WaiterError
 
+from .polling import AdaptivePolling, FixedDelayPolling, PollingStrategy  # noqa:F401
+
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +77,11 @@ class HookedWaiter:
     To use hooks on each iteration of our waiting, pass a kwarg named `WaiterHooks`
     to waiter.wait().
 
+    To control how often we poll and when we give up, pass a
+    :py:class:`deployfish.core.waiters.polling.PollingStrategy` as a kwarg named
+    `WaiterPolling`.  By default we behave like a boto3 Waiter: we sleep `Delay`
+    seconds between polls and give up after `MaxAttempts` polls.
+
     `WaiterHooks` is should be a list of callables with this prototype:
 
         waiter_hook(state, response, num_attempts, **kwargs)
@@ -126,6 +133,10 @@ class HookedWaiter:
         hooks = kwargs.pop('WaiterHooks', [])
         sleep_amount = config.get('Delay', self.config.delay)
         max_attempts = config.get('MaxAttempts', self.config.max_attempts)
+        polling = kwargs.pop('WaiterPolling', None)
+        if polling is None:
+            polling = FixedDelayPolling(sleep_amount, max_attempts)
+        polling.start()
         # ------------------------------
         # Build our hook kwargs
         # ------------------------------
@@ -133,6 +144,8 @@ class HookedWaiter:
         hook_kwargs['config'] = self.config
         if 'WaiterHooks' in hook_kwargs:
             del hook_kwargs['WaiterHooks']
+        if 'WaiterPolling' in hook_kwargs:
+            del hook_kwargs['WaiterPolling']
         if 'MaxAttempts' not in hook_kwargs:
             hook_kwargs['MaxAttempts'] = max_attempts
         if 'Delay' not in hook_kwargs:
@@ -144,6 +157,7 @@ class HookedWaiter:
         while True:
             response = self._operation_method(**kwargs)
             num_attempts += 1
+            polling.observe(response)
             for acceptor in acceptors:
                 if acceptor.matcher_func(response):
                     last_matched_acceptor = acceptor
@@ -190,7 +204,8 @@ class HookedWaiter:
                     reason=reason,
                     last_response=response,
                 )
-            if num_attempts >= max_attempts:
+            delay = polling.next_delay()
+            if delay is None:
                 # ----------------------------------------
                 # Timeout hook invocation
                 # ----------------------------------------
@@ -198,9 +213,10 @@ class HookedWaiter:
                     hook('timeout', response, num_attempts, **kwargs)
                 # ----------------------------------------
                 if last_matched_acceptor is None:
-                    reason = 'Max attempts exceeded'
+                    reason = polling.timeout_reason
                 else:
-                    reason = 'Max attempts exceeded. Previously accepted state: %s' % (
+                    reason = '%s. Previously accepted state: %s' % (
+                        polling.timeout_reason,
                         acceptor.explanation
                     )
                 raise WaiterError(
@@ -208,4 +224,4 @@ class HookedWaiter:
                     reason=reason,
                     last_response=response,
                 )
-            time.sleep(sleep_amount)
+            time.sleep(delay)
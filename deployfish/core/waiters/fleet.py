@@ -0,0 +1,226 @@
+from collections import OrderedDict
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from botocore.exceptions import WaiterError
+
+from deployfish.core.aws import get_boto3_client
+from deployfish.core.utils import concurrent_map
+
+from .polling import AdaptivePolling, PollingStrategy
+
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceFleetWaiter:
+    """
+    Wait for many ECS services, possibly in different clusters, to become
+    stable.
+
+    Where the ``services_stable`` waiter describes a single service per call,
+    we group the services we're still waiting on by cluster and describe them
+    10 at a time (the most ``describe_services`` accepts), so that each poll
+    of 60 services costs 6 API calls instead of 60.  Once a service is stable
+    or has failed, we stop describing it.
+
+    A service is stable when it has a single deployment whose running count
+    matches its desired count, just as with ``services_stable``.  It has failed
+    if it is missing, draining or inactive, or if ECS has marked its primary
+    deployment's rollout as ``FAILED``.  We succeed when all services are
+    stable, and fail as soon as any one service fails.
+
+    Hooks have the same prototype as :py:class:`deployfish.core.waiters.HookedWaiter`
+    hooks::
+
+        hook(state, response, num_attempts, **kwargs)
+
+    where ``response`` merges the ``services`` and ``failures`` from all of
+    this poll's ``describe_services`` calls, and ``kwargs`` holds:
+
+        * 'services': the primary keys (``{cluster}:{service}``) of all the
+          services we're waiting on
+        * 'statuses': a dict of primary key to one of 'waiting', 'stable' or
+          'failed'
+        * 'changed': the primary keys of the services whose status changed on
+          this poll
+
+    Args:
+        pks: the services to wait on, as ``{cluster}:{service}`` strings
+
+    Keyword Args:
+        hooks: callables to call after each poll
+        polling: decides how long to sleep between polls and when to give up.
+            Defaults to a 10 minute :py:class:`AdaptivePolling`.
+    """
+
+    name: str = 'services_stable_fleet'
+
+    #: ``describe_services`` accepts at most this many services per call
+    BATCH_SIZE: int = 10
+
+    def __init__(
+        self,
+        pks: Sequence[str],
+        hooks: List[Callable] = None,
+        polling: PollingStrategy = None
+    ) -> None:
+        self.pks: List[str] = list(dict.fromkeys(pks))
+        self.hooks: List[Callable] = hooks if hooks else []
+        self.polling: PollingStrategy = polling if polling else AdaptivePolling(timeout=600, max_delay=15)
+        self.statuses: Dict[str, str] = OrderedDict((pk, 'waiting') for pk in self.pks)
+
+    @property
+    def client(self):
+        return get_boto3_client('ecs')
+
+    @staticmethod
+    def is_stable(data: Dict[str, Any]) -> bool:
+        return len(data.get('deployments', [])) == 1 and data['runningCount'] == data['desiredCount']
+
+    @staticmethod
+    def is_failed(data: Dict[str, Any]) -> bool:
+        if data.get('status') in ('DRAINING', 'INACTIVE'):
+            return True
+        for deployment in data.get('deployments', []):
+            if deployment.get('status') == 'PRIMARY' and deployment.get('rolloutState') == 'FAILED':
+                return True
+        return False
+
+    def batches(self, pks: List[str]) -> List[Dict[str, Any]]:
+        """
+        Group ``pks`` by cluster, and split each cluster's services into
+        batches of :py:attr:`BATCH_SIZE`.
+
+        Returns:
+            A list of ``describe_services`` kwargs.
+        """
+        clusters: Dict[str, List[str]] = OrderedDict()
+        for pk in pks:
+            cluster, service = pk.split(':', 1)
+            clusters.setdefault(cluster, []).append(service)
+        batches = []
+        for cluster, services in clusters.items():
+            for i in range(0, len(services), self.BATCH_SIZE):
+                batches.append({'cluster': cluster, 'services': services[i:i + self.BATCH_SIZE]})
+        return batches
+
+    def describe(self, pks: List[str]) -> Dict[str, Any]:
+        """
+        Describe the services named by ``pks`` with as few ``describe_services``
+        calls as possible, made concurrently.
+
+        Returns:
+            A dict with the combined ``services`` and ``failures`` from all of
+            our calls.
+        """
+        client = self.client
+
+        def describe_batch(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                response = client.describe_services(**kwargs)
+            except client.exceptions.ClusterNotFoundException:
+                return {
+                    'services': [],
+                    'failures': [{'arn': s, 'reason': 'MISSING', 'cluster': kwargs['cluster']}
+                                 for s in kwargs['services']]
+                }
+            for data in response['services']:
+                data['cluster'] = kwargs['cluster']
+            for failure in response.get('failures', []):
+                failure['cluster'] = kwargs['cluster']
+            return response
+
+        response: Dict[str, Any] = {'services': [], 'failures': []}
+        for batch_response in concurrent_map(describe_batch, self.batches(pks)):
+            response['services'].extend(batch_response['services'])
+            response['failures'].extend(batch_response.get('failures', []))
+        return response
+
+    def update(self, response: Dict[str, Any]) -> List[str]:
+        """
+        Update :py:attr:`statuses` from ``response``.
+
+        Returns:
+            The primary keys of the services whose status changed.
+        """
+        changed = []
+        for data in response['services']:
+            pk = f"{data['cluster']}:{data['serviceName']}"
+            if self.is_failed(data):
+                status = 'failed'
+            elif self.is_stable(data):
+                status = 'stable'
+            else:
+                status = 'waiting'
+            if pk in self.statuses and self.statuses[pk] != status:
+                self.statuses[pk] = status
+                changed.append(pk)
+        for failure in response['failures']:
+            # failures may name the service by name or by ARN
+            pk = f"{failure['cluster']}:{failure['arn'].rsplit('/', 1)[-1]}"
+            if pk in self.statuses and self.statuses[pk] != 'failed':
+                self.statuses[pk] = 'failed'
+                changed.append(pk)
+        return changed
+
+    def run_hooks(self, state: str, response: Dict[str, Any], num_attempts: int, changed: List[str]) -> None:
+        for hook in self.hooks:
+            hook(
+                state,
+                response,
+                num_attempts,
+                services=self.pks,
+                statuses=dict(self.statuses),
+                changed=changed
+            )
+
+    def wait(self) -> Dict[str, str]:
+        """
+        Poll until all our services are stable.
+
+        Raises:
+            botocore.exceptions.WaiterError: a service failed, or we ran out of
+                time
+
+        Returns:
+            A dict of service primary key to final status.
+        """
+        self.polling.start()
+        num_attempts = 0
+        while True:
+            pending = [pk for pk, status in self.statuses.items() if status == 'waiting']
+            response = self.describe(pending)
+            num_attempts += 1
+            self.polling.observe(response)
+            changed = self.update(response)
+            failed = [pk for pk, status in self.statuses.items() if status == 'failed']
+            if failed:
+                state = 'failure'
+            elif all(status == 'stable' for status in self.statuses.values()):
+                state = 'success'
+            else:
+                state = 'waiting'
+            self.run_hooks(state, response, num_attempts, changed)
+            if state == 'success':
+                logger.debug('Waiting complete: all %d services are stable.', len(self.pks))
+                return dict(self.statuses)
+            if state == 'failure':
+                raise WaiterError(
+                    name=self.name,
+                    reason='Services failed to stabilize: {}'.format(', '.join(failed)),
+                    last_response=response,
+                )
+            delay: Optional[float] = self.polling.next_delay()
+            if delay is None:
+                self.run_hooks('timeout', response, num_attempts, [])
+                raise WaiterError(
+                    name=self.name,
+                    reason='{}. Still waiting on: {}'.format(
+                        self.polling.timeout_reason,
+                        ', '.join(pk for pk, status in self.statuses.items() if status == 'waiting')
+                    ),
+                    last_response=response,
+                )
+            time.sleep(delay)
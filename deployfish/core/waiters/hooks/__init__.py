@@ -1,4 +1,5 @@
 from .ecs import (  # noqa:F401
     ECSDeploymentStatusWaiterHook,
+    ECSTaskLogsHook,
     ECSTaskStatusHook
 )
@@ -1,11 +1,39 @@
+from typing import Any, Dict, List
+
 import click
 
 
 class AbstractWaiterHook:
+    """
+    The base class for our :py:class:`deployfish.core.waiters.HookedWaiter`
+    hooks.
+
+    On each iteration, we build model objects from the waiter's own response
+    with :py:meth:`get_objects` and hand them to our per-state methods as the
+    ``objects`` kwarg, so that hooks can report on what they're waiting for
+    without going back to AWS for it.
+    """
 
     def __init__(self, obj):
         self.obj = obj
 
+    def get_objects(self, response: Dict[str, Any], **kwargs) -> List[Any]:
+        """
+        Build model objects from ``response``, the boto3 response from the
+        last invocation of our waiter's operation.  Subclasses should override
+        this to return instances of the appropriate model.
+
+        Args:
+            response: the boto3 response from the waiter's last operation
+
+        Keyword Args:
+            **kwargs: the kwargs passed to the waiter
+
+        Returns:
+            A list of model objects.
+        """
+        return []
+
     def mark(self, status, response, num_attempts, **kwargs):
         click.secho('=' * 72, fg='yellow', bold=True)
 
@@ -69,7 +97,13 @@ class AbstractWaiterHook:
             * 'MaxAttempts': (optional) how many iterations we'll perform before timing out
 
         Plus other waiter specific kwargs.  e.g. Bucket when doing a 'bucket_exists' waiter.
+
+        We add one kwarg of our own before calling our per-state methods:
+
+            * 'objects': the model objects built from ``response`` by :py:meth:`get_objects`
         """
+        if 'objects' not in kwargs:
+            kwargs['objects'] = self.get_objects(response, **kwargs)
         self.setup(status, response, num_attempts, **kwargs)
         if status == 'waiting':
             self.waiting(status, response, num_attempts, **kwargs)
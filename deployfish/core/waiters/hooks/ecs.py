@@ -1,12 +1,16 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence, cast
 from datetime import datetime
 from textwrap import wrap
+import threading
+import time
 
+from botocore.exceptions import ClientError
 import click
 from tabulate import tabulate
 from tzlocal import get_localzone
 
-from deployfish.core.models import Service, InvokedTask
+from deployfish.core.models import Service, InvokedTask, CloudWatchLogGroup
+from deployfish.core.models.cloudwatchlogs import CloudWatchLogGroupTailer
 
 from .abstract import AbstractWaiterHook
 
@@ -58,10 +62,25 @@ class ECSDeploymentStatusWaiterHook(AbstractWaiterHook):
             ])
         click.secho(tabulate(rows, headers=['Timestamp', 'Message']))
 
+    def get_objects(self, response: Dict[str, Any], **kwargs) -> List[Service]:
+        """
+        Build :py:class:`deployfish.core.models.Service` objects from our
+        ``describe_services`` response.
+        """
+        services = []
+        for data in response.get('services', []):
+            data = dict(data)
+            data['cluster'] = data['clusterArn'].split('/')[-1]
+            services.append(Service(data))
+        return services
+
     def waiting(self, status, response, num_attempts, **kwargs):
-        cluster = kwargs['cluster']
-        service = kwargs['services'][0]
-        service = Service.objects.get(f'{cluster}:{service}')
+        name = kwargs['services'][0]
+        services = [s for s in kwargs['objects'] if s.name == name or s.arn == name]
+        if not services:
+            self.mark(status, response, num_attempts, **kwargs)
+            return
+        service = services[0]
         click.secho('\n\nDeployment status:', fg='cyan')
         click.secho('------------------\n', fg='cyan')
         self.display_deployments(service.deployments)
@@ -86,7 +105,24 @@ class ECSDeploymentStatusWaiterHook(AbstractWaiterHook):
         )
 
 
-class ECSTaskStatusHook(AbstractWaiterHook):
+class AbstractECSTaskWaiterHook(AbstractWaiterHook):
+    """
+    A base class for hooks for the 'tasks_stopped' waiter on ECS.
+    """
+
+    def get_objects(self, response: Dict[str, Any], **kwargs) -> List[InvokedTask]:
+        """
+        Build :py:class:`deployfish.core.models.InvokedTask` objects from our
+        ``describe_tasks`` response, in the order in which the tasks were given
+        to the waiter.  The waiter may have been given task ARNs or task IDs, so
+        we match the tasks by their IDs.
+        """
+        tasks = {data['taskArn'].rsplit('/', 1)[-1]: InvokedTask(data) for data in response.get('tasks', [])}
+        task_ids = [task.rsplit('/', 1)[-1] for task in kwargs.get('tasks', [])]
+        return [tasks[task_id] for task_id in task_ids if task_id in tasks]
+
+
+class ECSTaskStatusHook(AbstractECSTaskWaiterHook):
     """
     This for the 'tasks_stopped'' waiters on ECS, and prints the status of our tasks on each iteration.
     """
@@ -98,8 +134,7 @@ class ECSTaskStatusHook(AbstractWaiterHook):
         self.timestamp = self.start
 
     def waiting(self, status, response, num_attempts, **kwargs):
-        cluster = kwargs['cluster']
-        tasks = [InvokedTask.objects.get(f'{cluster}:{arn}') for arn in kwargs['tasks']]
+        tasks = kwargs['objects']
         table = []
         print()
         for i, task in enumerate(tasks):
@@ -119,8 +154,7 @@ class ECSTaskStatusHook(AbstractWaiterHook):
         self.mark(status, response, num_attempts, **kwargs)
 
     def success(self, status, response, num_attempts, **kwargs):
-        cluster = kwargs['cluster']
-        tasks = [InvokedTask.objects.get(f'{cluster}:{arn}') for arn in kwargs['tasks']]
+        tasks = kwargs['objects']
         click.secho('\n\nFinal Task status:', fg='cyan')
         click.secho('-----------------\n', fg='cyan')
         table = []
@@ -143,22 +177,155 @@ class ECSTaskStatusHook(AbstractWaiterHook):
         click.secho('\n\nTimed out waiting for the tasks to finish!\n\n', fg='red')
 
 
-class ECSTaskLogsHook(AbstractWaiterHook):
+class ECSTaskLogsHook(AbstractECSTaskWaiterHook):
     """
-    This for the 'tasks_stopped'' waiters on ECS.
+    This for the 'tasks_stopped'' waiters on ECS.  While the waiter polls, we
+    stream the ``awslogs`` output of our tasks to stdout from a background
+    thread, and print the status of our tasks whenever it changes.
+
+    ECS names the log stream for each container in a task
+    ``{awslogs-stream-prefix}/{container name}/{task id}``, so we tail exactly
+    our tasks' streams rather than the whole log group.  Containers that don't
+    use the ``awslogs`` log driver with a stream prefix are skipped.
+
+    Messages from all of our tasks and containers are interleaved by timestamp.
+    Once our tasks stop, we wait ``drain_delay`` seconds for CloudWatch Logs to
+    ingest their last messages, and then print whatever is left before printing
+    the final task status.
+
+    Args:
+        obj: the tasks we're waiting on
+
+    Keyword Args:
+        sleep: how long to sleep between our first few polls of CloudWatch Logs
+        drain_delay: how long to wait for straggling messages after our tasks stop
     """
 
-    def __init__(self, obj):
+    def __init__(self, obj, sleep: int = 2, drain_delay: int = 5):
         super().__init__(obj)
         self.our_timezone = get_localzone()
         self.start = datetime.now().replace(tzinfo=self.our_timezone)
         self.timestamp = self.start
+        self.sleep = sleep
+        self.drain_delay = drain_delay
+        #: log group name -> CloudWatchLogGroupTailer for our streams in that group
+        self.tailers: Optional[Dict[str, CloudWatchLogGroupTailer]] = None
+        #: log stream name -> the label we print for that stream's messages
+        self.labels: Dict[str, str] = {}
+        self.statuses: Dict[str, str] = {}
+        self.thread: Optional[threading.Thread] = None
+        self.stopped = threading.Event()
+        # Our thread and the waiter's thread both print; don't let them print over each other
+        self.lock = threading.Lock()
+
+    def get_log_streams(self, tasks: Sequence[InvokedTask]) -> Dict[str, List[str]]:
+        """
+        Figure out the names of the awslogs log streams for the containers in
+        ``tasks``, and remember a label for each of them in :py:attr:`labels`.
+
+        Returns:
+            A dict of log group name to the list of log stream names in that group.
+        """
+        streams: Dict[str, List[str]] = {}
+        for task in tasks:
+            task_id = task.arn.rsplit('/', 1)[1]
+            for container in task.containers:
+                lc = container.data.get('logConfiguration', None)
+                if not lc or lc['logDriver'] != 'awslogs':
+                    continue
+                options = lc.get('options', {})
+                if 'awslogs-group' not in options or 'awslogs-stream-prefix' not in options:
+                    continue
+                stream_name = f"{options['awslogs-stream-prefix']}/{container.name}/{task_id}"
+                streams.setdefault(options['awslogs-group'], []).append(stream_name)
+                self.labels[stream_name] = f'{container.name}/{task_id[:8]}'
+        return streams
+
+    def start_tailing(self, tasks: Sequence[InvokedTask]) -> None:
+        """
+        Build our tailers and start the thread that polls them.
+        """
+        self.tailers = {}
+        streams = self.get_log_streams(tasks)
+        if not streams:
+            click.secho('\nNone of our containers use the "awslogs" log driver; not streaming logs.\n', fg='yellow')
+            return
+        # startTime for filter_log_events is milliseconds since the epoch
+        start_time = int(min(task.data['createdAt'] for task in tasks).timestamp() * 1000)
+        for group_name, stream_names in streams.items():
+            self.tailers[group_name] = CloudWatchLogGroupTailer(
+                CloudWatchLogGroup({'logGroupName': group_name}),
+                stream_names=stream_names,
+                sleep=self.sleep,
+                start_time=start_time
+            )
+        self.thread = threading.Thread(target=self.tail, name='ECSTaskLogsHook', daemon=True)
+        self.thread.start()
+
+    def fetch(self) -> List[Dict[str, Any]]:
+        """
+        Get any new events from all our tailers.
+
+        Returns:
+            The new events, sorted by timestamp.
+        """
+        events: List[Dict[str, Any]] = []
+        for group_name, tailer in cast(Dict[str, CloudWatchLogGroupTailer], self.tailers).items():
+            try:
+                events.extend(tailer.fetch())
+            except ClientError as e:
+                # Our streams won't exist until our containers have started
+                if e.response['Error']['Code'] != 'ResourceNotFoundException':
+                    with self.lock:
+                        click.secho(f'Failed to get logs from {group_name}: {e}', fg='red')
+        return sorted(events, key=lambda e: e['raw_timestamp'])
+
+    def print_events(self, events: List[Dict[str, Any]]) -> None:
+        with self.lock:
+            for event in events:
+                click.secho('{}  {}  {}'.format(
+                    click.style(event['timestamp'].strftime('%Y-%m-%d %H:%M:%S.%f'), fg='cyan'),
+                    click.style(self.labels.get(event['logStreamName'], event['logStreamName']), fg='green'),
+                    event['message'].strip()
+                ))
+
+    def tail(self) -> None:
+        """
+        Print new log events until we're told to stop.  We poll as often as our
+        busiest tailer wants to; see :py:class:`CloudWatchLogGroupTailer`.
+        """
+        while True:
+            self.print_events(self.fetch())
+            sleep = min(tailer.sleep for tailer in cast(Dict[str, CloudWatchLogGroupTailer], self.tailers).values())
+            if self.stopped.wait(sleep):
+                break
+
+    def stop_tailing(self) -> None:
+        """
+        Stop our thread, and then print any events that arrived after its last poll.
+        """
+        if not self.thread:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
+        time.sleep(self.drain_delay)
+        while True:
+            events = self.fetch()
+            if not events:
+                break
+            self.print_events(events)
+
+    def setup(self, status, response, num_attempts, **kwargs):
+        if self.tailers is None:
+            self.start_tailing(kwargs['objects'])
 
     def waiting(self, status, response, num_attempts, **kwargs):
-        cluster = kwargs['cluster']
-        tasks = [InvokedTask.objects.get(f'{cluster}:{arn}') for arn in kwargs['tasks']]
-        click.secho('\n\nTask status:', fg='cyan')
-        click.secho('------------\n', fg='cyan')
+        tasks = kwargs['objects']
+        statuses = {task.arn: task.data['lastStatus'] for task in tasks}
+        if statuses == self.statuses:
+            return
+        self.statuses = statuses
         table = []
         for i, task in enumerate(tasks):
             row = [
@@ -173,13 +340,18 @@ class ECSTaskLogsHook(AbstractWaiterHook):
             else:
                 row.append('Not Started')
             table.append(row)
-        click.secho(tabulate(table, headers=['#', 'Cluster', 'ID', 'Status', 'Created', 'Started']))
-        click.secho('\n')
-        self.mark(status, response, num_attempts, **kwargs)
+        with self.lock:
+            click.secho('\n\nTask status:', fg='cyan')
+            click.secho('------------\n', fg='cyan')
+            click.secho(tabulate(table, headers=['#', 'Cluster', 'ID', 'Status', 'Created', 'Started']))
+            click.secho('\n')
 
     def success(self, status, response, num_attempts, **kwargs):
-        cluster = kwargs['cluster']
-        tasks = [InvokedTask.objects.get(f'{cluster}:{arn}') for arn in kwargs['tasks']]
+        self.stop_tailing()
+        if status == 'timeout':
+            self.timeout(status, response, num_attempts, **kwargs)
+            return
+        tasks = kwargs['objects']
         click.secho('\n\nTask status:', fg='cyan')
         click.secho('------------\n', fg='cyan')
         table = []
@@ -189,8 +361,8 @@ class ECSTaskLogsHook(AbstractWaiterHook):
                 kwargs['cluster'],
                 task.arn.rsplit('/', 1)[1],
                 task.data['lastStatus'],
-                task.data['stopCode'],
-                task.data['stoppedAt'].strftime('%Y-%m-%d %H:%M:%S')
+                task.data.get('stopCode', ''),
+                task.data['stoppedAt'].strftime('%Y-%m-%d %H:%M:%S') if 'stoppedAt' in task.data else ''
             ]
             table.append(row)
         click.secho(tabulate(table, headers=['#', 'Cluster', 'ID', 'Status', 'Stop Code', 'Stopped']))
@@ -198,4 +370,88 @@ class ECSTaskLogsHook(AbstractWaiterHook):
     error = success
 
     def timeout(self, status, response, num_attempts, **kwargs):
+        # We may be called directly rather than through success(), so our thread may still be tailing
+        self.stop_tailing()
         click.secho('\n\nTimed out waiting for the tasks to finish!\n\n', fg='red')
+
+
+class ECSServiceFleetStatusWaiterHook(ECSDeploymentStatusWaiterHook):
+    """
+    This is for :py:class:`deployfish.core.waiters.fleet.ServiceFleetWaiter`,
+    and prints a compact, one row per service, view of our deployments on each
+    iteration.
+    """
+
+    STATUS_COLORS: Dict[str, str] = {
+        'waiting': 'yellow',
+        'stable': 'green',
+        'failed': 'red',
+    }
+
+    def __init__(self, obj):
+        super().__init__(obj)
+        #: The last version of each service we've seen.  The fleet waiter stops
+        #: describing services once they settle, so we keep them for display.
+        self.services: Dict[str, Service] = {}
+
+    def display_services(self, statuses: Dict[str, str]) -> None:
+        rows = []
+        for pk, status in statuses.items():
+            fg = self.STATUS_COLORS[status]
+            service = self.services.get(pk, None)
+            if service is None:
+                rows.append([click.style(status, fg=fg), click.style(pk, fg=fg), '', '', '', '', '', ''])
+                continue
+            primary = [d for d in service.deployments if d['status'] == 'PRIMARY']
+            deployment = primary[0] if primary else {}
+            events = sorted(service.events, key=lambda x: x['createdAt'])
+            message = ''
+            if events and events[-1]['createdAt'] >= self.start:
+                message = '\n'.join(wrap(events[-1]['message'], 60))
+            rows.append([
+                click.style(status, fg=fg),
+                click.style(pk, fg=fg),
+                click.style(deployment.get('taskDefinition', '').rsplit('/', 1)[-1], fg=fg),
+                str(len(service.deployments)),
+                str(deployment.get('desiredCount', '')),
+                str(deployment.get('pendingCount', '')),
+                str(deployment.get('runningCount', '')),
+                message
+            ])
+        click.secho(tabulate(
+            rows,
+            headers=['Status', 'Service', 'Task def', 'Deployments', 'Desired', 'Pending', 'Running', 'Last event']
+        ))
+
+    def setup(self, status, response, num_attempts, **kwargs):
+        for service in kwargs['objects']:
+            self.services[service.pk] = service
+
+    def waiting(self, status, response, num_attempts, **kwargs):
+        statuses = kwargs['statuses']
+        for pk in kwargs['changed']:
+            click.secho(f'Service("{pk}"): {statuses[pk]}', fg=self.STATUS_COLORS[statuses[pk]])
+        done = len([s for s in statuses.values() if s != 'waiting'])
+        click.secho(f'\n\nDeployment status ({done}/{len(statuses)} done):', fg='cyan')
+        click.secho('-------------------------------\n', fg='cyan')
+        self.display_services(statuses)
+        click.secho('\n')
+        self.mark(status, response, num_attempts, **kwargs)
+
+    def success(self, status, response, num_attempts, **kwargs):
+        self.display_services(kwargs['statuses'])
+        click.secho(f"\n\nAll {len(kwargs['statuses'])} services are stable!", fg='green')
+
+    def failure(self, status, response, num_attempts, **kwargs):
+        if status == 'timeout':
+            # AbstractWaiterHook sends timeouts here
+            self.timeout(status, response, num_attempts, **kwargs)
+            return
+        self.display_services(kwargs['statuses'])
+        failed = [pk for pk, s in kwargs['statuses'].items() if s == 'failed']
+        click.secho('\n\nServices failed to stabilize: {}'.format(', '.join(failed)), fg='red')
+    error = failure
+
+    def timeout(self, status, response, num_attempts, **kwargs):
+        self.display_services(kwargs['statuses'])
+        super().timeout(status, response, num_attempts, **kwargs)
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import random
+import time
+from typing import Any, Dict, Optional
+
+
+class PollingStrategy:
+    """
+    Decide how long a :py:class:`deployfish.core.waiters.HookedWaiter` sleeps
+    between polls, and when it should give up.
+
+    Pass an instance to ``waiter.wait()`` as the ``WaiterPolling`` kwarg.  The
+    waiter calls :py:meth:`start` once before it begins, :py:meth:`observe`
+    with each response it gets, and then :py:meth:`next_delay` to find out how
+    long to sleep before polling again.
+    """
+
+    #: Why we gave up, for the ``WaiterError`` we raise when :py:meth:`next_delay`
+    #: returns ``None``
+    timeout_reason: str = 'Max attempts exceeded'
+
+    def __init__(self) -> None:
+        self.attempts: int = 0
+
+    def start(self) -> None:
+        """
+        Reset our state, in case we are being reused for another wait.
+        """
+        self.attempts = 0
+
+    def observe(self, response: Dict[str, Any]) -> None:
+        """
+        Take note of ``response``, the response from our waiter's latest poll.
+        """
+        self.attempts += 1
+
+    def next_delay(self) -> Optional[float]:
+        """
+        Returns:
+            How many seconds to sleep before polling again, or ``None`` if we
+            should stop waiting.
+        """
+        raise NotImplementedError
+
+
+class FixedDelayPolling(PollingStrategy):
+    """
+    Sleep ``delay`` seconds between polls, and give up after ``max_attempts``
+    polls.  This is how boto3's own waiters behave.
+    """
+
+    def __init__(self, delay: float, max_attempts: int) -> None:
+        super().__init__()
+        self.delay = delay
+        self.max_attempts = max_attempts
+
+    def next_delay(self) -> Optional[float]:
+        if self.attempts >= self.max_attempts:
+            return None
+        return self.delay
+
+
+class AdaptivePolling(PollingStrategy):
+    """
+    Poll quickly while things are changing, and back off while they aren't.
+
+    Right after a poll whose response differs from the one before it, we wait
+    only ``min_delay`` seconds.  Each poll with an unchanged response multiplies
+    the delay by ``backoff``, up to ``max_delay``.  Each sleep is randomly
+    shortened by up to ``jitter`` of the delay, so that many waiters started
+    together don't poll AWS in lockstep.
+
+    Instead of counting attempts, we give up once ``timeout`` seconds of wall
+    clock time have passed since :py:meth:`start`.
+
+    Args:
+        timeout: stop waiting after this many seconds
+
+    Keyword Args:
+        min_delay: the delay after a change, in seconds
+        max_delay: never wait longer than this between polls
+        backoff: multiply the delay by this after each unchanged poll
+        jitter: the fraction of each delay to randomize, between 0 and 1
+    """
+
+    def __init__(
+        self,
+        timeout: float,
+        min_delay: float = 2.0,
+        max_delay: float = 30.0,
+        backoff: float = 1.5,
+        jitter: float = 0.5
+    ) -> None:
+        super().__init__()
+        self.timeout = timeout
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.jitter = jitter
+        self.delay: float = min_delay
+        self.deadline: float = 0.0
+        self._fingerprint: Optional[str] = None
+        self.timeout_reason = f'Timed out after {timeout} seconds'
+
+    def fingerprint(self, response: Dict[str, Any]) -> str:
+        """
+        Reduce ``response`` to a string that changes when, and only when, what
+        we're waiting on changes.
+        """
+        data = {k: v for k, v in response.items() if k != 'ResponseMetadata'}
+        return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    def start(self) -> None:
+        super().start()
+        self.deadline = time.monotonic() + self.timeout
+        self.delay = self.min_delay
+        self._fingerprint = None
+
+    def observe(self, response: Dict[str, Any]) -> None:
+        super().observe(response)
+        fingerprint = self.fingerprint(response)
+        if fingerprint != self._fingerprint:
+            self.delay = self.min_delay
+        else:
+            self.delay = min(self.max_delay, self.delay * self.backoff)
+        self._fingerprint = fingerprint
+
+    def next_delay(self) -> Optional[float]:
+        remaining = self.deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        delay = random.uniform(self.delay * (1 - self.jitter), self.delay)
+        return min(delay, remaining)
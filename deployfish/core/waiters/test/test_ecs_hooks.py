@@ -0,0 +1,177 @@
+from datetime import datetime
+import unittest
+
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.models import ContainerDefinition, TaskDefinition
+from deployfish.core.waiters.hooks.ecs import ECSDeploymentStatusWaiterHook, ECSTaskLogsHook, ECSTaskStatusHook
+
+
+def task_arn(i):
+    return f'arn:aws:ecs:us-west-2:123456789012:task/foobar-cluster/{i}'
+
+
+class TestECSTaskStatusHook(unittest.TestCase):
+
+    def setUp(self):
+        self.response = {
+            'tasks': [
+                {
+                    'taskArn': task_arn(i),
+                    'clusterArn': 'arn:aws:ecs:us-west-2:123456789012:cluster/foobar-cluster',
+                    'lastStatus': 'RUNNING',
+                    'createdAt': datetime(2023, 1, 1),
+                }
+                for i in reversed(range(50))
+            ]
+        }
+        self.kwargs = {'cluster': 'foobar-cluster', 'tasks': [task_arn(i) for i in range(50)]}
+
+    def test_objects_come_from_response(self):
+        hook = ECSTaskStatusHook(None)
+        tasks = hook.get_objects(self.response, **self.kwargs)
+        self.assertEqual([t.arn for t in tasks], self.kwargs['tasks'])
+
+    def test_objects_match_task_ids(self):
+        hook = ECSTaskStatusHook(None)
+        kwargs = {'cluster': 'foobar-cluster', 'tasks': [str(i) for i in range(3)] + [task_arn(3)]}
+        tasks = hook.get_objects(self.response, **kwargs)
+        self.assertEqual([t.arn for t in tasks], [task_arn(i) for i in range(4)])
+
+    def test_waiting_does_not_refetch(self):
+        hook = ECSTaskStatusHook(None)
+        with Replacer() as r:
+            get = r('deployfish.core.models.ecs.InvokedTaskManager.get', Mock())
+            # click.secho is the same function in all of our hook modules
+            r('deployfish.core.waiters.hooks.ecs.click.secho', Mock())
+            hook('waiting', self.response, 1, **self.kwargs)
+        get.assert_not_called()
+
+
+class TestECSDeploymentStatusWaiterHook(unittest.TestCase):
+
+    def test_waiting_does_not_refetch(self):
+        response = {
+            'services': [{
+                'serviceName': 'foobar',
+                'serviceArn': 'arn:aws:ecs:us-west-2:123456789012:service/foobar-cluster/foobar',
+                'clusterArn': 'arn:aws:ecs:us-west-2:123456789012:cluster/foobar-cluster',
+                'deployments': [{
+                    'status': 'PRIMARY',
+                    'taskDefinition': 'arn:aws:ecs:us-west-2:123456789012:task-definition/foobar:2',
+                    'desiredCount': 2,
+                    'pendingCount': 0,
+                    'runningCount': 1,
+                }],
+                'events': [],
+            }]
+        }
+        hook = ECSDeploymentStatusWaiterHook(None)
+        with Replacer() as r:
+            get = r('deployfish.core.models.ecs.ServiceManager.get', Mock())
+            secho = r('deployfish.core.waiters.hooks.ecs.click.secho', Mock())
+            hook('waiting', response, 1, cluster='foobar-cluster', services=['foobar'])
+        get.assert_not_called()
+        self.assertIn('PRIMARY', secho.call_args_list[2][0][0])
+
+
+class TestECSTaskLogsHook(unittest.TestCase):
+
+    def setUp(self):
+        self.task_definition = TaskDefinition(
+            {
+                'family': 'foobar',
+                'revision': 1,
+                'taskDefinitionArn': 'arn:aws:ecs:us-west-2:123456789012:task-definition/foobar:1',
+            },
+            containers=[
+                ContainerDefinition({
+                    'name': 'web',
+                    'logConfiguration': {
+                        'logDriver': 'awslogs',
+                        'options': {'awslogs-group': 'foobar', 'awslogs-stream-prefix': 'foobar'}
+                    }
+                }),
+                ContainerDefinition({'name': 'sidecar', 'logConfiguration': {'logDriver': 'fluentd', 'options': {}}}),
+            ]
+        )
+        self.response = {
+            'tasks': [
+                {
+                    'taskArn': task_arn(i),
+                    'taskDefinitionArn': self.task_definition.arn,
+                    'clusterArn': 'arn:aws:ecs:us-west-2:123456789012:cluster/foobar-cluster',
+                    'lastStatus': 'STOPPED',
+                    'stopCode': 'EssentialContainerExited',
+                    'createdAt': datetime(2023, 1, 1),
+                    'stoppedAt': datetime(2023, 1, 1, 0, 5),
+                }
+                for i in ['aaaa', 'bbbb']
+            ]
+        }
+        self.kwargs = {'cluster': 'foobar-cluster', 'tasks': [task_arn(i) for i in ['aaaa', 'bbbb']]}
+        # filter_log_events timestamps are milliseconds since the epoch
+        self.created = int(datetime(2023, 1, 1).timestamp() * 1000)
+        self.events = [
+            {'eventId': '2', 'timestamp': self.created + 2000, 'logStreamName': 'foobar/web/bbbb', 'message': 'second'},
+            {'eventId': '1', 'timestamp': self.created + 1000, 'logStreamName': 'foobar/web/aaaa', 'message': 'first'},
+        ]
+        self.client = Mock()
+        self.client.get_paginator.return_value.paginate.side_effect = self.filter_log_events
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.models.cloudwatchlogs.get_boto3_client', Mock(return_value=self.client))
+        self.replacer(
+            'deployfish.core.models.ecs.TaskDefinitionManager.get',
+            Mock(return_value=self.task_definition)
+        )
+        self.secho = self.replacer('deployfish.core.waiters.hooks.ecs.click.secho', Mock())
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def filter_log_events(self, **kwargs):
+        return [{
+            'events': [
+                dict(e) for e in self.events
+                if e['timestamp'] >= kwargs['startTime'] and e['logStreamName'] in kwargs['logStreamNames']
+            ]
+        }]
+
+    def test_streams_are_derived_from_task_ids(self):
+        hook = ECSTaskLogsHook(None)
+        tasks = hook.get_objects(self.response, **self.kwargs)
+        self.assertEqual(hook.get_log_streams(tasks), {'foobar': ['foobar/web/aaaa', 'foobar/web/bbbb']})
+
+    def test_events_are_interleaved_and_drained(self):
+        hook = ECSTaskLogsHook(None, sleep=60, drain_delay=0)
+        self.response['tasks'][0]['lastStatus'] = 'RUNNING'
+        hook('waiting', self.response, 1, **self.kwargs)
+        self.events.append(
+            {'eventId': '3', 'timestamp': self.created + 3000, 'logStreamName': 'foobar/web/aaaa', 'message': 'last'}
+        )
+        self.response['tasks'][0]['lastStatus'] = 'STOPPED'
+        hook('success', self.response, 2, **self.kwargs)
+        self.assertIsNone(hook.thread)
+        messages = [
+            c[0][0].rsplit('  ', 1)[1] for c in self.secho.call_args_list
+            if c[0][0].endswith(('first', 'second', 'last'))
+        ]
+        self.assertEqual(messages, ['first', 'second', 'last'])
+
+    def test_timeout_stops_tailing(self):
+        hook = ECSTaskLogsHook(None, sleep=60, drain_delay=0)
+        self.response['tasks'][0]['lastStatus'] = 'RUNNING'
+        hook('waiting', self.response, 1, **self.kwargs)
+        self.assertIsNotNone(hook.thread)
+        self.events.append(
+            {'eventId': '3', 'timestamp': self.created + 3000, 'logStreamName': 'foobar/web/aaaa', 'message': 'last'}
+        )
+        hook.timeout('timeout', self.response, 2, objects=hook.get_objects(self.response, **self.kwargs), **self.kwargs)
+        self.assertIsNone(hook.thread)
+        messages = [
+            c[0][0].rsplit('  ', 1)[1] for c in self.secho.call_args_list
+            if c[0][0].endswith(('first', 'second', 'last'))
+        ]
+        self.assertEqual(messages, ['first', 'second', 'last'])
+        self.assertIn('Timed out', self.secho.call_args_list[-1][0][0])
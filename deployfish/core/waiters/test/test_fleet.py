@@ -0,0 +1,79 @@
+import unittest
+
+from botocore.exceptions import WaiterError
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.waiters.fleet import ServiceFleetWaiter
+from deployfish.core.waiters.polling import FixedDelayPolling
+
+
+def service(cluster, name, running, status='ACTIVE'):
+    return {
+        'serviceName': name,
+        'serviceArn': f'arn:aws:ecs:us-west-2:123456789012:service/{cluster}/{name}',
+        'clusterArn': f'arn:aws:ecs:us-west-2:123456789012:cluster/{cluster}',
+        'status': status,
+        'desiredCount': 2,
+        'runningCount': running,
+        'deployments': [{'status': 'PRIMARY', 'desiredCount': 2, 'pendingCount': 0, 'runningCount': running}],
+        'events': [],
+    }
+
+
+class TestServiceFleetWaiter(unittest.TestCase):
+
+    def setUp(self):
+        self.pks = [f'cluster-a:service-{i}' for i in range(15)] + [f'cluster-b:service-{i}' for i in range(10)]
+        # service-0 in each cluster is slow to stabilize
+        self.polls = {}
+        self.client = Mock()
+        self.client.exceptions.ClusterNotFoundException = type('ClusterNotFoundException', (Exception,), {})
+        self.client.describe_services.side_effect = self.describe_services
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.waiters.fleet.get_boto3_client', Mock(return_value=self.client))
+        self.sleep = self.replacer('deployfish.core.waiters.fleet.time.sleep', Mock())
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def describe_services(self, cluster=None, services=None):
+        response = {'services': [], 'failures': []}
+        for name in services:
+            key = f'{cluster}:{name}'
+            self.polls[key] = self.polls.get(key, 0) + 1
+            if name == 'service-missing':
+                response['failures'].append({'arn': name, 'reason': 'MISSING'})
+                continue
+            running = 2 if name != 'service-0' or self.polls[key] > 1 else 1
+            response['services'].append(service(cluster, name, running))
+        return response
+
+    def test_batches_by_cluster(self):
+        batches = ServiceFleetWaiter(self.pks).batches(self.pks)
+        self.assertEqual([(b['cluster'], len(b['services'])) for b in batches], [
+            ('cluster-a', 10), ('cluster-a', 5), ('cluster-b', 10)
+        ])
+
+    def test_wait(self):
+        hook = Mock()
+        waiter = ServiceFleetWaiter(self.pks, hooks=[hook], polling=FixedDelayPolling(1, 10))
+        statuses = waiter.wait()
+        self.assertTrue(all(s == 'stable' for s in statuses.values()))
+        # 3 calls for the first poll, and 2 for the services that weren't stable yet
+        self.assertEqual(self.client.describe_services.call_count, 5)
+        self.assertEqual(self.sleep.call_count, 1)
+        self.assertEqual(hook.call_args_list[0][0][0], 'waiting')
+        self.assertEqual(len(hook.call_args_list[0][1]['changed']), 23)
+        self.assertEqual(hook.call_args_list[1][0][0], 'success')
+        self.assertEqual(
+            sorted(hook.call_args_list[1][1]['changed']),
+            ['cluster-a:service-0', 'cluster-b:service-0']
+        )
+
+    def test_any_failure_fails(self):
+        waiter = ServiceFleetWaiter(self.pks + ['cluster-b:service-missing'], polling=FixedDelayPolling(1, 10))
+        with self.assertRaises(WaiterError) as cm:
+            waiter.wait()
+        self.assertIn('cluster-b:service-missing', str(cm.exception))
+        self.assertEqual(waiter.statuses['cluster-b:service-missing'], 'failed')
@@ -0,0 +1,92 @@
+import unittest
+
+from botocore.exceptions import WaiterError
+from mock import Mock
+from testfixtures import Replacer
+
+from deployfish.core.waiters import HookedWaiter
+from deployfish.core.waiters.polling import AdaptivePolling, FixedDelayPolling
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestFixedDelayPolling(unittest.TestCase):
+
+    def test_gives_up_after_max_attempts(self):
+        polling = FixedDelayPolling(15, 2)
+        polling.start()
+        polling.observe({})
+        self.assertEqual(polling.next_delay(), 15)
+        polling.observe({})
+        self.assertIsNone(polling.next_delay())
+
+
+class TestAdaptivePolling(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.replacer = Replacer()
+        self.replacer('deployfish.core.waiters.polling.time.monotonic', self.clock)
+
+    def tearDown(self):
+        self.replacer.restore()
+
+    def test_backs_off_until_something_changes(self):
+        polling = AdaptivePolling(timeout=600, min_delay=2, max_delay=10, backoff=2, jitter=0)
+        polling.start()
+        delays = []
+        for response in [{'a': 1}, {'a': 1}, {'a': 1}, {'a': 1}, {'a': 1}, {'a': 2}]:
+            polling.observe(response)
+            delays.append(polling.next_delay())
+        self.assertEqual(delays, [2, 4, 8, 10, 10, 2])
+
+    def test_response_metadata_is_not_a_change(self):
+        polling = AdaptivePolling(timeout=600, min_delay=2, backoff=2, jitter=0)
+        polling.start()
+        polling.observe({'a': 1, 'ResponseMetadata': {'RequestId': '1'}})
+        polling.observe({'a': 1, 'ResponseMetadata': {'RequestId': '2'}})
+        self.assertEqual(polling.next_delay(), 4)
+
+    def test_jitter(self):
+        polling = AdaptivePolling(timeout=600, min_delay=10, jitter=0.5)
+        polling.start()
+        polling.observe({})
+        for _ in range(20):
+            self.assertTrue(5 <= polling.next_delay() <= 10)
+
+    def test_deadline(self):
+        polling = AdaptivePolling(timeout=60, min_delay=10, jitter=0)
+        polling.start()
+        polling.observe({})
+        self.clock.now += 55
+        self.assertEqual(polling.next_delay(), 5)
+        self.clock.now += 5
+        self.assertIsNone(polling.next_delay())
+
+
+class TestHookedWaiter_polling(unittest.TestCase):
+
+    def test_timeout_uses_strategy(self):
+        config = Mock()
+        config.acceptors = []
+        config.delay = 15
+        config.max_attempts = 40
+        operation = Mock(return_value={'services': []})
+        waiter = HookedWaiter('services_stable', config, operation)
+        polling = FixedDelayPolling(1, 3)
+        hook = Mock()
+        with Replacer() as r:
+            sleep = r('deployfish.core.waiters.time.sleep', Mock())
+            with self.assertRaises(WaiterError):
+                waiter.wait(cluster='foo', WaiterPolling=polling, WaiterHooks=[hook])
+        self.assertEqual(operation.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(hook.call_args_list[-1][0][0], 'timeout')
+        operation.assert_called_with(cluster='foo')
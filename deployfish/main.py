@@ -40,12 +40,16 @@ from .controllers import (
     RDSRDSInstance,
     Tunnels,
 )
-from .core.aws import build_boto3_session
+from .core.aws import build_boto3_session, client_pool
+from .core.ssh import close_ssh_multiplexer
+from .core.models import IdentityMap
 from .exceptions import DeployfishAppError
 
 # configuration defaults
 CONFIG = init_defaults('deployfish')
 CONFIG['deployfish']['ssh_provider'] = os.environ.get('DEPLOYFISH_SSH_PROVIDER', 'bastion')
+CONFIG['deployfish']['ssh_multiplex'] = os.environ.get('DEPLOYFISH_SSH_MULTIPLEX', 'false')
+CONFIG['deployfish']['ssh_multiplex_ttl'] = os.environ.get('DEPLOYFISH_SSH_MULTIPLEX_TTL', '600')
 META = init_defaults('log.logging')
 META['log.logging']['log_level_argument'] = ['-l', '--level']
 
@@ -65,6 +69,64 @@ def post_arg_parse_build_boto3_session(app: "DeployfishApp") -> None:
     )
 
 
+def post_arg_parse_activate_identity_map(app: "DeployfishApp") -> None:
+    """
+    If the user asked for it with ``--identity-map``, make every object we load
+    from AWS during this command go through a single
+    :py:class:`deployfish.core.models.IdentityMap`, so that we load each one
+    only once.
+
+    Args:
+        app: our DeployfishApp object
+    """
+    if getattr(app.pargs, 'identity_map', False):
+        app.log.debug('activating identity map')
+        app.identity_map = IdentityMap()
+        app.identity_map.activate()
+
+
+def pre_close_log_identity_map_stats(app: "DeployfishApp") -> None:
+    """
+    Just before we exit, deactivate our identity map, if we have one, and log
+    how many AWS lookups it saved us.
+
+    Args:
+        app: our DeployfishApp object
+    """
+    if app.identity_map is None:
+        return
+    app.identity_map.deactivate()
+    stats = app.identity_map.stats()
+    app.log.debug('identity map: hits={hits} misses={misses} size={size}'.format(**stats))
+    for name, counts in stats['by_model'].items():
+        app.log.debug('identity map: {}: hits={hits} misses={misses}'.format(name, **counts))
+
+
+def pre_close_log_boto3_client_stats(app: "DeployfishApp") -> None:
+    """
+    Just before we exit, log how well our pooled boto3 clients did for us.
+
+    Args:
+        app: our DeployfishApp object
+    """
+    stats = client_pool.stats()
+    app.log.debug(
+        'boto3 client pool: built={built} reused={reused} invalidations={invalidations}'.format(**stats)
+    )
+
+
+def pre_close_close_ssh_connections(app: "DeployfishApp") -> None:
+    """
+    Just before we exit, shut down any shared ssh connections we opened.  See
+    :py:class:`deployfish.core.ssh.SSHMultiplexer`.
+
+    Args:
+        app: our DeployfishApp object
+    """
+    app.log.debug('closing multiplexed ssh connections')
+    close_ssh_multiplexer()
+
+
 # ------------------
 # The cement app
 # ------------------
@@ -163,13 +225,18 @@ class DeployfishApp(App):
 
         # register hooks
         hooks = [
-            ('post_argument_parsing', post_arg_parse_build_boto3_session)
+            ('post_argument_parsing', post_arg_parse_build_boto3_session),
+            ('post_argument_parsing', post_arg_parse_activate_identity_map),
+            ('pre_close', pre_close_log_identity_map_stats),
+            ('pre_close', pre_close_log_boto3_client_stats),
+            ('pre_close', pre_close_close_ssh_connections),
         ]
 
     def __init__(self, *args, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self._deployfish_config: Optional[Config] = None
         self._raw_deployfish_config: Optional[Config] = None
+        self.identity_map: Optional[IdentityMap] = None
 
     @property
     def deployfish_config(self) -> Config:
@@ -178,7 +245,8 @@ class DeployfishApp(App):
         because most deployfish commands don't need it.
 
         Returns:
-            The fully interpolated :py:class:`deployfish.config.Config` object.
+            The :py:class:`deployfish.config.Config` object, which will
+            interpolate each item as it is requested.
         """
         # Allow our plugins to modify Config before our import
         for _ in self.hook.run('pre_config_interpolate', self, Config):
@@ -194,15 +262,19 @@ class DeployfishApp(App):
                 'filename': self.pargs.deployfish_filename,
                 'env_file': self.pargs.env_file,
                 'tfe_token': self.pargs.tfe_token,
-                'ignore_missing_environment': ignore_missing_environment
+                'ignore_missing_environment': ignore_missing_environment,
+                # Only interpolate the items our command actually uses
+                'lazy': True
             }
             self._deployfish_config = Config.new(**config_kwargs)
-            if 'proxy' not in self._deployfish_config.get_global_config('ssh'):
-                self._deployfish_config.set_global_config(
-                    'ssh',
-                    'proxy',
-                    self.config.get('deployfish', 'ssh_provider')
-                )
+            ssh_config = self._deployfish_config.get_global_config('ssh')
+            for key, setting in (
+                ('proxy', 'ssh_provider'),
+                ('multiplex', 'ssh_multiplex'),
+                ('multiplex_ttl', 'ssh_multiplex_ttl')
+            ):
+                if key not in ssh_config:
+                    self._deployfish_config.set_global_config('ssh', key, self.config.get('deployfish', setting))
         return self._deployfish_config
 
     @property
@@ -1,7 +1,7 @@
-from copy import deepcopy
 import datetime
+import itertools
 from textwrap import wrap
-from typing import Dict, Any, List, Optional, Union, cast
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Union, cast
 
 import click
 from tabulate import tabulate
@@ -13,6 +13,29 @@ from .abstract import AbstractRenderer
 from .misc import target_group_listener_rules
 
 
+#: The largest value ``datetime.datetime.fromtimestamp()`` accepts as seconds (9999-12-31 23:59:59 UTC).  Anything
+#: bigger must be an AWS timestamp in milliseconds.
+MAX_TIMESTAMP_SECONDS: int = 253402300799
+
+
+class RowView:
+    """
+    Wrap an object we're rendering as a row of a table so that we call its
+    ``render_for_display()`` at most once, no matter how many columns need it.
+    """
+
+    __slots__ = ('obj', '_display')
+
+    def __init__(self, obj: Any) -> None:
+        self.obj = obj
+        self._display: Optional[Dict[str, Any]] = None
+
+    def display(self) -> Dict[str, Any]:
+        if self._display is None:
+            self._display = self.obj.render_for_display()
+        return self._display
+
+
 # ========================
 # Renderers
 # ========================
@@ -117,7 +140,17 @@ class TableRenderer(AbstractRenderer):
         self.tablefmt: str = tablefmt
         self.show_headers: bool = show_headers
 
-    def get_value(self, obj: Any, column: Union[Dict[str, str], str]) -> Any:
+    def get_value(self, obj: Any, column: Union[Dict[str, str], str], row: "RowView" = None) -> Any:
+        """
+        Look up the value for ``column`` on ``obj``.  We try, in order,
+        ``getattr(obj, key)``, ``obj.render_for_display()[key]`` and
+        ``obj[key]``.
+
+        :param obj: the data object
+        :param column Union[dict, str]: the column spec
+        :param row Union[RowView, None]: if ``obj`` is a row we're rendering, its :py:class:`RowView`, so that we
+                                         call ``obj.render_for_display()`` at most once for the whole row
+        """
         if isinstance(column, dict):
             data_key = column['key']
         else:
@@ -126,6 +159,8 @@ class TableRenderer(AbstractRenderer):
             return getattr(obj, data_key)
         except AttributeError:
             try:
+                if row is not None:
+                    return row.display()[data_key]
                 return obj.render_for_display()[data_key]
             except KeyError:
                 pass
@@ -172,6 +207,49 @@ class TableRenderer(AbstractRenderer):
             value = self.float_format.format(value)
         return value
 
+    def format_timestamp(self, value: Any) -> str:
+        value = int(value)
+        if value > MAX_TIMESTAMP_SECONDS:
+            # This is an AWS timestamp in milliseconds, not seconds
+            return datetime.datetime.fromtimestamp(value / 1000.0).strftime(self.datetime_format)
+        try:
+            return datetime.datetime.fromtimestamp(value).strftime(self.datetime_format)
+        except ValueError:
+            return datetime.datetime.fromtimestamp(value / 1000.0).strftime(self.datetime_format)
+
+    def compile_caster(self, column: Union[Dict[str, str], str]) -> Callable[[Any], Any]:
+        """
+        Work out once how to reformat the values in ``column``, so that we don't have to re-examine the column spec
+        for every row.  See :py:meth:`cast_column` for the rules.
+
+        :param column Union[dict, str]: the column spec
+
+        :rtype: Callable[[Any], Any]
+        """
+        if not isinstance(column, dict):
+            return lambda value: value
+        if 'length' in column:
+            return lambda value: value if value == '' else str(len(value))
+        datatype = column.get('datatype')
+        if 'datatype' not in column:
+            cast_value = self._default_cast
+        elif datatype == 'timestamp':
+            cast_value = self.format_timestamp
+        elif datatype == 'bytes':
+            cast_value = lambda value: self.human_bytes(int(value))  # noqa: E731
+        else:
+            cast_value = lambda value: value  # noqa: E731
+        if 'wrap' in column:
+            width = cast(int, column['wrap'])
+            unwrapped = cast_value
+            cast_value = lambda value: '\n'.join(wrap(str(unwrapped(value)), width))  # noqa: E731
+
+        def caster(value: Any) -> Any:
+            if value == '':
+                return value
+            return cast_value(value)
+        return caster
+
     def cast_column(self, obj: Any, value: Any, column: Union[Dict[str, str], str]) -> str:
         """
         Try to reformat a value into a more human friendly form:
@@ -181,29 +259,73 @@ class TableRenderer(AbstractRenderer):
             * If the value is a `float`, render it with precision
 
         """
-        if value == '':
-            return value
+        return self.compile_caster(column)(value)
+
+    def cast_values(self, values: List[Any], column: Union[Dict[str, str], str]) -> List[Any]:
+        """
+        Reformat a whole column's worth of ``values`` at once.
+
+        ``timestamp`` and ``bytes`` columns tend to repeat values (defaults, streams created in the same second), so
+        for those we format each distinct value only once.
+
+        :param values list: the raw values for ``column``, one per row
+        :param column Union[dict, str]: the column spec
+
+        :rtype: list
+        """
+        caster = self.compile_caster(column)
+        if not isinstance(column, dict) or column.get('datatype') not in ('timestamp', 'bytes') or 'length' in column:
+            return [caster(value) for value in values]
+        formatted: Dict[Any, Any] = {}
+        results = []
+        for value in values:
+            try:
+                result = formatted[value]
+            except KeyError:
+                result = formatted[value] = caster(value)
+            except TypeError:
+                # unhashable
+                result = caster(value)
+            results.append(result)
+        return results
+
+    def is_overridden(self, column: Union[Dict[str, str], str]) -> bool:
+        return hasattr(self, f'render_{column}_value')
+
+    def compile_getter(self, column: Union[Dict[str, str], str]) -> Callable[["RowView"], Any]:
+        """
+        Return a function that takes a :py:class:`RowView` and returns the raw value for ``column``.
+
+        If we have a method named `render_{column}_value`, the function calls that.  Otherwise it looks the key up
+        with :py:meth:`get_value`, following ``__`` paths through sub-objects.
+
+        :param column Union[dict, str]: the column spec
+
+        :rtype: Callable[[RowView], Any]
+        """
         if isinstance(column, dict):
-            if 'length' in column:
-                return str(len(value))
-            if 'datatype' not in column:
-                value = self._default_cast(value)
-            else:
-                if column['datatype'] == 'timestamp':
-                    value = int(value)
-                    try:
-                        value = datetime.datetime.fromtimestamp(value).strftime(self.datetime_format)
-                    except ValueError:
-                        # This is an AWS timestamp in milliseconds, not seconds
-                        value = datetime.datetime.fromtimestamp(value / 1000.0).strftime(self.datetime_format)
-                    value = self._default_cast(value)
-                elif column['datatype'] == 'bytes':
-                    value = int(value)
-                    value = self.human_bytes(value)
-            if 'wrap' in column:
-                value = str(value)
-                value = '\n'.join(wrap(value, cast(int, column['wrap'])))
-        return value
+            key = column['key']
+        else:
+            key = column
+        if self.is_overridden(column):
+            method = getattr(self, f'render_{column}_value')
+            return lambda row: method(row.obj, key, column)
+        if '__' not in key:
+            return lambda row: self.get_value(row.obj, column, row=row)
+        refs = list(itertools.takewhile(bool, key.split('__')))
+        if isinstance(column, dict):
+            hops: List[Union[Dict[str, str], str]] = [dict(column, key=ref) for ref in refs]
+        else:
+            hops = list(refs)
+        if not hops:
+            return lambda row: row.obj
+
+        def getter(row: RowView) -> Any:
+            value = self.get_value(row.obj, hops[0], row=row)
+            for hop in hops[1:]:
+                value = self.get_value(value, hop)
+            return value
+        return getter
 
     def render_column(self, obj: Any, column: Union[Dict[str, str], str]) -> str:
         """
@@ -218,43 +340,50 @@ class TableRenderer(AbstractRenderer):
 
         :rtype: str
         """
+        value = self.compile_getter(column)(RowView(obj))
+        if self.is_overridden(column):
+            return value
+        return self.cast_column(obj, value, column)
 
-        if isinstance(column, dict):
-            key = column['key']
-        else:
-            key = column
-        if hasattr(self, f'render_{column}_value'):
-            value = getattr(self, f'render_{column}_value')(obj, key, column)
-        else:
-            if '__' in key:
-                refs = key.split('__')
-                ref: Optional[str] = refs.pop(0)
-                while ref:
-                    if isinstance(column, dict):
-                        sub_column = cast(Dict[str, Any], deepcopy(column))
-                        sub_column['key'] = ref
-                        obj = self.get_value(obj, sub_column)
-                    else:
-                        obj = self.get_value(obj, ref)
-                    try:
-                        ref = refs.pop(0)
-                    except IndexError:
-                        ref = None
-                value = obj  # the last one should be the value we're looking for
-                value = self.cast_column(obj, value, column)
-                return value
-            value = self.get_value(obj, column)
-            value = self.cast_column(obj, value, column)
-        return value
+    def iter_rows(self, data: Iterable[Any], raw: bool = False) -> Iterator[List[Any]]:
+        """
+        Yield the table row for each object in ``data`` as soon as we get it from ``data``, without building the
+        whole table.  Use this instead of :py:meth:`render` when ``data`` is a generator that may be very long.
 
-    def render(self, data: Any, **_) -> str:
-        data = cast(List[Any], data)
-        table = []
+        ``ordering`` is ignored here, since sorting would mean reading all of ``data`` first.
+
+        :param data Iterable[Any]: the objects to render
+        :param raw bool: if ``True``, return the raw values instead of their human friendly forms
+
+        :rtype: Iterator[List[Any]]
+        """
+        compiled = []
+        for column in self.columns:
+            if not raw and not self.is_overridden(column):
+                caster = self.compile_caster(column)
+            else:
+                caster = None
+            compiled.append((self.compile_getter(column), caster))
         for obj in data:
-            row = []
-            for column in self.columns:
-                row.append(self.render_column(obj, column))
-            table.append(row)
+            row = RowView(obj)
+            values = []
+            for getter, caster in compiled:
+                value = getter(row)
+                values.append(caster(value) if caster else value)
+            yield values
+
+    def render(self, data: Any, **_) -> str:
+        rows = [RowView(obj) for obj in cast(List[Any], data)]
+        # Build the table a column at a time, so that each column spec is compiled once and its values can be
+        # formatted in bulk
+        columns = []
+        for column in self.columns:
+            getter = self.compile_getter(column)
+            values = [getter(row) for row in rows]
+            if not self.is_overridden(column):
+                values = self.cast_values(values, column)
+            columns.append(values)
+        table = [list(row) for row in zip(*columns)] if columns else [[] for _ in rows]
         if self.ordering:
             reverse = False
             order_column = self.ordering
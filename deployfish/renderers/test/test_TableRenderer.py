@@ -0,0 +1,78 @@
+import unittest
+
+from deployfish.renderers import TableRenderer
+
+
+class FakeModel:
+
+    def __init__(self, data, sub=None):
+        self.data = data
+        self.sub = sub
+        self.display_calls = 0
+
+    @property
+    def name(self):
+        return self.data['name']
+
+    def render_for_display(self):
+        self.display_calls += 1
+        return dict(self.data)
+
+
+class TestTableRenderer(unittest.TestCase):
+
+    def test_render_for_display_is_called_once_per_row(self):
+        obj = FakeModel({'name': 'foo', 'size': 2048, 'created': 1600000000000, 'status': 'ACTIVE'})
+        renderer = TableRenderer({
+            'Name': 'name',
+            'Size': {'key': 'size', 'datatype': 'bytes'},
+            'Created': {'key': 'created', 'datatype': 'timestamp'},
+            'Status': 'status',
+        })
+        row = renderer.render([obj]).splitlines()[-1].split()
+        self.assertEqual(obj.display_calls, 1)
+        self.assertEqual(row[0], 'foo')
+        self.assertEqual(row[1], '2.0KiB')
+        self.assertEqual(row[-1], 'ACTIVE')
+
+    def test_matches_render_column(self):
+        objs = [
+            FakeModel({'name': f'stream-{i}', 'created': 1600000000 + i % 3, 'last': ''}, sub={'port': i})
+            for i in range(10)
+        ]
+        columns = {
+            'Name': 'name',
+            'Created': {'key': 'created', 'datatype': 'timestamp'},
+            'Last': {'key': 'last', 'datatype': 'timestamp', 'default': ''},
+            'Missing': {'key': 'missing', 'default': 'none'},
+            'Port': 'sub__port',
+            'Tags': {'key': 'data', 'length': True},
+        }
+        renderer = TableRenderer(columns, ordering='-Name', tablefmt='plain', show_headers=False)
+        expected = sorted(
+            [[renderer.render_column(obj, column) for column in columns.values()] for obj in objs],
+            key=lambda row: row[0],
+            reverse=True
+        )
+        lines = renderer.render(objs).splitlines()
+        self.assertEqual([line.split()[0] for line in lines], [row[0] for row in expected])
+        self.assertEqual(expected[0][2:], ['', 'none', 9, '3'])
+
+    def test_render_value_overrides(self):
+        class Renderer(TableRenderer):
+            def render_name_value(self, obj, key, column):
+                return obj.name.upper()
+
+        output = Renderer({'Name': 'name'}, show_headers=False).render([FakeModel({'name': 'foo'})])
+        self.assertEqual(output.split(), ['---', 'FOO', '---'])
+
+    def test_iter_rows_is_lazy(self):
+        def objs():
+            yield FakeModel({'name': 'foo', 'created': 1600000000})
+            raise AssertionError('iter_rows read past the first row')
+
+        renderer = TableRenderer({'Name': 'name', 'Created': {'key': 'created', 'datatype': 'timestamp'}})
+        rows = renderer.iter_rows(objs())
+        self.assertEqual(next(rows)[0], 'foo')
+        raw = next(renderer.iter_rows([FakeModel({'name': 'foo', 'created': 1600000000})], raw=True))
+        self.assertEqual(raw, ['foo', 1600000000])